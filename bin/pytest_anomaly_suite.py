@@ -12,14 +12,34 @@ Version: 1.0
 import pytest
 import fractions
 import json
+import os
 import tempfile
 from pathlib import Path
 
 # Import the anomaly checker module
 from src.anomaly_checker import (
-    Fermion, AnomalyChecker, GaugeGroup, 
-    standard_model_spectrum
+    Fermion, FermionType, AnomalyChecker, GaugeGroup, 
+    standard_model_spectrum, compute_anomalies_integer, BaseContext,
+    AnomalyVector, EarlyExitVerifier, Spectrum, spectrum_signature,
+    IncrementalAnomalyChecker, SpectrumTrie, check_many, verify_corpus,
+    cancels_by_symmetry
 )
+from src.anomaly_cache import AnomalyCache, PersistentAnomalyCache
+from src.anomaly_conditions import (
+    ANOMALY_KEYS, EXTENDED_KEYS, AnomalyCondition, ConditionRegistry, compile_plan
+)
+from src.batch_evaluator import evaluate_batch, evaluate_spectrum, select_engine, HAS_NUMPY
+from src.modular_sieve import ModularSieve
+from src.contribution_table import ContributionTable
+from src import differential_fuzz
+from src.gut_branching import (
+    BranchingEngine, GUT_CONDITIONS, BRANCHING_RULES, normalize_irrep, register_branching, scan_multiplets
+)
+from src.gauge_model import GaugeModel, GaugeFactor
+from src.flavored_u1 import FlavoredU1Checker
+from src.u1_charge_generator import U1ChargeGenerator, canonical, solve_pair, to_fields
+from src.parametric import Polynomial, ParametricChecker, SymbolicFermion, parse_charge, rational_roots, solve
+from src.group_theory import SU2, SU3, IrrepTable, irrep_dimension, dynkin_index, cubic_anomaly
 
 
 class TestFermionClass:
@@ -51,7 +71,7 @@ class TestFermionClass:
     def test_fermion_invalid_su2_rep(self):
         """Test that invalid SU(2) representations raise errors"""
         with pytest.raises(ValueError, match="Unsupported SU\(2\) representation"):
-            Fermion("invalid", su3_rep=1, su2_rep=4, 
+            Fermion("invalid", su3_rep=1, su2_rep=0, 
                    hypercharge=fractions.Fraction(0))
     
     def test_fermion_invalid_chirality(self):
@@ -87,7 +107,63 @@ class TestAnomalyCheckerMethods:
         assert AnomalyChecker.su3_dynkin_index(3) == fractions.Fraction(1, 2)
         assert AnomalyChecker.su3_dynkin_index(6) == fractions.Fraction(5, 2)
         assert AnomalyChecker.su3_dynkin_index(8) == fractions.Fraction(3)
-        assert AnomalyChecker.su3_dynkin_index(10) == fractions.Fraction(0)  # Unknown rep
+        assert AnomalyChecker.su3_dynkin_index(10) == fractions.Fraction(15, 2)
+        with pytest.raises(ValueError, match=r"Unsupported SU\(3\) representation"):
+            AnomalyChecker.su3_dynkin_index(5)  # No SU(3) irrep of dimension 5
+
+
+class TestGroupTheory:
+    """Test SU(N) invariants computed from Dynkin labels"""
+    
+    def test_su3_invariants(self):
+        """Dimensions, indices and cubic coefficients of common SU(3) irreps"""
+        expected = {
+            "3": (3, fractions.Fraction(1, 2), 1),
+            "3bar": (3, fractions.Fraction(1, 2), -1),
+            "6": (6, fractions.Fraction(5, 2), 7),
+            "8": (8, fractions.Fraction(3), 0),
+            "10": (10, fractions.Fraction(15, 2), 27),
+            "27": (27, fractions.Fraction(27), 0),
+        }
+        for name, (dim, index, cubic) in expected.items():
+            assert (SU3.dimension(name), SU3.index(name), SU3.cubic(name)) == (dim, index, cubic)
+    
+    def test_equal_dimension_irreps_are_distinguished(self):
+        """15 and 15' are different irreps with different invariants"""
+        assert SU3.resolve(15) == SU3.resolve("15") == (2, 1)
+        assert SU3.resolve("15'") == (4, 0)
+        assert SU3.index(15) == 10
+        assert SU3.index("15'") == fractions.Fraction(35, 2)
+        assert SU3.cubic("15'bar") == -77
+    
+    def test_su2_matches_closed_form(self):
+        """SU(2) index is (d³ - d)/12 and the cubic coefficient vanishes"""
+        for d in range(1, 12):
+            assert SU2.index(d) == fractions.Fraction(d**3 - d, 12)
+            assert SU2.cubic(d) == 0
+    
+    def test_general_sun(self):
+        """Invariants for SU(5) GUT representations"""
+        su5 = IrrepTable(5, max_dimension=50)
+        assert su5.resolve("10bar") == (0, 0, 1, 0)
+        assert su5.index("10") == fractions.Fraction(3, 2)
+        assert su5.cubic("5bar") + su5.cubic("10") == 0  # One SM family
+        assert irrep_dimension((1, 0, 0, 1)) == 24
+        assert dynkin_index((1, 0, 0, 1)) == 5
+        assert cubic_anomaly((1, 0, 0, 1)) == 0
+    
+    def test_extended_fermion_representations(self):
+        """Decuplets, 15' and quadruplets are accepted by the checker"""
+        fermions = [
+            Fermion("D", su3_rep=10, su2_rep=4,
+                   hypercharge=fractions.Fraction(1, 2)),
+            Fermion("P", su3_rep="15'", su2_rep=1,
+                   hypercharge=fractions.Fraction(0), chirality=-1),
+        ]
+        anomalies = AnomalyChecker(fermions).compute_anomalies()
+        assert anomalies['[U(1)_Y]'] == 20
+        assert anomalies['[SU(3)]³'] == 4 * fractions.Fraction(15, 2) - fractions.Fraction(35, 2)
+        assert anomalies == AnomalyChecker(fermions, engine="integer").compute_anomalies()
 
 
 class TestStandardModelAnomaly:
@@ -331,6 +407,1295 @@ class TestEdgeCases:
         assert all_cancel is True
 
 
+class TestFusedKernel:
+    """Test the single-pass anomaly kernel"""
+    
+    def test_fermion_weights(self):
+        """Per-fermion weights fold in chirality and generations"""
+        checker = AnomalyChecker([])
+        f = Fermion("Q", su3_rep=3, su2_rep=2,
+                   hypercharge=fractions.Fraction(1, 6), chirality=-1,
+                   generations=3)
+        mult, su2_weight, su3_weight, su2_cubic = checker.fermion_weights(f)
+        assert mult == -18
+        assert su2_weight == fractions.Fraction(-9, 2)
+        assert su3_weight == -3
+        assert su2_cubic == 0
+    
+    def test_matches_per_coefficient_sums(self):
+        """Fused pass reproduces the per-coefficient definitions"""
+        fermions = standard_model_spectrum(include_right_neutrino=False)
+        fermions[1].generations = 2
+        anomalies = AnomalyChecker(fermions).compute_anomalies()
+        
+        expected_y = sum(f.hypercharge * f.chirality * f.generations *
+                         f.su3_rep * f.su2_rep for f in fermions)
+        expected_y3 = sum(f.hypercharge**3 * f.chirality * f.generations *
+                          f.su3_rep * f.su2_rep for f in fermions)
+        expected_su3 = sum(f.chirality * f.generations * f.su2_rep *
+                           AnomalyChecker.su3_dynkin_index(f.su3_rep)
+                           for f in fermions)
+        assert anomalies['[U(1)_Y]'] == expected_y
+        assert anomalies['[U(1)_Y]³'] == expected_y3
+        assert anomalies['[SU(3)]³'] == expected_su3
+        assert anomalies['[Gravity]²[U(1)_Y]'] == anomalies['[U(1)_Y]']
+
+
+class TestAnomalyVector:
+    """Test the compact AnomalyVector type"""
+    
+    def test_round_trip_legacy_dict(self):
+        """Vectors convert losslessly to and from the legacy dictionary"""
+        fermions = standard_model_spectrum(include_right_neutrino=False)
+        fermions[0].hypercharge = fractions.Fraction(1, 3)
+        checker = AnomalyChecker(fermions)
+        legacy = checker.compute_anomalies()
+        vector = checker.compute_vector()
+        
+        assert vector.to_dict() == legacy
+        assert vector == legacy
+        assert AnomalyVector.from_mapping(legacy) == vector
+        assert vector['[U(1)_Y]³'] == legacy['[U(1)_Y]³']
+        assert list(vector) == list(legacy)
+    
+    def test_equality_and_hash_are_canonical(self):
+        """Same components give equal vectors and equal hashes"""
+        a = AnomalyVector([2, 4, 0, 0, 0, 6, 2], 4)
+        b = AnomalyVector.from_fractions(
+            [fractions.Fraction(1, 2), 1, 0, 0, 0, fractions.Fraction(3, 2),
+             fractions.Fraction(1, 2)])
+        assert a == b
+        assert hash(a) == hash(b)
+        assert len({a, b}) == 1
+    
+    def test_arithmetic(self):
+        """Add, subtract, scale and negate componentwise"""
+        a = AnomalyVector.from_fractions([fractions.Fraction(1, 3)] * 7)
+        b = AnomalyVector.from_fractions([fractions.Fraction(1, 6)] * 7)
+        assert (a + b)['[U(1)_Y]'] == fractions.Fraction(1, 2)
+        assert (a - b - b).is_zero()
+        assert (2 * b) == a
+        assert (-a + a) == AnomalyVector.zero()
+        assert not a.is_zero()
+    
+    def test_integer_engine_vector(self):
+        """Both engines produce identical vectors"""
+        fermions = standard_model_spectrum(include_right_neutrino=True)
+        fermions.append(Fermion("X", su3_rep=8, su2_rep=3,
+                               hypercharge=fractions.Fraction(5, 7)))
+        assert (AnomalyChecker(fermions).compute_vector() ==
+                AnomalyChecker(fermions, engine="integer").compute_vector())
+
+
+class TestIntegerEngine:
+    """Test the integer-scaled anomaly engine against the reference"""
+    
+    def _exotic_spectrum(self):
+        return standard_model_spectrum(include_right_neutrino=True) + [
+            Fermion("X", su3_rep=6, su2_rep=3,
+                   hypercharge=fractions.Fraction(-7, 15), chirality=-1,
+                   generations=2),
+            Fermion("Y", su3_rep=8, su2_rep=2,
+                   hypercharge=fractions.Fraction(11, 4), chirality=1),
+        ]
+    
+    def test_matches_reference(self):
+        """Integer engine must return exactly the reference coefficients"""
+        for fermions in (standard_model_spectrum(False), self._exotic_spectrum()):
+            reference = AnomalyChecker(fermions).compute_anomalies()
+            integer = AnomalyChecker(fermions, engine="integer").compute_anomalies()
+            assert list(integer) == list(reference)
+            for key, value in reference.items():
+                assert integer[key] == value
+                assert isinstance(integer[key], fractions.Fraction)
+    
+    def test_empty_spectrum(self):
+        """Empty spectrum gives all-zero coefficients"""
+        anomalies = compute_anomalies_integer([])
+        assert all(v == 0 for v in anomalies.values())
+    
+    def test_verdict_matches_reference(self):
+        """Verification through the integer backend gives the same verdict"""
+        fermions = standard_model_spectrum(include_right_neutrino=False)
+        fermions[0].hypercharge = fractions.Fraction(1, 3)
+        reference = AnomalyChecker(fermions).verify_cancellation()
+        integer = AnomalyChecker(fermions, engine="integer").verify_cancellation()
+        assert integer == reference
+    
+    def test_unknown_engine(self):
+        """Unknown engine names are rejected"""
+        with pytest.raises(ValueError, match="Unknown anomaly engine"):
+            AnomalyChecker([], engine="float")
+
+
+class TestBaseContext:
+    """Test delta evaluation on top of a precompiled base spectrum"""
+    
+    def test_evaluate_matches_full_checker(self):
+        """Base vector + candidate delta equals a full recomputation"""
+        base = standard_model_spectrum(include_right_neutrino=False)
+        for f in base:
+            f.generations = 3
+        extra = [Fermion("X", su3_rep=3, su2_rep=1,
+                        hypercharge=fractions.Fraction(-1, 3), chirality=1)]
+        
+        context = BaseContext(base)
+        full = AnomalyChecker(base + extra).compute_anomalies()
+        assert context.evaluate(extra) == full
+        assert context.verify(extra) == AnomalyChecker(base + extra).verify_cancellation()
+    
+    def test_base_is_not_recomputed(self):
+        """Mutating the caller's list does not change the compiled base"""
+        base = standard_model_spectrum(include_right_neutrino=False)
+        context = BaseContext(base, engine="integer")
+        base.pop()
+        all_cancel, _ = context.verify([])
+        assert all_cancel is True
+
+
+class TestBatchEvaluator:
+    """Test the vectorized batch evaluator against the reference checker"""
+    
+    CANDIDATES = [(1, 1, 0, -1), (3, 2, 1, 1), (8, 1, -5, -1), (6, 3, 7, 1)]
+    
+    def _reference(self, base, su3, su2, k, chi):
+        extra = Fermion("X", su3_rep=su3, su2_rep=su2,
+                       hypercharge=fractions.Fraction(k, 6), chirality=chi)
+        return AnomalyChecker(base + [extra]).compute_anomalies()
+    
+    @pytest.mark.parametrize("use_numpy", [
+        False,
+        pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY, reason="NumPy not installed")),
+    ])
+    def test_matches_reference(self, use_numpy):
+        """Every row equals AnomalyChecker on base + candidate"""
+        base = standard_model_spectrum(include_right_neutrino=False)
+        base_anomalies = AnomalyChecker(base).compute_anomalies()
+        columns = list(zip(*self.CANDIDATES))
+        batch = evaluate_batch(*columns, denominator=6, base=base_anomalies,
+                               use_numpy=use_numpy)
+        
+        for i, candidate in enumerate(self.CANDIDATES):
+            assert batch.anomalies(i) == self._reference(base, *candidate)
+        assert batch.hits() == [0]
+    
+    def test_pairs_per_row(self):
+        """2-D inputs sum the fields of each row"""
+        batch = evaluate_batch([(3, 3)], [(2, 2)], [(1, 1)], [(1, -1)],
+                               denominator=6, use_numpy=False)
+        assert list(batch.mask) == [True]
+    
+    def test_overflow_falls_back_to_exact(self):
+        """Huge numerators are evaluated exactly over Python ints"""
+        big = 10**30
+        batch = evaluate_batch([1], [1], [big], [1], denominator=1)
+        assert batch.exact is True
+        assert batch.anomalies(0)['[U(1)_Y]³'] == big**3
+
+
+class TestEarlyExit:
+    """Test early-exit verification with adaptive condition ordering"""
+    
+    def _candidate(self, su3, su2, k, chi=1):
+        return Fermion("X", su3_rep=su3, su2_rep=su2,
+                      hypercharge=fractions.Fraction(k, 6), chirality=chi)
+    
+    def test_verdict_matches_full_check(self):
+        """Early-exit verdict equals the full anomaly check"""
+        base = standard_model_spectrum(include_right_neutrino=False)
+        context = BaseContext(base)
+        verifier = EarlyExitVerifier(context, reorder_every=4)
+        for su3 in (1, 3, 8):
+            for su2 in (1, 2, 3):
+                for k in range(-6, 7):
+                    extra = [self._candidate(su3, su2, k)]
+                    expected, _ = context.verify(extra)
+                    assert verifier.check(extra) is expected
+    
+    def test_statistics_account_for_every_candidate(self):
+        """Each rejection is attributed to exactly one condition"""
+        base = standard_model_spectrum(include_right_neutrino=False)
+        verifier = EarlyExitVerifier(BaseContext(base), adaptive=False)
+        verifier.check([self._candidate(1, 1, 0)])
+        verifier.check([self._candidate(1, 1, 6)])
+        verifier.check([self._candidate(3, 1, 0)])
+        
+        stats = verifier.statistics()
+        assert stats['candidates'] == 3
+        assert stats['accepted'] == 1
+        assert stats['rejected'] == sum(stats['rejections'].values()) == 2
+        assert stats['rejections']['[U(1)_Y]'] == 1
+        assert stats['rejections']['[U(1)_Y][SU(3)]²'] == 0
+    
+    def test_adaptive_reordering(self):
+        """The most discriminating condition moves to the front"""
+        verifier = EarlyExitVerifier(reorder_every=8)
+        # Neutral colour triplets only fail the SU(3)³ condition
+        for _ in range(16):
+            assert verifier.check([self._candidate(3, 1, 0)]) is False
+        assert verifier.order[0] == '[SU(3)]³'
+        assert verifier.reorderings >= 1
+        assert verifier.check([self._candidate(1, 1, 0)]) is True
+    
+    def test_verify_cancellation_early_exit(self):
+        """early_exit=True reports only the first failing condition"""
+        spectrum = standard_model_spectrum(include_right_neutrino=False)[1:]
+        checker = AnomalyChecker(spectrum)
+        all_cancel, failures = checker.verify_cancellation(early_exit=True)
+        assert all_cancel is False
+        assert len(failures) == 1
+        assert not AnomalyChecker(spectrum).verify_cancellation()[0]
+        
+        all_cancel, failures = AnomalyChecker(
+            standard_model_spectrum()
+        ).verify_cancellation(early_exit=True)
+        assert all_cancel is True and failures == []
+
+
+class TestAnomalyCache:
+    """Test the LRU anomaly cache and canonical spectrum signatures"""
+    
+    def test_signature_is_order_independent(self):
+        """Field order, names and vector-like pairs do not change the signature"""
+        spectrum = standard_model_spectrum()
+        X_L = Fermion("X_L", su3_rep=3, su2_rep=1,
+                     hypercharge=fractions.Fraction(2, 3), chirality=1)
+        X_R = Fermion("X_R", su3_rep=3, su2_rep=1,
+                     hypercharge=fractions.Fraction(2, 3), chirality=-1)
+        assert spectrum_signature(spectrum) == spectrum_signature(list(reversed(spectrum)))
+        assert spectrum_signature(spectrum + [X_L, X_R]) == spectrum_signature(spectrum)
+        assert spectrum_signature(spectrum + [X_L]) != spectrum_signature(spectrum)
+        
+        context = BaseContext(spectrum)
+        assert context.signature([X_L]) == spectrum_signature([X_L] + spectrum)
+        assert context.cache_key([X_L, X_R]) == context.cache_key([X_R, X_L]) == context.cache_key([])
+        assert context.cache_key([X_L]) != context.cache_key([X_R])
+        assert context.cache_key([X_L]) == BaseContext(list(reversed(spectrum))).cache_key([X_L])
+        assert context.cache_key([X_L]) != BaseContext(spectrum[:-1]).cache_key([X_L])
+
+    def test_cache_key_cost_independent_of_base(self):
+        """Candidate keys neither copy nor sort the base"""
+        import time
+        X = [Fermion("X", su3_rep=3, su2_rep=2, hypercharge=fractions.Fraction(1, 6))]
+        small = BaseContext(standard_model_spectrum())
+        large = BaseContext([Fermion(f"S{k}", su3_rep=1, su2_rep=1, hypercharge=fractions.Fraction(k, 7))
+                             for k in range(1, 5001)])
+        large.spectrum = None  # any use of the base would fail
+        assert len(repr(large.cache_key(X))) == len(repr(small.cache_key(X)))
+
+        def cost(context):
+            start = time.perf_counter()
+            for _ in range(2000):
+                context.cache_key(X)
+            return time.perf_counter() - start
+
+        assert cost(large) < 5 * cost(small) + 0.01
+
+    def test_hits_misses_and_eviction(self):
+        """Least recently used entries are evicted first"""
+        cache = AnomalyCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert "b" not in cache
+        assert cache.get("b") is None
+        
+        info = cache.cache_info()
+        assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 1, 1, 2)
+    
+    def test_lookup_caches_none(self):
+        """A cached rejection (None) is a hit, not a recomputation"""
+        cache = AnomalyCache()
+        calls = []
+        for _ in range(3):
+            assert cache.lookup("k", lambda: calls.append(1)) is None
+        assert len(calls) == 1
+        assert cache.cache_info().hits == 2
+    
+    def test_anomalies_match_checker(self):
+        """Cached anomalies equal a direct computation"""
+        cache = AnomalyCache(maxsize=0)
+        spectrum = standard_model_spectrum(include_right_neutrino=False)[:3]
+        expected = AnomalyChecker(spectrum).compute_anomalies()
+        assert cache.anomalies(spectrum) == expected
+        assert cache.anomalies(spectrum[::-1]) == expected
+        assert len(cache) == 0 and cache.cache_info().misses == 2
+
+
+class TestPersistentCache:
+    """Test the SQLite-backed anomaly cache"""
+    
+    def test_round_trip_across_instances(self, tmp_path):
+        """Vectors and rejections survive reopening the store"""
+        path = tmp_path / "cache.db"
+        spectrum = standard_model_spectrum(include_right_neutrino=False)[:2]
+        expected = AnomalyChecker(spectrum).compute_vector()
+        with PersistentAnomalyCache(path) as store:
+            assert store.anomalies(spectrum) == expected
+            store.put(("candidate", "rejected"), None)
+        
+        with PersistentAnomalyCache(path) as store:
+            assert store.get(("anomalies", spectrum_signature(spectrum))) == expected
+            assert store.get(("candidate", "rejected"), "missing") is None
+            assert store.statistics()['hits'] == 2
+    
+    def test_engine_version_invalidates(self, tmp_path):
+        """Entries written by another engine version are dropped"""
+        path = tmp_path / "cache.db"
+        with PersistentAnomalyCache(path, engine_version="old") as store:
+            store.put(("candidate", 1), None)
+        with PersistentAnomalyCache(path, engine_version="new") as store:
+            assert store.invalidated == 1
+            assert store.get(("candidate", 1), "missing") == "missing"
+            assert len(store) == 0
+    
+    def test_memory_cache_writes_through(self, tmp_path):
+        """Misses in memory fall through to the store, new values are persisted"""
+        path = tmp_path / "cache.db"
+        spectrum = standard_model_spectrum()
+        cache = AnomalyCache(backend=PersistentAnomalyCache(path))
+        cache.anomalies(spectrum)
+        cache.close()
+        
+        warm = AnomalyCache(backend=PersistentAnomalyCache(path))
+        assert warm.anomalies(spectrum).is_zero()
+        assert warm.cache_info().hits == 1
+        assert warm.backend.hits == 1
+        warm.close()
+
+    def test_verdicts_are_keyed_by_conditions(self, tmp_path, monkeypatch):
+        """Scanners with different condition sets do not share verdicts"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "cache.db"
+        base = [fermion_to_dict(f) for f in standard_model_spectrum()]
+        extended = {'anomaly_conditions': list(ANOMALY_KEYS) + ['Witten SU(2)']}
+        extra = [FermionType("X", 1, 2, fractions.Fraction(0))]
+
+        cache = AnomalyCache(backend=PersistentAnomalyCache(path))
+        assert ParameterSpaceScanner(base, {}, cache=cache)._evaluate_candidate(extra).is_zero()
+        assert ParameterSpaceScanner(base, extended, cache=cache)._evaluate_candidate(extra) is None
+        cache.close()
+
+        for config in (extended, {}):
+            warm = AnomalyCache(backend=PersistentAnomalyCache(path))
+            verdict = ParameterSpaceScanner(base, config, cache=warm)._evaluate_candidate(extra)
+            assert (verdict is None) == (config is extended)
+            assert warm.backend.hits == 1
+            warm.close()
+
+
+class TestSpectrum:
+    """Test the canonical multiset spectrum representation"""
+    
+    def test_merges_identical_fields(self):
+        """Copies of a field merge into one entry with summed multiplicity"""
+        Q = Fermion("Q", su3_rep=3, su2_rep=2, hypercharge=fractions.Fraction(1, 6))
+        spectrum = Spectrum([Q, Q, Q])
+        assert len(spectrum) == 1
+        assert list(spectrum.values()) == [3]
+        
+        (merged,) = spectrum.fermions()
+        assert merged.generations == 3 and merged.chirality == 1
+    
+    def test_chirality_folds_into_sign(self):
+        """Opposite chiralities cancel; a net right-handed field is negative"""
+        X_L = Fermion("X_L", su3_rep=1, su2_rep=2, hypercharge=fractions.Fraction(1, 2))
+        X_R = Fermion("X_R", su3_rep=1, su2_rep=2,
+                     hypercharge=fractions.Fraction(1, 2), chirality=-1)
+        assert len(Spectrum([X_L, X_R])) == 0
+        
+        X_R.generations = 2
+        (net,) = Spectrum([X_L, X_R]).fermions()
+        assert net.chirality == -1 and net.generations == 1
+    
+    def test_order_independent_hash_and_equality(self):
+        """Field order does not affect equality, hash or signature"""
+        fields = standard_model_spectrum()
+        a, b = Spectrum(fields), Spectrum(list(reversed(fields)))
+        assert a == b and hash(a) == hash(b)
+        assert a.signature() == b.signature() == spectrum_signature(fields)
+        assert a.extended([fields[0]]) != a
+    
+    def test_checker_accepts_spectrum(self):
+        """A Spectrum evaluates like the list it was built from"""
+        fields = standard_model_spectrum(include_right_neutrino=False)
+        for f in fields:
+            f.generations = 3
+        spectrum = Spectrum(fields)
+        assert len(AnomalyChecker(spectrum).fermions) == len(fields)
+        assert AnomalyChecker(spectrum).compute_anomalies() == AnomalyChecker(fields).compute_anomalies()
+        assert BaseContext(fields[:3]).evaluate(Spectrum(fields[3:])).is_zero()
+    
+    def test_named_representations_round_trip(self):
+        """Primed and barred irreps survive conversion back to fermions"""
+        F = Fermion("F", su3_rep="15'", su2_rep=1, hypercharge=fractions.Fraction(0))
+        G = Fermion("G", su3_rep="3bar", su2_rep=1, hypercharge=fractions.Fraction(1, 3))
+        reps = sorted(str(f.su3_rep) for f in Spectrum([F, G]).fermions())
+        assert reps == ["15'", "3bar"]
+
+
+class TestFermionType:
+    """Test the interned, immutable FermionType flyweight"""
+    
+    def test_identical_fields_share_one_instance(self):
+        """Equal quantum numbers and names give the same object"""
+        Y = fractions.Fraction(1, 6)
+        a = FermionType("Q", 3, 2, Y)
+        assert FermionType("Q", 3, 2, Y) is a
+        assert FermionType.unchecked("Q", 3, 2, Y) is a
+        assert FermionType("Q", 3, 2, Y, chirality=-1) is not a
+    
+    def test_immutable_and_not_copied(self):
+        """Attributes cannot change and copies are the instance itself"""
+        import copy
+        F = FermionType("X", 1, 2, fractions.Fraction(1, 2))
+        with pytest.raises(AttributeError):
+            F.hypercharge = fractions.Fraction(0)
+        assert copy.deepcopy(F) is F
+        assert hash(F) == hash(FermionType("X", 1, 2, fractions.Fraction(1, 2)))
+    
+    def test_validation_matches_fermion(self):
+        """The checked constructor rejects what Fermion rejects"""
+        with pytest.raises(ValueError, match="Chirality must be"):
+            FermionType("bad", 1, 1, fractions.Fraction(0), chirality=0)
+        with pytest.raises(ValueError, match="Unsupported SU"):
+            FermionType("bad", 5, 1, fractions.Fraction(0))
+    
+    def test_interchangeable_with_fermion(self):
+        """Checkers and spectra treat FermionType like Fermion"""
+        fields = standard_model_spectrum()
+        types = [FermionType.from_fermion(f) for f in fields]
+        assert AnomalyChecker(types).compute_anomalies() == AnomalyChecker(fields).compute_anomalies()
+        assert Spectrum(types) == Spectrum(fields)
+        assert types[0].to_fermion() == fields[0]
+
+
+class TestConditionRegistry:
+    """Test the anomaly-condition registry and compiled evaluation plans"""
+    
+    def test_default_plan_is_legacy_layout(self):
+        """Without arguments the plan reproduces ANOMALY_KEYS"""
+        plan = compile_plan()
+        assert plan.keys == ANOMALY_KEYS
+        assert compile_plan() is plan
+        # [Gravity]²[U(1)_Y] shares the [U(1)_Y] accumulator
+        assert len(plan.columns) == len(ANOMALY_KEYS) - 1
+    
+    def test_su3_cubic_and_witten(self):
+        """Proper SU(3)³ cubic index and Witten's global SU(2) anomaly"""
+        octet = Fermion("gluino", su3_rep=8, su2_rep=1, hypercharge=fractions.Fraction(0))
+        sextet = Fermion("S", su3_rep=6, su2_rep=1, hypercharge=fractions.Fraction(0))
+        doublet = Fermion("D", su3_rep=1, su2_rep=2, hypercharge=fractions.Fraction(0))
+        
+        checker = AnomalyChecker([octet], conditions=EXTENDED_KEYS)
+        anomalies = checker.compute_anomalies()
+        assert anomalies['[SU(3)]³ cubic'] == 0
+        assert anomalies['[SU(3)]³'] == 3
+        assert AnomalyChecker([sextet], conditions=EXTENDED_KEYS).compute_anomalies()['[SU(3)]³ cubic'] == 7
+        
+        witten = compile_plan(['Witten SU(2)'])
+        assert AnomalyChecker([doublet], conditions=witten).compute_anomalies() == {'Witten SU(2)': 1}
+        assert AnomalyChecker([doublet, doublet], conditions=witten).compute_vector().is_zero()
+    
+    def test_backends_execute_the_same_plan(self):
+        """Reference, integer, delta and batch evaluation agree"""
+        plan = compile_plan(EXTENDED_KEYS)
+        base = standard_model_spectrum(include_right_neutrino=False)
+        extra = [Fermion("X", su3_rep=6, su2_rep=2, hypercharge=fractions.Fraction(5, 6))]
+        
+        expected = AnomalyChecker(base + extra, conditions=plan).compute_anomalies()
+        assert AnomalyChecker(base + extra, "integer", plan).compute_anomalies() == expected
+        context = BaseContext(base, conditions=plan)
+        assert context.evaluate(extra) == expected
+        batch = evaluate_batch([6], [2], [5], [1], denominator=6,
+                               base=context.vector, plan=plan, use_numpy=False)
+        assert batch.anomalies(0) == expected
+    
+    def test_custom_registry(self):
+        """New conditions declare a weight; equal (weight, power) share a sum"""
+        from src.anomaly_conditions import multiplicity
+        registry = ConditionRegistry()
+        registry.register(AnomalyCondition("count", multiplicity))
+        registry.register(AnomalyCondition("count again", multiplicity))
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register(AnomalyCondition("count", multiplicity))
+        
+        plan = registry.compile(["count", "count again"])
+        assert len(plan.columns) == 1
+        # 8 left- minus 8 right-handed Weyl fermions
+        spectrum = standard_model_spectrum(include_right_neutrino=True)
+        assert plan.evaluate(spectrum) == [0, 0]
+        assert set(plan.profile(spectrum, repeat=2)) == {"count", "count again", "fused"}
+
+
+class TestIncrementalChecker:
+    """Test the editable checker with checkpoint / rollback"""
+    
+    def assert_matches_full(self, inc):
+        full = AnomalyChecker([f.to_fermion() for f in inc.fermions]).compute_vector()
+        assert inc.vector == full
+    
+    def test_edits_match_full_recompute(self):
+        """add / remove / replace / set_generations keep the vector exact"""
+        inc = IncrementalAnomalyChecker(standard_model_spectrum(include_right_neutrino=False))
+        assert inc.is_anomaly_free()
+        
+        index = inc.add_field(Fermion("X", su3_rep=3, su2_rep=1, hypercharge=fractions.Fraction(-1, 3)))
+        self.assert_matches_full(inc)
+        assert not inc.is_anomaly_free()
+        inc.replace_field(index, Fermion("X", su3_rep=3, su2_rep=1, hypercharge=fractions.Fraction(-1, 3),
+                                         chirality=-1))
+        self.assert_matches_full(inc)
+        inc.set_generations("Q_L", 2)
+        self.assert_matches_full(inc)
+        inc.remove_field("X")
+        self.assert_matches_full(inc)
+        assert len(inc) == 5
+    
+    def test_checkpoint_and_rollback(self):
+        """Rollback restores both the fields and the vector"""
+        inc = IncrementalAnomalyChecker(standard_model_spectrum(include_right_neutrino=False))
+        fields, vector = inc.fermions, inc.vector
+        
+        outer = inc.checkpoint()
+        inc.remove_field(0)
+        inc.checkpoint()
+        inc.set_generations("e_R", 1)
+        inc.rollback()
+        assert inc.fermions == fields[1:]
+        inc.add_field(Fermion("N", su3_rep=1, su2_rep=1, hypercharge=fractions.Fraction(0)))
+        inc.rollback(outer)
+        assert inc.fermions == fields
+        assert inc.vector == vector
+        with pytest.raises(RuntimeError, match="No open checkpoint"):
+            inc.rollback()
+    
+    def test_fields_are_snapshots(self):
+        """Mutating the Fermion passed in cannot make the vector stale"""
+        fermion = Fermion("X", su3_rep=1, su2_rep=2, hypercharge=fractions.Fraction(1, 2))
+        inc = IncrementalAnomalyChecker()
+        inc.add_field(fermion)
+        fermion.hypercharge = fractions.Fraction(0)
+        self.assert_matches_full(inc)
+        with pytest.raises(ValueError, match="No field named"):
+            inc.remove_field("Y")
+        with pytest.raises(IndexError):
+            inc.remove_field(3)
+
+
+class TestModularSieve:
+    """Test the modular pre-filter in front of exact checks"""
+    
+    def test_never_rejects_a_hit(self):
+        """Every anomaly-free candidate survives, most others are rejected"""
+        for base, plan in [
+            (standard_model_spectrum(include_right_neutrino=False), None),
+            # Base coefficients with denominators foreign to the k/6 grid
+            ([Fermion("Z", su3_rep=3, su2_rep=2, hypercharge=fractions.Fraction(1, 5))], EXTENDED_KEYS),
+        ]:
+            context = BaseContext(base, conditions=plan)
+            sieve = ModularSieve(context)
+            hits = 0
+            for su3 in (1, 3, 6, 8):
+                for su2 in (1, 2, 3):
+                    for k in range(-12, 13):
+                        Y = fractions.Fraction(k, 6)
+                        extra = [Fermion("X", su3_rep=su3, su2_rep=su2, hypercharge=Y),
+                                 Fermion("Y", su3_rep=su3, su2_rep=1, hypercharge=-Y, chirality=-1)]
+                        expected, _ = context.verify(extra)
+                        assert sieve.check(extra, denominator=6) or not expected
+                        hits += expected
+            assert sieve.passed >= hits
+            assert sieve.rejected > 0
+    
+    def test_counters_and_vector_like_pairs(self):
+        """Vector-like pairs pass; counters add up"""
+        sieve = ModularSieve(BaseContext(standard_model_spectrum(include_right_neutrino=False)))
+        pair = [Fermion("X", su3_rep=3, su2_rep=2, hypercharge=fractions.Fraction(1, 7)),
+                Fermion("Xbar", su3_rep=3, su2_rep=2, hypercharge=fractions.Fraction(1, 7), chirality=-1)]
+        assert sieve.check(pair)
+        assert not sieve.check(pair[:1])
+        stats = sieve.statistics()
+        assert (stats['passed'], stats['rejected']) == (1, 1)
+        with pytest.raises(ValueError, match="not on the 1/6 grid"):
+            sieve.check(pair, denominator=6)
+
+
+class TestContributionTable:
+    """Test the memory-mapped contribution table of the candidate grid"""
+    
+    def test_cells_match_exact_contributions(self, tmp_path):
+        """Table deltas equal the scaled exact anomaly coefficients"""
+        plan = compile_plan(EXTENDED_KEYS)
+        with ContributionTable.build(tmp_path / "grid.tbl", plan, k_max=12) as table:
+            scales = plan.scales(6)
+            for su3, su2 in table.reps:
+                for k in (-12, -5, 0, 7):
+                    extra = [Fermion("X", su3_rep=su3, su2_rep=su2,
+                                     hypercharge=fractions.Fraction(k, 6), chirality=-1, generations=2)]
+                    exact = AnomalyChecker(extra, conditions=plan).compute_vector()
+                    delta = table.delta(extra)
+                    for i, key in enumerate(plan.keys):
+                        if plan.moduli[i] is None:
+                            assert fractions.Fraction(delta[i], scales[i]) == exact[key]
+            # Off the grid or beyond the table
+            assert table.delta([Fermion("X", su3_rep=3, su2_rep=1, hypercharge=fractions.Fraction(1, 7))]) is None
+            assert table.delta([Fermion("X", su3_rep=3, su2_rep=1, hypercharge=fractions.Fraction(13, 6))]) is None
+            assert table.delta([Fermion("X", su3_rep=3, su2_rep=3, hypercharge=fractions.Fraction(0))]) is None
+    
+    def test_load_or_build(self, tmp_path):
+        """Missing, stale or too small tables are rebuilt"""
+        path = tmp_path / "grid.tbl"
+        with ContributionTable.load_or_build(path, k_max=6) as table:
+            assert len(table) == 7 * 13
+        with ContributionTable.load_or_build(path, k_max=3) as table:
+            assert table.k_max == 6
+        with ContributionTable.load_or_build(path, k_max=6, reps=[(3, 3)]) as table:
+            assert (3, 3) in table.reps and (8, 1) in table.reps
+        with pytest.raises(ValueError, match="different conditions"):
+            ContributionTable(path, compile_plan(EXTENDED_KEYS))
+        path.write_bytes(b"garbage")
+        with ContributionTable.load_or_build(path, k_max=2) as table:
+            assert table.k_max == 2
+    
+    def test_scanner_verdicts_unchanged(self, tmp_path, monkeypatch):
+        """The scanner reaches the same verdicts with and without the table"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum(include_right_neutrino=False)]
+        plain = ParameterSpaceScanner(base, {}, cache=AnomalyCache(0))
+        mapped = ParameterSpaceScanner(base, {}, cache=AnomalyCache(0), table=tmp_path / "grid.tbl")
+        for su3, su2 in [(1, 1), (1, 2), (3, 1), (3, 3)]:
+            for k in range(-9, 10):
+                Y = fractions.Fraction(k, 6)
+                for extra in ([FermionType("X", su3, su2, Y)],
+                              [FermionType("X", su3, su2, Y), FermionType("Xbar", su3, su2, Y, chirality=-1)]):
+                    assert mapped._evaluate_candidate(extra) == plain._evaluate_candidate(extra)
+        mapped.table.close()
+
+    def test_table_covers_scanned_grid(self, tmp_path, monkeypatch):
+        """Grids beyond DEFAULT_K_MAX extend the table instead of missing it"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum()]
+        config = {'hypercharge': {'abs_max': 10}}
+        scanner = ParameterSpaceScanner(base, config, cache=AnomalyCache(0), table=tmp_path / "grid.tbl")
+        scanner.scan_single_additions(hyper_max=24)
+        assert scanner.table.k_max == 48
+        scanner.scan_single_additions(hyper_max=60)
+        assert scanner.table.k_max == 60
+        assert scanner.engines_used == {"table": 7 * 2 * (49 + 121)}
+        scanner.table.close()
+
+
+class TestEngineSelection:
+    """Test engine resolution and per-engine scan statistics"""
+    
+    def test_select_engine(self):
+        """Explicit engines pass through; auto depends on the batch and NumPy"""
+        assert select_engine("reference") == "reference"
+        assert select_engine("auto", spectrum_size=200) == "integer"
+        assert select_engine("auto", spectrum_size=1, batch_size=1000) == ("vector" if HAS_NUMPY else "integer")
+        with pytest.raises(ValueError, match="Unknown engine"):
+            select_engine("gpu")
+    
+    def test_evaluate_spectrum_matches_checker(self):
+        """A whole spectrum through the batch evaluator"""
+        fermions = standard_model_spectrum() + [
+            Fermion("X", su3_rep=6, su2_rep=2, hypercharge=fractions.Fraction(2, 7), generations=3)
+        ]
+        plan = compile_plan(EXTENDED_KEYS)
+        expected = AnomalyChecker(fermions, conditions=plan).compute_vector()
+        assert evaluate_spectrum(fermions, plan) == expected
+        assert evaluate_spectrum(fermions, plan, use_numpy=False) == expected
+        assert evaluate_spectrum([]).is_zero()
+    
+    def test_scanner_statistics(self, tmp_path, monkeypatch):
+        """Every tested configuration is attributed to the engine that ran it"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum(include_right_neutrino=False)]
+        hits = None
+        for engine in ("reference", "integer", "vector", "auto"):
+            scanner = ParameterSpaceScanner(base, {}, engine=engine, cache=AnomalyCache(0))
+            scanner.scan_single_additions(hyper_max=6)
+            scanner.scan_chiral_pairs()
+            stats = scanner.statistics()
+            assert stats['engine'] == engine
+            assert stats['configurations_tested'] == sum(stats['engines_used'].values()) > 0
+            assert scanner.tested_configurations_count == stats['configurations_tested']
+            found = [r.description for r in scanner.anomaly_free_models]
+            assert hits is None or found == hits
+            hits = found
+
+
+class TestDifferentialFuzz:
+    """Fuzz the accelerated engines against the reference checker"""
+    
+    def test_engines_agree_on_random_spectra(self):
+        """A short seeded run; set ANOMALY_FUZZ_ITERATIONS for a long one"""
+        report = differential_fuzz.fuzz(seed=2024, iterations=60)
+        assert report.ok, report.failures[0].to_json()
+        assert 0 < report.anomaly_free < report.spectra
+    
+    @pytest.mark.skipif(not os.environ.get(differential_fuzz.FUZZ_ENV),
+                        reason=f"set {differential_fuzz.FUZZ_ENV} to run the long fuzzing mode")
+    def test_long_fuzzing_run(self):
+        """Opt-in long run over several seeds"""
+        iterations = int(os.environ[differential_fuzz.FUZZ_ENV])
+        for seed in range(4):
+            report = differential_fuzz.fuzz(seed=seed, iterations=iterations)
+            assert report.ok, report.failures[0].to_json()
+    
+    def test_generator_is_reproducible(self):
+        """Spectrum i depends only on the seed and i"""
+        a = differential_fuzz.SpectrumGenerator(5)
+        b = differential_fuzz.SpectrumGenerator(5)
+        assert a.spectrum(17) == b.spectrum(17)
+        assert a.spectrum(17) != a.spectrum(18)
+    
+    def test_failures_are_shrunk(self, monkeypatch):
+        """A planted bug is reported on a minimal spectrum"""
+        def broken(fermions, plan):
+            vector = AnomalyChecker(fermions, "integer", plan).compute_vector()
+            if any(f.generations > 1 for f in fermions):
+                return vector + vector + AnomalyVector.from_mapping(
+                    {k: 1 for k in plan.keys}, keys=plan.keys)
+            return vector
+        monkeypatch.setitem(differential_fuzz.VECTOR_ENGINES, "broken", broken)
+        
+        report = differential_fuzz.fuzz(seed=0, iterations=50)
+        assert not report.ok
+        failure = report.failures[0]
+        assert len(failure.spectrum) == 1
+        f = failure.spectrum[0]
+        assert (f.su3_rep, f.su2_rep, f.hypercharge, f.chirality, f.generations) == (1, 1, 0, 1, 2)
+        assert failure.mismatches[0].startswith("broken:")
+        assert json.loads(failure.to_json())['fermions'][0]['generations'] == 2
+
+
+class TestSpectrumTrie:
+    """Test prefix-sharing evaluation of many spectra"""
+    
+    def test_check_many_matches_individual_checks(self):
+        """Vectors equal per-spectrum evaluation, in input order"""
+        generator = differential_fuzz.SpectrumGenerator(11)
+        spectra = [generator.spectrum(i) for i in range(40)]
+        base = standard_model_spectrum()
+        spectra += [base + s[:2] for s in spectra]
+        for plan in (None, EXTENDED_KEYS):
+            expected = [AnomalyChecker(s, conditions=plan).compute_vector() for s in spectra]
+            assert check_many(spectra, plan) == expected
+    
+    def test_shared_prefixes_are_evaluated_once(self):
+        """Only distinct suffixes create nodes"""
+        base = standard_model_spectrum(include_right_neutrino=False)
+        trie = SpectrumTrie()
+        for k in range(-3, 4):
+            Y = fractions.Fraction(k, 6)
+            trie.add(base + [Fermion("X", su3_rep=1, su2_rep=2, hypercharge=Y),
+                             Fermion("Xbar", su3_rep=1, su2_rep=2, hypercharge=Y, chirality=-1)])
+        stats = trie.statistics()
+        assert stats['nodes'] == len(base) + 7 * 2
+        assert stats['shared_fields'] == 6 * len(base)
+        assert trie.add(base).is_zero()
+    
+    def test_verify_corpus(self, tmp_path):
+        """Files and directories of stored spectra are re-verified"""
+        from src.param_space_scanner import fermion_to_dict
+        good = [fermion_to_dict(f) for f in standard_model_spectrum()]
+        (tmp_path / "good.json").write_text(json.dumps({'fermions': good}))
+        (tmp_path / "bad.json").write_text(json.dumps(good[1:]))
+        vectors = verify_corpus([tmp_path])
+        assert vectors[str(tmp_path / "good.json")].is_zero()
+        assert not vectors[str(tmp_path / "bad.json")].is_zero()
+
+
+class TestParametric:
+    """Test symbolic anomaly constraints and their exact solution"""
+    
+    def test_polynomial_arithmetic(self):
+        """Expansion, parsing and substitution are exact"""
+        a, b = Polynomial.symbol("a"), Polynomial.symbol("b")
+        assert (a + 1) ** 2 == a * a + 2 * a + 1
+        assert parse_charge("-a + 1/2") == fractions.Fraction(1, 2) - a
+        assert parse_charge("2*a^2/3 - b") == a ** 2 * 2 / 3 - b
+        assert parse_charge("1/3").constant_value() == fractions.Fraction(1, 3)
+        assert ((a - b) * (a + b)).substitute({"b": a}).is_zero()
+        assert (a ** 3).evaluate({"a": fractions.Fraction(-1, 2)}) == fractions.Fraction(-1, 8)
+        with pytest.raises(ValueError):
+            parse_charge("a / b")
+    
+    def test_rational_roots(self):
+        """Closed forms for low degree, rational root theorem above"""
+        assert rational_roots([-6, 11, -6, 1]) == [1, 2, 3]
+        assert rational_roots([fractions.Fraction(-1, 4), 0, 1]) == [fractions.Fraction(-1, 2), fractions.Fraction(1, 2)]
+        assert rational_roots([1, 0, 1]) == []
+        assert rational_roots([0, 0, -1, 0, 0, 27]) == [0, fractions.Fraction(1, 3)]
+    
+    def test_constraints_match_concrete_checker(self):
+        """Binding the symbols reproduces the numeric anomaly vector"""
+        fields = standard_model_spectrum()[:3] + [
+            SymbolicFermion("X", 3, 2, "a", generations=2),
+            SymbolicFermion("Y", 1, 3, "-a + 1/2", chirality=-1),
+        ]
+        checker = ParametricChecker(fields, EXTENDED_KEYS)
+        value = {"a": fractions.Fraction(5, 7)}
+        bound = [f.bind(value) if isinstance(f, SymbolicFermion) else f for f in fields]
+        expected = AnomalyChecker(bound, conditions=EXTENDED_KEYS).compute_anomalies()
+        assert {k: p.evaluate(value) for k, p in checker.constraints().items()} == expected
+        assert checker.variables() == ["a"]
+    
+    def test_solve(self):
+        """All rational solutions within bounds, free symbols omitted"""
+        base = standard_model_spectrum(include_right_neutrino=False)
+        singlet = ParametricChecker(base + [SymbolicFermion("N", 1, 1, "a")])
+        assert singlet.solve((-1, 1)) == [{"a": 0}]
+        higgsinos = ParametricChecker(base + [SymbolicFermion("Hu", 1, 2, "a"),
+                                              SymbolicFermion("Hd", 1, 2, "-a")])
+        assert higgsinos.solve() == [{}]
+        a, b = Polynomial.symbol("a"), Polynomial.symbol("b")
+        assert solve([a * a - 4, a * b - 2], (-5, 5)) == [{"a": -2, "b": -1}, {"a": 2, "b": 1}]
+        assert solve([a * a - 4, a * b - 2], {"a": (0, 5)}) == [{"a": 2, "b": 1}]
+        assert solve([a + b, 1]) == []
+        with pytest.raises(ValueError, match="continuous family"):
+            solve([a - b])
+    
+    def test_scanner_matches_grid_scan(self, tmp_path, monkeypatch):
+        """Parametric Blocks A and C find exactly the grid hits"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum(include_right_neutrino=False)]
+        found = []
+        for parametric in (False, True):
+            scanner = ParameterSpaceScanner(base, {}, cache=AnomalyCache(0), parametric=parametric)
+            scanner.scan_single_additions(hyper_max=12)
+            scanner.scan_chiral_pairs()
+            found.append([r.description for r in scanner.anomaly_free_models])
+        assert found[0] == found[1] and found[0]
+        assert scanner.engines_used == {"parametric": 14, "structural": 3}
+    
+    def test_off_grid_block_a(self, tmp_path, monkeypatch):
+        """Off-grid Block A finds roots off the k/6 grid, independent of hyper_max"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum(include_right_neutrino=False)]
+        base.append(fermion_to_dict(Fermion("Z", 1, 1, fractions.Fraction(2, 5))))
+        found = []
+        for kwargs in ({"parametric": True}, {"off_grid": True}):
+            for hyper_max in (6, 60):
+                scanner = ParameterSpaceScanner(base, {}, cache=AnomalyCache(0), **kwargs)
+                scanner.scan_single_additions(hyper_max=hyper_max)
+                found.append(sorted((str(f.hypercharge), f.chirality) for f in scanner.block_a_hits))
+        assert found[0] == found[1] == []
+        assert found[2] == found[3] == [("-2/5", 1), ("2/5", -1)]
+        assert scanner.engines_used == {"parametric": 14}
+        
+        # Bases the grid can cancel give the same hits either way
+        base = [fermion_to_dict(f) for f in standard_model_spectrum(include_right_neutrino=False)[:-1]]
+        names = []
+        for off_grid in (False, True):
+            scanner = ParameterSpaceScanner(base, {}, cache=AnomalyCache(0), parametric=True,
+                                            off_grid=off_grid)
+            scanner.scan_single_additions(hyper_max=12)
+            names.append([f.name for f in scanner.block_a_hits])
+        assert names[0] == names[1] == ["X_11_-6_R", "X_11_6_L"]
+
+    def test_off_grid_block_a_does_not_scale_with_hyper_max(self, tmp_path, monkeypatch):
+        """No k/6 grid is enumerated, so an astronomical hyper_max costs nothing"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum(include_right_neutrino=False)]
+        scanner = ParameterSpaceScanner(base, {}, cache=AnomalyCache(0), off_grid=True)
+        scanner.scan_single_additions(hyper_max=10**12)
+        assert {f.hypercharge for f in scanner.block_a_hits} == {0}
+        assert len(scanner.block_a_hits) == 6
+        assert scanner.scan_seconds < 5
+    
+    def test_base_deficit(self):
+        """A base anomaly vector is equivalent to listing the base fields"""
+        base = standard_model_spectrum(include_right_neutrino=False)[:-1]
+        extra = [SymbolicFermion("X", 1, 1, "a", -1)]
+        deficit = AnomalyChecker(base).compute_vector()
+        assert (ParametricChecker(extra, base=deficit).constraints()
+                == ParametricChecker(base + extra).constraints())
+        assert ParametricChecker(extra, base=deficit).solve() == [{"a": -1}]
+
+
+class TestGutBranching:
+    """Test GUT multiplet decompositions and their disk cache"""
+    
+    @staticmethod
+    def left_handed(fermions):
+        """Quantum numbers with every field written as left-handed"""
+        conj = {1: 1, 3: "3bar", 8: 8}
+        return sorted(
+            str((f.su3_rep, f.su2_rep, f.hypercharge) if f.chirality == 1
+                else (conj[f.su3_rep], f.su2_rep, -f.hypercharge))
+            for f in fermions
+        )
+    
+    def test_su5_multiplets(self, tmp_path):
+        """5bar + 10 is one Standard Model generation"""
+        engine = BranchingEngine(tmp_path / "branching.json")
+        assert normalize_irrep("5\u0304") == normalize_irrep("5b") == "5bar"
+        assert engine.decompose("SU(5)", "5\u0304") == [
+            (1, 2, fractions.Fraction(-1, 2), 1), ("3bar", 1, fractions.Fraction(1, 3), 1)
+        ]
+        family = engine.fermions("SU(5)", "5bar") + engine.fermions("SU(5)", "10")
+        sm = standard_model_spectrum(include_right_neutrino=False)
+        assert self.left_handed(family) == self.left_handed(sm)
+        assert engine.dimension("SU(5)", "45") == 45
+    
+    def test_so10_and_e6_multiplets_are_anomaly_free(self, tmp_path):
+        """Every tabulated irrep has the right dimension and no anomaly"""
+        engine = BranchingEngine(tmp_path / "branching.json")
+        for group in ("SO(10)", "E6"):
+            for irrep in BRANCHING_RULES[group]:
+                assert engine.dimension(group, irrep) == int(irrep.rstrip("bar"))
+                checker = AnomalyChecker(engine.fermions(group, irrep), conditions=GUT_CONDITIONS)
+                assert all(v == 0 for v in checker.compute_anomalies().values()), (group, irrep)
+        sm = standard_model_spectrum(include_right_neutrino=True)
+        assert self.left_handed(engine.fermions("SO(10)", "16")) == self.left_handed(sm)
+    
+    def test_cache_persists(self, tmp_path):
+        """A second engine reads decompositions from disk"""
+        path = tmp_path / "branching.json"
+        first = BranchingEngine(path)
+        expected = first.decompose("E6", "27")
+        assert path.exists()
+        second = BranchingEngine(path)
+        assert second.decompose("E6", "27") == expected
+        assert second.statistics()['misses'] == 0
+        with pytest.raises(ValueError, match="No branching rule"):
+            second.decompose("SO(10)", "11")
+    
+    def test_disk_cache_is_opt_in(self, tmp_path, monkeypatch):
+        """Without a path or $ANOMALY_BRANCHING_CACHE nothing is written"""
+        monkeypatch.delenv("ANOMALY_BRANCHING_CACHE", raising=False)
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        engine = BranchingEngine()
+        assert engine.decompose("E6", "27") == engine.decompose("E6", "27")
+        assert engine.statistics()['path'] is None and engine.statistics()['writes'] == 0
+        assert list(tmp_path.rglob("*")) == []
+        monkeypatch.setenv("ANOMALY_BRANCHING_CACHE", str(tmp_path / "env.json"))
+        BranchingEngine().decompose("SU(5)", "10")
+        assert (tmp_path / "env.json").exists()
+    
+    def test_replaced_rules_are_not_served_from_cache(self, tmp_path, monkeypatch):
+        """A new rule changes its irrep and the irreps branching through it"""
+        path = tmp_path / "branching.json"
+        monkeypatch.setitem(BRANCHING_RULES, "SO(10)", dict(BRANCHING_RULES["SO(10)"]))
+        engine = BranchingEngine(path)
+        assert engine.dimension("SO(10)", "10") == 10 and engine.dimension("E6", "27") == 27
+        register_branching("SO(10)", "10", "SU(5)", ["5", "5bar", "1"])
+        assert engine.dimension("SO(10)", "10") == 11 and engine.dimension("E6", "27") == 28
+        assert BranchingEngine(path).dimension("E6", "27") == 28
+    
+    def test_cache_file_written_once_per_batch(self, tmp_path):
+        """Sub-decompositions and expanded templates share one write"""
+        engine = BranchingEngine(tmp_path / "branching.json")
+        engine.decompose("E6", "78")
+        assert engine.statistics()['writes'] == 1
+        engine.expand([{"gut": "E6", "irrep": r} for r in ("27", "27bar", "1")])
+        assert engine.statistics()['writes'] == 2
+        engine.expand([{"gut": "E6", "irrep": "27"}])
+        assert engine.statistics()['writes'] == 2
+    
+    def test_scan_and_scanner_templates(self, tmp_path, monkeypatch):
+        """Multiplet scans and GUT entries in scanner templates"""
+        from src.param_space_scanner import ParameterSpaceScanner
+        engine = BranchingEngine(tmp_path / "branching.json")
+        assert scan_multiplets("SU(5)", ["5bar", "10"], 2, engine=engine) == [("5bar", "10")]
+        monkeypatch.setenv("ANOMALY_BRANCHING_CACHE", str(tmp_path / "default.json"))
+        monkeypatch.setattr("src.gut_branching._default_engine", None)
+        monkeypatch.chdir(tmp_path)
+        scanner = ParameterSpaceScanner([{"gut": "SO(10)", "irrep": "16", "name": "F"}], {},
+                                        cache=AnomalyCache(0))
+        assert len(scanner.base_spectrum) == 6
+        assert scanner.base_context.vector.is_zero()
+
+
+class TestGaugeModel:
+    """Test conditions derived from product gauge groups"""
+    
+    def test_standard_model_matches_checker(self):
+        """SU(3)_C × SU(2)_L × U(1)_Y reproduces the registered conditions"""
+        model = GaugeModel.standard_model()
+        fermions = standard_model_spectrum() + [
+            Fermion("X", su3_rep=6, su2_rep=2, hypercharge=fractions.Fraction(2, 7), generations=3),
+            Fermion("Y", su3_rep="3bar", su2_rep=3, hypercharge=fractions.Fraction(1, 3)),
+        ]
+        vector = model.anomalies([model.from_fermion(f) for f in fermions])
+        expected = AnomalyChecker(fermions, conditions=EXTENDED_KEYS).compute_anomalies()
+        assert vector['[SU(3)_C]³'] == expected['[SU(3)]³ cubic']
+        assert vector['Witten SU(2)_L'] == expected['Witten SU(2)']
+        assert vector['[U(1)_Y][SU(3)_C]²'] == expected['[U(1)_Y][SU(3)]²']
+        assert vector['[U(1)_Y][SU(2)_L]²'] == expected['[U(1)_Y][SU(2)]²']
+        assert vector['[U(1)_Y]³'] == expected['[U(1)_Y]³']
+        assert vector['[Gravity]²[U(1)_Y]'] == expected['[Gravity]²[U(1)_Y]']
+    
+    def test_derived_conditions(self):
+        """Every factor contributes its cubic, mixed and gravitational conditions"""
+        model = GaugeModel("SU(3)_C x SU(2)_L x SU(2)_R x U(1)_B-L x U(1)_F")
+        keys = model.keys
+        assert 'Witten SU(2)_R' in keys and '[U(1)_F][SU(2)_R]²' in keys
+        assert '[U(1)_B-L]²[U(1)_F]' in keys and '[Gravity]²[U(1)_F]' in keys
+        assert len(keys) == 1 + 2 + 2 * 3 + 4 + 2
+        with pytest.raises(ValueError, match="Duplicate"):
+            GaugeModel("U(1) x U(1)")
+        with pytest.raises(ValueError, match="Unsupported gauge factor"):
+            GaugeFactor.parse("SO(10)")
+    
+    def test_left_right_model(self):
+        """A right-handed doublet alone leaves SU(2)_R anomalous"""
+        model = GaugeModel("SU(3)_C x SU(2)_L x SU(2)_R x U(1)_B-L")
+        fields = [
+            model.field("Q_L", {"SU(3)_C": 3, "SU(2)_L": 2, "U(1)_B-L": "1/3"}),
+            model.field("Q_R", {"SU(3)_C": 3, "SU(2)_R": 2, "U(1)_B-L": "1/3"}, chirality=-1),
+            model.field("L_L", {"SU(2)_L": 2, "U(1)_B-L": -1}),
+            model.field("L_R", {"SU(2)_R": 2, "U(1)_B-L": -1}, chirality=-1),
+        ]
+        assert model.verify_cancellation(fields) == (True, [])
+        ok, failures = model.verify_cancellation(fields[:3])
+        assert not ok
+        assert any(f.startswith('[U(1)_B-L][SU(2)_R]²') for f in failures)
+        with pytest.raises(ValueError, match="Unsupported SU\\(2\\)_R"):
+            model.field("bad", {"SU(2)_R": "3bar"})
+    
+    def test_yaml_gauge_rules(self):
+        """The gauge_group rules shipped in configs are anomaly-free"""
+        from src.yaml_rule_loader import YAMLRuleLoader
+        loader = YAMLRuleLoader(Path(__file__).parent.parent / "configs" / "scanner_rules.yaml")
+        gauge_rules = [name for name, rule in loader.rules.items() if rule.gauge_group]
+        assert len(gauge_rules) >= 3
+        for name in gauge_rules:
+            model = loader.get_gauge_model(name)
+            assert model.anomalies(loader.get_gauge_fields(name)).is_zero(), name
+        assert loader.get_gauge_model("SM_Plus_VectorLike_Pair_BlockB") is None
+
+
+class TestFlavoredU1:
+    """Test family-dependent U(1)' extensions"""
+    
+    @staticmethod
+    def three_generations(include_right_neutrino=False):
+        return [
+            Fermion(f.name, f.su3_rep, f.su2_rep, f.hypercharge, f.chirality, generations=3)
+            for f in standard_model_spectrum(include_right_neutrino)
+        ]
+    
+    def test_known_flavored_symmetries(self):
+        """B - L (with ν_R) and L_μ - L_τ cancel; a single lepton family does not"""
+        checker = FlavoredU1Checker(self.three_generations(True), "U(1)_B-L")
+        assert len(checker) == 18
+        charges = {f: "1/3" for f in ("Q_L", "u_R", "d_R")}
+        charges.update({f: -1 for f in ("L_L", "e_R", "ν_R")})
+        assert checker.verify_cancellation(charges) == (True, [])
+        
+        checker = FlavoredU1Checker(self.three_generations(), "U(1)_Lμ-Lτ")
+        assert checker.verify_cancellation({"L_L": [0, 1, -1], "e_R": [0, 1, -1]}) == (True, [])
+        ok, failures = checker.verify_cancellation({"L_L": [0, 1, 0], "e_R": [0, 1, 0]})
+        assert not ok
+        assert '[U(1)_Lμ-Lτ][SU(2)]²' in failures and '[U(1)_Lμ-Lτ][SU(3)]²' not in failures
+    
+    def test_matches_gauge_model(self):
+        """Two U(1)' factors reproduce GaugeModel with one field per generation"""
+        fermions = [
+            Fermion(f.name, f.su3_rep, f.su2_rep, f.hypercharge, f.chirality, generations=2)
+            for f in standard_model_spectrum()
+        ] + [Fermion("X", su3_rep=6, su2_rep=3, hypercharge=fractions.Fraction(1, 5))]
+        checker = FlavoredU1Checker(fermions, ["U(1)_A", "U(1)_B"])
+        charges = [(s % 5 - 2, fractions.Fraction(7 - 3 * s, 4)) for s in range(len(checker))]
+        vector = checker.anomalies(charges)
+        
+        model = GaugeModel("SU(3) x SU(2) x U(1)_A x U(1)_B x U(1)_Y")
+        fields = [
+            model.field(label, {"SU(3)": fermions[i].su3_rep, "SU(2)": fermions[i].su2_rep,
+                                "U(1)_A": a, "U(1)_B": b, "U(1)_Y": fermions[i].hypercharge},
+                        fermions[i].chirality)
+            for label, (i, _), (a, b) in zip(checker.slot_labels, checker.slots, charges)
+        ]
+        expected = model.anomalies(fields)
+        for key in checker.keys[len(checker.base):]:
+            assert vector[key] == expected[key], key
+    
+    def test_batch_matches_exact(self):
+        """The vectorized and exact batch paths agree with anomalies()"""
+        checker = FlavoredU1Checker(self.three_generations(True))
+        batch = [[(3 * r + s) % 7 - 3 for s in range(len(checker))] for r in range(20)]
+        batch.append([1 if s < 9 else -3 for s in range(len(checker))])
+        paths = [False] + ([True] if HAS_NUMPY else [])
+        for use_numpy in paths:
+            result = checker.evaluate_batch(batch, denominator=3, use_numpy=use_numpy)
+            assert result.hits() == [20]
+            for i, row in enumerate(batch):
+                charges = [fractions.Fraction(n, 3) for n in row]
+                assert result.vector(i) == checker.anomalies(charges)
+    
+    def test_scan(self):
+        """Lepton-only charges in {-1, 0, 1} cancel iff L and e are permutations of (-1, 0, 1)"""
+        checker = FlavoredU1Checker(self.three_generations())
+        quarks = {"Q_L": 0, "u_R": 0, "d_R": 0}
+        assert checker.candidate_count(range(-1, 2), fixed=quarks) == 3**6
+        hits = list(checker.scan(range(-1, 2), fixed=quarks, batch_size=100))
+        assert len(hits) == 6 * 6
+        for charges in hits:
+            assert sorted(charges[9:12]) == sorted(charges[12:15]) == [-1, 0, 1]
+            assert checker.verify_cancellation(charges)[0]
+        with pytest.raises(ValueError, match="Unknown fields"):
+            checker.assignment({"H": 1})
+    
+    def test_yaml_constraint(self):
+        """The u1_prime rule section is parsed into a U1PrimeConstraint"""
+        from src.yaml_rule_loader import YAMLRuleLoader
+        loader = YAMLRuleLoader(Path(__file__).parent.parent / "configs" / "scanner_rules.yaml")
+        constraint = loader.get_u1_prime_constraint("SM_Flavored_U1_Prime_Leptons")
+        assert constraint.generations == 3
+        assert constraint.numerators() == [-1, 0, 1]
+        assert constraint.universal == ["Q_L", "u_R", "d_R"]
+        assert loader.get_u1_prime_constraint("SM_Plus_VectorLike_Pair_BlockB") is None
+    
+    def test_rule_scan_engine(self, tmp_path, monkeypatch):
+        """--engine selects the batch backend and is recorded in the summary"""
+        from bin.scan_with_rules import RuleBasedScanner
+        monkeypatch.chdir(tmp_path)
+        root = Path(__file__).parent.parent
+        evaluate_batch = FlavoredU1Checker.evaluate_batch
+        requested = []
+        
+        def record(self, charges, denominator=1, use_numpy=None):
+            requested.append(use_numpy)
+            return evaluate_batch(self, charges, denominator, use_numpy=False)
+        
+        monkeypatch.setattr(FlavoredU1Checker, "evaluate_batch", record)
+        monkeypatch.setattr("bin.scan_with_rules.HAS_NUMPY", True)
+        monkeypatch.setattr("src.batch_evaluator.HAS_NUMPY", True)
+        for engine, expected in (("reference", False), ("integer", False),
+                                 ("vector", True), ("auto", True)):
+            requested.clear()
+            scanner = RuleBasedScanner(root / "configs" / "scanner_rules.yaml",
+                                       root / "bin" / "scan_template.json", engine=engine)
+            results = scanner.scan_with_rule("SM_Flavored_U1_Prime_Leptons", limit=1)
+            assert set(requested) == {expected}
+            stats = results['engine_statistics']
+            assert stats['engine'] == engine
+            assert stats['engines_used'] == {"vector" if expected else engine: 3**9}
+            assert stats['configurations_per_second'] > 0
+
+
+class TestU1ChargeGenerator:
+    """Test the constructive generator of anomaly-free U(1) charges"""
+    
+    @staticmethod
+    def brute_force(n, q_max):
+        import itertools
+        found = set()
+        for charges in itertools.combinations_with_replacement(range(-q_max, q_max + 1), n):
+            if any(charges) and sum(charges) == 0 and sum(z**3 for z in charges) == 0:
+                found.add(canonical(charges))
+        return sorted(found)
+    
+    def test_matches_brute_force(self):
+        """Exhaustive, duplicate-free and in canonical order"""
+        for n in range(2, 7):
+            for q_max in (1, 3, 5):
+                assert list(U1ChargeGenerator(n, q_max)) == self.brute_force(n, q_max), (n, q_max)
+    
+    def test_filters(self):
+        """The nonzero, primitive and chiral filters"""
+        assert list(U1ChargeGenerator(5, 10, nonzero=True, primitive=True, chiral=True)) == [
+            (-10, -4, -2, 7, 9), (-9, -5, -1, 7, 8)
+        ]
+        for charges in U1ChargeGenerator(6, 4, nonzero=True):
+            assert 0 not in charges
+        assert (-2, 0, 2) in list(U1ChargeGenerator(3, 2))
+        assert (-2, 0, 2) not in list(U1ChargeGenerator(3, 2, primitive=True))
+        assert list(U1ChargeGenerator(4, 3, chiral=True)) == []
+    
+    def test_solutions_cancel(self):
+        """Every assignment cancels the gauge model's conditions"""
+        model = GaugeModel(["U(1)_D"])
+        generator = U1ChargeGenerator(8, 6, chiral=True, primitive=True)
+        solutions = list(generator)
+        assert solutions and generator.statistics()['solutions'] == len(solutions)
+        for charges in solutions:
+            assert model.verify_cancellation(to_fields(charges, model)) == (True, [])
+    
+    def test_solve_pair(self):
+        """The last pair follows from its sum and sum of cubes"""
+        assert solve_pair(16, 7**3 + 9**3) == [(7, 9)]
+        assert solve_pair(1, 2) == []
+        assert solve_pair(0, 0) == [(0, 0)]
+        with pytest.raises(ValueError):
+            U1ChargeGenerator(1, 5)
+
+
+class TestStructuralCancellation:
+    """Test the symmetry short-circuit for self-cancelling candidates"""
+    
+    def test_cancels_by_symmetry(self):
+        """Vector-like and (1, 2)_{±Y} pairs cancel, chiral additions do not"""
+        Y = fractions.Fraction(7, 6)
+        assert cancels_by_symmetry([Fermion("X_L", 3, 2, Y, 1), Fermion("X_R", 3, 2, Y, -1)])
+        assert cancels_by_symmetry([Fermion("Hu", 1, 2, Y, 1), Fermion("Hd", 1, 2, -Y, 1)])
+        assert cancels_by_symmetry(
+            [Fermion("Hu", 1, 2, Y, 1), Fermion("Hd", 1, 2, -Y, 1)], EXTENDED_KEYS
+        )
+        # [SU(3)]³ and [SU(3)]²[U(1)] do not flip with Y
+        assert not cancels_by_symmetry([Fermion("D", 3, 1, Y, 1), Fermion("Dc", 3, 1, -Y, 1)])
+        assert not cancels_by_symmetry([Fermion("X_L", 3, 2, Y, 1)])
+        assert not cancels_by_symmetry([Fermion("X_L", 1, 2, Y, 1), Fermion("X_R", 1, 2, -Y, -1)])
+        assert cancels_by_symmetry(Spectrum([Fermion("X_L", 1, 1, Y, 1), Fermion("X_R", 1, 1, Y, -1)]))
+        assert cancels_by_symmetry([])
+    
+    def test_scanner_skips_arithmetic(self, tmp_path, monkeypatch):
+        """Neutral candidates are classified by the base alone, same results"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum()]
+        config = {'su3_rep': {'values': [1, 3]}, 'su2_rep': {'values': [1, 2]}}
+        scanner = ParameterSpaceScanner(base, config, cache=AnomalyCache(0), families=False)
+        vector_like = scanner.scan_vector_like_pairs(hyper_max=6)
+        chiral = scanner.scan_chiral_pairs()
+        assert len(vector_like) == 4 * 13 and len(chiral) == 3
+        assert scanner.engines_used == {"structural": 4 * 13 + 3}
+        
+        # An anomalous base rejects every neutral candidate
+        broken = [f for f in base if f['name'] != 'e_R']
+        scanner = ParameterSpaceScanner(broken, config, cache=AnomalyCache(0))
+        assert scanner.scan_vector_like_pairs(hyper_max=6) == []
+        assert scanner.scan_chiral_pairs() == []
+    
+    def test_families(self, tmp_path, monkeypatch):
+        """By default, one parametric result per representation instead of one per Y"""
+        from src.param_space_scanner import ParameterSpaceScanner, fermion_to_dict
+        monkeypatch.chdir(tmp_path)
+        base = [fermion_to_dict(f) for f in standard_model_spectrum()]
+        config = {'su3_rep': {'values': [1, 3]}, 'su2_rep': {'values': [1, 2]}}
+        scanner = ParameterSpaceScanner(base, config, cache=AnomalyCache(0))
+        vector_like = scanner.scan_vector_like_pairs(hyper_max=6)
+        chiral = scanner.scan_chiral_pairs()
+        assert len(vector_like) == 4 and len(chiral) == 1
+        assert len(vector_like[0].family['y']) == 13
+        assert chiral[0].description == "Chiral pair: (1, 2)_[+y, -y], y ∈ {1/2, 1, 3/2}"
+        assert len(list(tmp_path.glob("results/*.json"))) == 5
+        
+        data = json.loads(next(tmp_path.glob("results/higgsino_family_*.json")).read_text())
+        assert data['family'] == {'y': ["1/2", "1", "3/2"]}
+        assert [f['hypercharge'] for f in data['fermions'][-2:]] == ["y", "-y"]
+        
+        scanner.export_results("out.json")
+        exported = json.loads((tmp_path / "out.json").read_text())["anomaly_free_models"]
+        assert exported[-1]["family"] == {'y': ["1/2", "1", "3/2"]}
+        
+        per_point = ParameterSpaceScanner(base, dict(config, families=False), cache=AnomalyCache(0))
+        assert len(per_point.scan_vector_like_pairs(hyper_max=6)) == 4 * 13
+
+
 def test_tolerance_parameter():
     """Test the tolerance parameter in verify_cancellation"""
     fermions = standard_model_spectrum(include_right_neutrino=False)
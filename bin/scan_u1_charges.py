@@ -0,0 +1,5 @@
+# Thin wrapper to import and run u1_charge_generator.py from src
+from src import u1_charge_generator
+
+if __name__ == "__main__":
+    u1_charge_generator.main()
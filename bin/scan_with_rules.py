@@ -10,6 +10,7 @@ Version: 1.0
 """
 
 import argparse
+import fractions
 import json
 import sys
 from pathlib import Path
@@ -20,9 +21,12 @@ import time
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from src.param_space_scanner import ParameterSpaceScanner, ScanResult
+    from src.param_space_scanner import ParameterSpaceScanner, ScanResult, SCANNER_ENGINES
     from src.yaml_rule_loader import YAMLRuleLoader
-    from src.anomaly_checker import Fermion, AnomalyChecker
+    from src.anomaly_checker import Fermion, ENGINES
+    from src.batch_evaluator import select_engine
+    from src.anomaly_cache import configure_default_cache
+    from src.flavored_u1 import FlavoredU1Checker, DEFAULT_BATCH_SIZE, HAS_NUMPY
 except ImportError as e:
     print(f"Error importing required modules: {e}")
     print("Ensure scan_param_space.py, rule_loader.py, and anomaly_checker.py are available")
@@ -35,16 +39,18 @@ class RuleBasedScanner:
     Integrates YAMLRuleLoader with ParameterSpaceScanner.
     """
     
-    def __init__(self, rule_file: Path, template_file: Path):
+    def __init__(self, rule_file: Path, template_file: Path, engine: str = "reference"):
         """
         Initialize the rule-based scanner.
         
         Args:
             rule_file: Path to YAML rule file
             template_file: Path to base spectrum template JSON
+            engine: Evaluation backend for every scan (see SCANNER_ENGINES)
         """
         self.rule_loader = YAMLRuleLoader(rule_file)
         self.template_file = template_file
+        self.engine = engine
         
         # Load base template
         with open(template_file, 'r') as f:
@@ -74,6 +80,10 @@ class RuleBasedScanner:
         
         # Get the appropriate base spectrum
         rule = self.rule_loader.rules[rule_name]
+        if rule.gauge_group is not None:
+            return self.check_gauge_rule(rule_name, output_dir)
+        if rule.u1_prime is not None:
+            return self.scan_flavored_u1(rule_name, output_dir, limit)
         base_spectrum = self._get_base_spectrum(rule.base_spectrum)
         
         # Override scan configuration with rule-based config
@@ -93,7 +103,7 @@ class RuleBasedScanner:
                 scan_config['hypercharge']['k_max'] = hyper_max
         
         # Create scanner with rule-based configuration
-        scanner = ParameterSpaceScanner(base_spectrum, scan_config)
+        scanner = ParameterSpaceScanner(base_spectrum, scan_config, engine=self.engine)
         
         # Disable blocks not specified in rule
         enabled_blocks = scan_config.get('enabled_blocks', ['A', 'B', 'C'])
@@ -144,7 +154,10 @@ class RuleBasedScanner:
             'anomaly_free_models_found': len(scanner.anomaly_free_models),
             'scan_time_seconds': elapsed_time,
             'blocks_used': enabled_blocks,
-            'models_by_type': self._categorize_models(scanner.anomaly_free_models)
+            'models_by_type': self._categorize_models(scanner.anomaly_free_models),
+            'engine_statistics': scanner.statistics(),
+            'early_exit_statistics': scanner.verifier.statistics(),
+            'cache_statistics': scanner.cache.statistics()
         }
         
         # Save results
@@ -167,6 +180,158 @@ class RuleBasedScanner:
         
         return results
     
+    def check_gauge_rule(self, rule_name: str, output_dir: Path = None) -> Dict[str, Any]:
+        """
+        Check the field content of a rule with its own gauge group.
+        
+        Every condition of the declared product group is derived and
+        evaluated; the Standard Model blocks do not apply to such rules.
+        
+        Args:
+            rule_name: Name of a rule with a gauge_group section
+            output_dir: Directory for the summary file
+            
+        Returns:
+            Dictionary with the anomaly coefficients and verdict
+        """
+        rule = self.rule_loader.rules[rule_name]
+        model = self.rule_loader.get_gauge_model(rule_name)
+        fields = self.rule_loader.get_gauge_fields(rule_name)
+        
+        start_time = time.time()
+        anomalies = model.anomalies(fields)
+        all_cancel, non_cancelling = model.verify_cancellation(fields)
+        elapsed_time = time.time() - start_time
+        
+        print(f"\nChecking rule: {rule_name}")
+        print(f"Description: {rule.description}")
+        print(f"Gauge group: {model}")
+        print("=" * 60)
+        for name, value in anomalies.items():
+            status = "✓" if value == 0 else "✗"
+            print(f"{status} {name:30} = {value}")
+        print("✓ All anomalies cancel" if all_cancel else "✗ Anomalies do not cancel")
+        
+        results = {
+            'rule_name': rule_name,
+            'rule_description': rule.description,
+            'gauge_group': str(model),
+            'fields': len(fields),
+            'anomalies': {k: str(v) for k, v in anomalies.items()},
+            'is_anomaly_free': all_cancel,
+            'non_cancelling': non_cancelling,
+            'anomaly_free_models_found': int(all_cancel),
+            'scan_time_seconds': elapsed_time
+        }
+        
+        if output_dir:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(exist_ok=True)
+            summary_file = output_dir / f"scan_summary_{rule_name}.json"
+            with open(summary_file, 'w') as f:
+                json.dump(results, f, indent=2)
+        
+        return results
+    
+    def scan_flavored_u1(self, rule_name: str, output_dir: Path = None,
+                         limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Scan per-generation charges of an extra U(1)' factor.
+        
+        The rule's u1_prime constraint fixes the charge grid, fixed and
+        generation-universal fields; every remaining (field, generation)
+        slot is scanned and all candidates are evaluated in vectorized
+        batches (see src/flavored_u1.py).
+        
+        Args:
+            rule_name: Name of a rule with a u1_prime constraint
+            output_dir: Directory for the summary and model files
+            limit: Maximum number of models to find
+            
+        Returns:
+            Dictionary with scan results and statistics
+        """
+        rule = self.rule_loader.rules[rule_name]
+        constraint = rule.u1_prime
+        base = [
+            Fermion(
+                name=f['name'],
+                su3_rep=f['su3_rep'],
+                su2_rep=f['su2_rep'],
+                hypercharge=fractions.Fraction(f['hypercharge']),
+                chirality=f.get('chirality', 1),
+                generations=constraint.generations or f.get('generations', 1)
+            )
+            for f in self._get_base_spectrum(rule.base_spectrum)
+        ]
+        
+        checker_engine = self.engine if self.engine in ENGINES else "integer"
+        checker = FlavoredU1Checker(base, constraint.name, engine=checker_engine)
+        numerators = constraint.numerators()
+        tested = checker.candidate_count(numerators, constraint.fixed, constraint.universal)
+        if tested > constraint.max_candidates:
+            raise ValueError(f"Rule {rule_name} spans {tested} charge assignments, "
+                             f"above max_candidates = {constraint.max_candidates}")
+        
+        # Batches run on NumPy for "vector", on exact Python ints otherwise
+        batch_engine = select_engine(self.engine, len(checker), min(tested, DEFAULT_BATCH_SIZE))
+        if batch_engine == "vector" and not HAS_NUMPY:
+            batch_engine = "integer"
+        use_numpy = batch_engine == "vector"
+        
+        print(f"\nRunning U(1)' scan with rule: {rule_name}")
+        print(f"Description: {rule.description}")
+        print(f"Charge slots: {len(checker)}, candidates: {tested}")
+        print("=" * 60)
+        
+        start_time = time.time()
+        models = []
+        for charges in checker.scan(numerators, constraint.denominator,
+                                    constraint.fixed, constraint.universal,
+                                    use_numpy=use_numpy):
+            models.append({label: str(q) for label, q in zip(checker.slot_labels, charges)})
+            if limit and len(models) >= limit:
+                print(f"Reached limit of {limit} models.")
+                break
+        elapsed_time = time.time() - start_time
+        
+        results = {
+            'rule_name': rule_name,
+            'rule_description': rule.description,
+            'base_spectrum': rule.base_spectrum,
+            'u1_prime': constraint.name,
+            'charge_slots': len(checker),
+            'total_configurations_tested': tested,
+            'anomaly_free_models_found': len(models),
+            'scan_time_seconds': elapsed_time,
+            'engine_statistics': {
+                'engine': self.engine,
+                'engines_used': {batch_engine: tested},
+                'configurations_tested': tested,
+                'scan_seconds': elapsed_time,
+                'configurations_per_second': tested / elapsed_time if elapsed_time else 0.0,
+            }
+        }
+        
+        if output_dir:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(exist_ok=True)
+            summary_file = output_dir / f"scan_summary_{rule_name}.json"
+            with open(summary_file, 'w') as f:
+                json.dump(results, f, indent=2)
+            if models:
+                models_file = output_dir / f"models_{rule_name}.json"
+                with open(models_file, 'w') as f:
+                    json.dump({'keys': list(checker.keys), 'models': models}, f, indent=2)
+        
+        print(f"Anomaly-free charge assignments found: {len(models)}")
+        print(f"Scan time: {elapsed_time:.2f} seconds")
+        engine = results['engine_statistics']
+        print(f"Engine: {batch_engine} "
+              f"({engine['configurations_per_second']:.0f} configurations/s)")
+        
+        return results
+    
     def _get_base_spectrum(self, spectrum_name: str) -> List[Dict]:
         """Get base spectrum by name"""
         if spectrum_name == "standard_model":
@@ -186,20 +351,19 @@ class RuleBasedScanner:
     def _test_physics_sets(self, scanner: ParameterSpaceScanner, 
                           physics_sets: List[List[Fermion]]) -> None:
         """Test pre-defined physics-motivated fermion sets"""
-        base_fermions = [scanner.create_fermion_from_dict(f) 
-                        for f in scanner.base_spectrum]
+        context = scanner.base_context
         
         for i, fermion_set in enumerate(physics_sets):
-            test_spectrum = base_fermions + fermion_set
-            checker = AnomalyChecker(test_spectrum)
-            all_cancel, failures = checker.verify_cancellation()
+            anomalies = scanner._evaluate_candidate(fermion_set)
             
-            if all_cancel:
+            if anomalies is not None:
+                test_spectrum = context.base + fermion_set
+                
                 # Create ScanResult
                 desc = f"Physics-motivated set {i+1}"
                 result = ScanResult(
                     spectrum=test_spectrum,
-                    anomalies=checker.compute_anomalies(),
+                    anomalies=anomalies,
                     is_anomaly_free=True,
                     description=desc
                 )
@@ -243,6 +407,9 @@ class RuleBasedScanner:
         print(f"Total configurations tested: {results['total_configurations_tested']}")
         print(f"Anomaly-free models found: {results['anomaly_free_models_found']}")
         print(f"Scan time: {results['scan_time_seconds']:.2f} seconds")
+        engine = results['engine_statistics']
+        print(f"Engine: {engine['engine']} "
+              f"({engine['configurations_per_second']:.0f} configurations/s)")
         
         print("\nModels by type:")
         for category, count in results['models_by_type'].items():
@@ -335,6 +502,25 @@ def main():
         help="Maximum number of models to find"
     )
     
+    parser.add_argument(
+        "--engine",
+        choices=SCANNER_ENGINES,
+        default="reference",
+        help="Evaluation backend; auto picks one per block from the grid size "
+             "and NumPy availability (default: reference)"
+    )
+    
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        help="Maximum number of cached anomaly evaluations (0 disables caching)"
+    )
+    
+    parser.add_argument(
+        "--cache-db",
+        help="SQLite file for persistent anomaly results (default: $ANOMALY_CACHE_DB, if set)"
+    )
+    
     parser.add_argument(
         "--list-rules",
         action="store_true",
@@ -354,7 +540,7 @@ def main():
     
     # Create scanner
     try:
-        scanner = RuleBasedScanner(args.rule_file, args.template_file)
+        scanner = RuleBasedScanner(args.rule_file, args.template_file, args.engine)
     except Exception as e:
         print(f"Error initializing scanner: {e}")
         sys.exit(1)
@@ -375,23 +561,29 @@ def main():
     # Create output directory
     args.output.mkdir(exist_ok=True)
     
+    # Anomaly cache shared by all scans of this run
+    cache = configure_default_cache(args.cache_size, args.cache_db)
+    
     # Run scan(s)
-    if args.batch:
-        # Batch mode
-        scanner.batch_scan(
-            args.batch,
-            output_dir=args.output,
-            hyper_max=args.hyper_max,
-            limit=args.limit
-        )
-    else:
-        # Single rule mode
-        scanner.scan_with_rule(
-            args.rule,
-            output_dir=args.output,
-            hyper_max=args.hyper_max,
-            limit=args.limit
-        )
+    try:
+        if args.batch:
+            # Batch mode
+            scanner.batch_scan(
+                args.batch,
+                output_dir=args.output,
+                hyper_max=args.hyper_max,
+                limit=args.limit
+            )
+        else:
+            # Single rule mode
+            scanner.scan_with_rule(
+                args.rule,
+                output_dir=args.output,
+                hyper_max=args.hyper_max,
+                limit=args.limit
+            )
+    finally:
+        cache.close()
     
     print(f"\nResults saved to: {args.output}/")
 
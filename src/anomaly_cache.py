@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+anomaly_cache.py
+================
+Memoization of anomaly evaluations keyed by canonical spectrum signatures.
+Scans revisit the same spectra many times (Block B and B' overlap, batch
+scans rerun overlapping rules, physics sets repeat), so results are kept in
+a bounded LRU cache shared by every scanner in the process. An optional
+SQLite store behind it keeps results across runs, stamped with the engine
+version so that stale entries are discarded.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import fractions
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Union
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import (
+    Fermion, AnomalyChecker, AnomalyVector, spectrum_signature, ENGINE_VERSION
+)
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+DEFAULT_MAXSIZE = 65536
+
+# Environment variable naming the default persistent cache file
+CACHE_DB_ENV = "ANOMALY_CACHE_DB"
+
+_MISSING = object()
+
+
+class AnomalyCache:
+    """
+    Least-recently-used cache of anomaly results.
+
+    Keys are (kind, ..., signature) tuples; values are whatever the caller
+    computes for that kind (an AnomalyVector for "anomalies", an
+    AnomalyVector or None for a scanner "candidate" verdict, whose key also
+    names the conditions checked). maxsize=None
+    means unbounded, maxsize=0 disables storage while still counting misses.
+    With a backend, misses fall through to it and new values are written
+    through to it.
+    """
+
+    def __init__(self, maxsize: Optional[int] = DEFAULT_MAXSIZE,
+                 backend: Optional['PersistentAnomalyCache'] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries (None for unbounded)
+            backend: Persistent store consulted on misses
+        """
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"Cache size must be non-negative, got {maxsize}")
+        self.maxsize = maxsize
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key, updating recency and the hit/miss counters.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        value = self._data.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+        if self.backend is not None:
+            value = self.backend.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                self._store(key, value)
+                return value
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        self._store(key, value)
+        if self.backend is not None:
+            self.backend.put(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._evict()
+
+    def lookup(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Cached value for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def anomalies(self, fermions: List[Fermion], engine: str = "reference") -> AnomalyVector:
+        """
+        Anomaly vector of a spectrum, memoized by its canonical signature.
+
+        Args:
+            fermions: Spectrum to evaluate
+            engine: AnomalyChecker engine used on a miss
+
+        Returns:
+            AnomalyVector of the spectrum
+        """
+        return self.lookup(
+            ("anomalies", spectrum_signature(fermions)),
+            lambda: AnomalyChecker(fermions, engine).compute_vector()
+        )
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        """Change the capacity, evicting entries that no longer fit"""
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f"Cache size must be non-negative, got {maxsize}")
+        self.maxsize = maxsize
+        self._evict()
+
+    def _evict(self) -> None:
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Hit, miss and eviction counters in the style of functools"""
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self.maxsize, len(self._data))
+
+    def statistics(self) -> dict:
+        """Counters as a JSON-serializable dictionary"""
+        info = self.cache_info()._asdict()
+        lookups = self.hits + self.misses
+        info['hit_rate'] = self.hits / lookups if lookups else 0.0
+        if self.backend is not None:
+            info['persistent'] = self.backend.statistics()
+        return info
+
+    def close(self) -> None:
+        """Flush and detach the persistent backend, if any"""
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+
+
+def encode_key(key: Hashable) -> str:
+    """
+    Stable text form of a cache key.
+
+    Tuples, ints, strings and Fractions are written out explicitly so that
+    the encoding does not depend on Python's hash seed or repr details.
+    """
+    if isinstance(key, tuple):
+        return "(" + ",".join(encode_key(k) for k in key) + ")"
+    if isinstance(key, (int, fractions.Fraction)):
+        return str(key)
+    if isinstance(key, str):
+        return json.dumps(key)
+    raise TypeError(f"Unsupported cache key component: {key!r}")
+
+
+def _encode_value(value: Optional[AnomalyVector]) -> Optional[str]:
+    if value is None:
+        return None
+    if not isinstance(value, AnomalyVector):
+        raise TypeError(f"Only AnomalyVector or None can be persisted, got {type(value).__name__}")
+    return json.dumps({
+        'keys': list(value.layout),
+        'numerators': [str(n) for n in value.numerators],
+        'denominator': str(value.denominator),
+    })
+
+
+def _decode_value(text: Optional[str]) -> Optional[AnomalyVector]:
+    if text is None:
+        return None
+    data = json.loads(text)
+    return AnomalyVector([int(n) for n in data['numerators']],
+                         int(data['denominator']), tuple(data['keys']))
+
+
+class PersistentAnomalyCache:
+    """
+    SQLite-backed store of anomaly results shared across runs.
+
+    Rows are keyed by the digest of the full cache key, so verdicts for
+    different condition sets never share a row. Every row is stamped with
+    the engine version; rows written by another version are deleted when
+    the store is opened. Writes are buffered and
+    committed in batches of flush_every.
+    """
+
+    def __init__(self, path: Union[str, Path], engine_version: str = ENGINE_VERSION,
+                 flush_every: int = 1000):
+        """
+        Open (or create) a store.
+
+        Args:
+            path: SQLite database file
+            engine_version: Version stamp of the current anomaly engine
+            flush_every: Number of buffered writes per transaction
+        """
+        self.path = Path(path)
+        self.engine_version = engine_version
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._pending: Dict[str, Optional[str]] = {}
+        self._conn = sqlite3.connect(str(self.path))
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS anomaly_results ("
+                "key TEXT PRIMARY KEY, engine_version TEXT NOT NULL, value TEXT)"
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM anomaly_results WHERE engine_version != ?",
+                (engine_version,)
+            )
+        self.invalidated = cursor.rowcount
+
+    @staticmethod
+    def _digest(key: Hashable) -> str:
+        return hashlib.sha256(encode_key(key).encode()).hexdigest()
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._conn.execute("SELECT COUNT(*) FROM anomaly_results").fetchone()[0]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a key.
+
+        Args:
+            key: Cache key (see encode_key)
+            default: Value returned on a miss
+
+        Returns:
+            Stored AnomalyVector or None, or default if absent
+        """
+        digest = self._digest(key)
+        if digest in self._pending:
+            self.hits += 1
+            return _decode_value(self._pending[digest])
+        row = self._conn.execute(
+            "SELECT value FROM anomaly_results WHERE key = ? AND engine_version = ?",
+            (digest, self.engine_version)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return _decode_value(row[0])
+
+    def put(self, key: Hashable, value: Optional[AnomalyVector]) -> None:
+        """
+        Store a result (committed at the next flush).
+
+        Args:
+            key: Cache key
+            value: AnomalyVector, or None for a rejected candidate
+        """
+        self._pending[self._digest(key)] = _encode_value(value)
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def lookup(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Stored value for key, computing and storing it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def anomalies(self, fermions: List[Fermion], engine: str = "reference") -> AnomalyVector:
+        """Anomaly vector of a spectrum, persisted by its canonical signature"""
+        return self.lookup(
+            ("anomalies", spectrum_signature(fermions)),
+            lambda: AnomalyChecker(fermions, engine).compute_vector()
+        )
+
+    def flush(self) -> None:
+        """Commit buffered writes"""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO anomaly_results (key, engine_version, value) "
+                "VALUES (?, ?, ?)",
+                [(k, self.engine_version, v) for k, v in self._pending.items()]
+            )
+        self.writes += len(self._pending)
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Flush and close the database"""
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> 'PersistentAnomalyCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def statistics(self) -> dict:
+        """Counters as a JSON-serializable dictionary"""
+        return {
+            'path': str(self.path),
+            'engine_version': self.engine_version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes + len(self._pending),
+            'invalidated': self.invalidated,
+        }
+
+
+_default_cache: Optional[AnomalyCache] = None
+
+
+def default_cache() -> AnomalyCache:
+    """Process-wide cache shared by all scanners"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AnomalyCache()
+    return _default_cache
+
+
+def configure_default_cache(maxsize: Optional[int] = None,
+                            db_path: Optional[Union[str, Path]] = None) -> AnomalyCache:
+    """
+    Apply command-line cache settings to the process-wide cache.
+
+    Args:
+        maxsize: New in-memory capacity (None keeps the current one)
+        db_path: Persistent store to attach; defaults to $ANOMALY_CACHE_DB
+            when that is set
+
+    Returns:
+        The configured default cache
+    """
+    cache = default_cache()
+    if maxsize is not None:
+        cache.resize(maxsize)
+    db_path = db_path or os.environ.get(CACHE_DB_ENV)
+    if db_path:
+        cache.close()
+        cache.backend = PersistentAnomalyCache(db_path)
+    return cache
@@ -10,11 +10,42 @@ Version: 1.0
 """
 
 import fractions
-from typing import List, Tuple, Dict, Optional
+import functools
+import hashlib
+import math
+import sys
+import time
+import weakref
+from collections.abc import Mapping
+from pathlib import Path
+from typing import List, Tuple, Dict, Optional, Sequence, Iterable, Iterator, Union
 from dataclasses import dataclass
 from enum import Enum
 import json
 
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.group_theory import SU2, SU3
+from src.anomaly_conditions import ANOMALY_KEYS, EvaluationPlan, compile_plan
+
+# Condition names, a compiled plan, or None for the ANOMALY_KEYS layout
+Conditions = Union[None, Sequence[str], EvaluationPlan]
+
+
+def _resolve_plan(conditions: Conditions) -> EvaluationPlan:
+    if isinstance(conditions, EvaluationPlan):
+        return conditions
+    return compile_plan(conditions)
+
+
+# Available evaluation backends for AnomalyChecker
+ENGINES: Tuple[str, ...] = ("reference", "integer")
+
+# Stamp for persisted results; bump whenever the coefficients or their
+# layout change so that stale on-disk entries are invalidated
+ENGINE_VERSION = "1"
+
 
 class GaugeGroup(Enum):
     """Enumeration of gauge groups"""
@@ -30,14 +61,15 @@ class Fermion:
     
     Attributes:
         name: Field identifier
-        su3_rep: SU(3) representation dimension
+        su3_rep: SU(3) representation, as a dimension or a name such as
+            "15'" or "3bar" (see group_theory.SU3)
         su2_rep: SU(2) representation dimension
         hypercharge: U(1)_Y charge
         chirality: +1 for left-handed, -1 for right-handed (sign convention)
         generations: Number of generations (default: 1)
     """
     name: str
-    su3_rep: int
+    su3_rep: Union[int, str]
     su2_rep: int
     hypercharge: fractions.Fraction
     chirality: int = 1
@@ -45,9 +77,9 @@ class Fermion:
     
     def __post_init__(self):
         """Validate input parameters"""
-        if self.su3_rep not in [1, 3, 6, 8]:
+        if self.su3_rep not in SU3:
             raise ValueError(f"Unsupported SU(3) representation: {self.su3_rep}")
-        if self.su2_rep not in [1, 2, 3]:
+        if self.su2_rep not in SU2:
             raise ValueError(f"Unsupported SU(2) representation: {self.su2_rep}")
         if self.chirality not in [-1, 1]:
             raise ValueError(f"Chirality must be ±1, got {self.chirality}")
@@ -55,17 +87,444 @@ class Fermion:
             raise ValueError(f"Generations must be positive, got {self.generations}")
 
 
+class FermionType:
+    """
+    Immutable, interned field type with the same attributes as Fermion.
+    
+    Constructing a FermionType with the quantum numbers (and name) of an
+    existing, still referenced instance returns that instance, so identical
+    fields share one object, compare by identity and never need copying.
+    FermionType.unchecked skips validation for fields the caller generated
+    from known-good representation lists.
+    """
+    
+    __slots__ = ('name', 'su3_rep', 'su2_rep', 'hypercharge', 'chirality',
+                 'generations', '_field_key', '__weakref__')
+    
+    _interned: 'weakref.WeakValueDictionary' = weakref.WeakValueDictionary()
+    
+    def __new__(cls, name: str, su3_rep: Union[int, str], su2_rep: int,
+                hypercharge: fractions.Fraction, chirality: int = 1,
+                generations: int = 1) -> 'FermionType':
+        key = (name, su3_rep, su2_rep, hypercharge, chirality, generations)
+        instance = cls._interned.get(key)
+        if instance is None:
+            # Same validation and messages as Fermion
+            Fermion(name, su3_rep, su2_rep, hypercharge, chirality, generations)
+            instance = cls._create(key)
+        return instance
+    
+    @classmethod
+    def unchecked(cls, name: str, su3_rep: Union[int, str], su2_rep: int,
+                  hypercharge: fractions.Fraction, chirality: int = 1,
+                  generations: int = 1) -> 'FermionType':
+        """
+        Trusted constructor without validation.
+        
+        Only for quantum numbers that are known to be valid, e.g. drawn from
+        the scanner's own representation lists.
+        """
+        key = (name, su3_rep, su2_rep, hypercharge, chirality, generations)
+        instance = cls._interned.get(key)
+        if instance is None:
+            instance = cls._create(key)
+        return instance
+    
+    @classmethod
+    def _create(cls, key: Tuple) -> 'FermionType':
+        instance = object.__new__(cls)
+        for attr, value in zip(cls.__slots__, key):
+            object.__setattr__(instance, attr, value)
+        object.__setattr__(instance, '_field_key', None)
+        cls._interned[key] = instance
+        return instance
+    
+    @classmethod
+    def from_fermion(cls, f: Fermion) -> 'FermionType':
+        """Interned, immutable copy of a Fermion"""
+        return cls(f.name, f.su3_rep, f.su2_rep, f.hypercharge, f.chirality, f.generations)
+    
+    def to_fermion(self) -> Fermion:
+        """Mutable Fermion with the same attributes"""
+        return Fermion(self.name, self.su3_rep, self.su2_rep, self.hypercharge,
+                       self.chirality, self.generations)
+    
+    @property
+    def field_key(self) -> Tuple:
+        """Canonical (SU(3), SU(2), Y) key, resolved once per instance"""
+        if self._field_key is None:
+            object.__setattr__(self, '_field_key', (
+                SU3.resolve(self.su3_rep), SU2.resolve(self.su2_rep), self.hypercharge
+            ))
+        return self._field_key
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"FermionType is immutable; cannot set {name!r}")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"FermionType is immutable; cannot delete {name!r}")
+    
+    def __copy__(self) -> 'FermionType':
+        return self
+    
+    def __deepcopy__(self, memo) -> 'FermionType':
+        return self
+    
+    def __reduce__(self):
+        return (FermionType, (self.name, self.su3_rep, self.su2_rep,
+                              self.hypercharge, self.chirality, self.generations))
+    
+    def __repr__(self) -> str:
+        return (f"FermionType(name={self.name!r}, su3_rep={self.su3_rep!r}, "
+                f"su2_rep={self.su2_rep!r}, hypercharge={self.hypercharge!r}, "
+                f"chirality={self.chirality}, generations={self.generations})")
+
+
+# (SU(3) Dynkin labels, SU(2) Dynkin labels, Y) of one field type
+FieldKey = Tuple[Tuple[int, ...], Tuple[int, ...], fractions.Fraction]
+
+
+def _rep_label(table, labels: Tuple[int, ...]) -> Union[int, str]:
+    """Plain dimension for the standard irrep of a dimension, else its name"""
+    name = table.name(labels)
+    return int(name) if name.isdigit() else name
+
+
+class Spectrum(Mapping):
+    """
+    Canonical multiset of field types with signed multiplicities.
+    
+    Fields with identical (SU(3), SU(2), Y) quantum numbers are merged, and
+    chirality × generations is folded into one signed multiplicity, so a
+    vector-like pair cancels out. The mapping iterates over the distinct
+    field types only; hashing and equality are linear in their number and
+    independent of the order in which fields were added. Instances are
+    immutable.
+    """
+    
+    __slots__ = ('_counts', '_names', '_hash', '_signature')
+    
+    def __init__(self, fermions: Iterable[Fermion] = ()):
+        """
+        Build the multiset of a list of fermions.
+        
+        Args:
+            fermions: Fields of the spectrum, in any order
+        """
+        self._counts: Dict[FieldKey, int] = {}
+        self._names: Dict[FieldKey, str] = {}
+        self._hash: Optional[int] = None
+        self._signature: Optional[Tuple] = None
+        self._accumulate(fermions)
+    
+    @staticmethod
+    def field_key(f: Union[Fermion, FermionType]) -> FieldKey:
+        """Canonical quantum numbers of a fermion"""
+        if isinstance(f, FermionType):
+            return f.field_key
+        return (SU3.resolve(f.su3_rep), SU2.resolve(f.su2_rep), f.hypercharge)
+    
+    def _accumulate(self, fermions: Iterable[Fermion]) -> None:
+        counts = self._counts
+        for f in fermions:
+            key = self.field_key(f)
+            n = counts.get(key, 0) + f.chirality * f.generations
+            if n:
+                counts[key] = n
+                self._names.setdefault(key, f.name)
+            else:
+                del counts[key]
+    
+    def extended(self, fermions: Iterable[Fermion]) -> 'Spectrum':
+        """
+        New spectrum with further fields added.
+        
+        Args:
+            fermions: Fields to add
+            
+        Returns:
+            Spectrum of self + fermions
+        """
+        result = Spectrum()
+        result._counts = dict(self._counts)
+        result._names = dict(self._names)
+        result._accumulate(fermions)
+        return result
+    
+    def __add__(self, other: 'Spectrum') -> 'Spectrum':
+        if not isinstance(other, Spectrum):
+            return NotImplemented
+        return self.extended(other.fermions())
+    
+    def __getitem__(self, key: FieldKey) -> int:
+        return self._counts[key]
+    
+    def __iter__(self) -> Iterator[FieldKey]:
+        return iter(self._counts)
+    
+    def __len__(self) -> int:
+        return len(self._counts)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Spectrum):
+            return self._counts == other._counts
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._counts.items()))
+        return self._hash
+    
+    def signature(self) -> Tuple:
+        """
+        Sorted tuple of (field key, multiplicity) pairs.
+        
+        Unlike the hash, the signature is stable across processes and is
+        used as the key of persistent caches.
+        """
+        if self._signature is None:
+            self._signature = tuple(sorted(self._counts.items()))
+        return self._signature
+    
+    def fermions(self) -> List[Fermion]:
+        """
+        One Fermion per distinct field type.
+        
+        Negative multiplicities become chirality -1, so the list has the
+        same anomaly coefficients as the fields the spectrum was built from.
+        """
+        return [
+            Fermion(
+                name=self._names.get(key) or f"({su3},{su2})_{y}",
+                su3_rep=_rep_label(SU3, su3),
+                su2_rep=_rep_label(SU2, su2),
+                hypercharge=y,
+                chirality=1 if n > 0 else -1,
+                generations=abs(n)
+            )
+            for key, n in self._counts.items()
+            for su3, su2, y in [key]
+        ]
+    
+    def __repr__(self) -> str:
+        body = ", ".join(f"{f.su3_rep},{f.su2_rep},{f.hypercharge}: {f.chirality * f.generations}"
+                         for f in self.fermions())
+        return f"Spectrum({{{body}}})"
+
+
+def _lcm(a: int, b: int) -> int:
+    """Least common multiple of two positive integers"""
+    return a * b // math.gcd(a, b)
+
+
+# Key → slot index, shared by every vector with the same layout
+_LAYOUT_INDEX: Dict[Tuple[str, ...], Dict[str, int]] = {}
+
+
+class AnomalyVector(Mapping):
+    """
+    Compact, immutable vector of anomaly coefficients.
+    
+    Components are stored as integer numerators over one shared, positive
+    denominator, normalized so that equal vectors have identical storage.
+    Equality and hashing therefore compare plain ints, and is_zero() needs
+    no float conversion. The vector is a read-only Mapping from anomaly
+    names to Fractions, so it can stand in for the legacy dictionaries.
+    """
+    
+    __slots__ = ('_numerators', '_denominator', '_keys')
+    
+    def __init__(self, numerators: Sequence[int], denominator: int = 1,
+                 keys: Tuple[str, ...] = ANOMALY_KEYS):
+        """
+        Initialize from integer numerators over a common denominator.
+        
+        Args:
+            numerators: One integer per slot, in the order of keys
+            denominator: Common denominator of all components
+            keys: Slot layout (anomaly names)
+        """
+        if len(numerators) != len(keys):
+            raise ValueError(
+                f"Expected {len(keys)} components, got {len(numerators)}"
+            )
+        if denominator == 0:
+            raise ZeroDivisionError("AnomalyVector denominator must be non-zero")
+        if denominator < 0:
+            numerators = [-n for n in numerators]
+            denominator = -denominator
+        g = functools.reduce(math.gcd, numerators, denominator)
+        if g != 1:
+            numerators = [n // g for n in numerators]
+            denominator //= g
+        self._numerators = tuple(numerators)
+        self._denominator = denominator
+        self._keys = keys
+        if keys not in _LAYOUT_INDEX:
+            _LAYOUT_INDEX[keys] = {k: i for i, k in enumerate(keys)}
+    
+    @classmethod
+    def from_fractions(cls, values: Sequence[fractions.Fraction],
+                       keys: Tuple[str, ...] = ANOMALY_KEYS) -> 'AnomalyVector':
+        """
+        Build a vector from rational components.
+        
+        Args:
+            values: Fractions (or ints) in the order of keys
+            keys: Slot layout
+            
+        Returns:
+            AnomalyVector with the given components
+        """
+        den = 1
+        for v in values:
+            den = _lcm(den, v.denominator)
+        return cls([v.numerator * (den // v.denominator) for v in values], den, keys)
+    
+    @classmethod
+    def from_scaled(cls, numerators: Sequence[int], scales: Sequence[int],
+                    keys: Tuple[str, ...] = ANOMALY_KEYS) -> 'AnomalyVector':
+        """
+        Build a vector whose i-th component is numerators[i] / scales[i].
+        
+        Args:
+            numerators: Integer numerators
+            scales: Positive per-slot denominators
+            keys: Slot layout
+            
+        Returns:
+            AnomalyVector with the given components
+        """
+        den = functools.reduce(_lcm, scales, 1)
+        return cls([int(n) * (den // s) for n, s in zip(numerators, scales)], den, keys)
+    
+    @classmethod
+    def from_mapping(cls, anomalies: Mapping,
+                     keys: Tuple[str, ...] = ANOMALY_KEYS) -> 'AnomalyVector':
+        """Build a vector from a legacy Dict[str, Fraction]"""
+        return cls.from_fractions([fractions.Fraction(anomalies[k]) for k in keys], keys)
+    
+    @classmethod
+    def zero(cls, keys: Tuple[str, ...] = ANOMALY_KEYS) -> 'AnomalyVector':
+        """The all-zero vector"""
+        return cls([0] * len(keys), 1, keys)
+    
+    @property
+    def layout(self) -> Tuple[str, ...]:
+        """Anomaly names in slot order"""
+        return self._keys
+    
+    @property
+    def numerators(self) -> Tuple[int, ...]:
+        """Integer numerators over the common denominator"""
+        return self._numerators
+    
+    @property
+    def denominator(self) -> int:
+        """Common denominator of all components"""
+        return self._denominator
+    
+    def __getitem__(self, key: str) -> fractions.Fraction:
+        index = _LAYOUT_INDEX[self._keys][key]
+        return fractions.Fraction(self._numerators[index], self._denominator)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, AnomalyVector):
+            return (self._denominator == other._denominator and
+                    self._numerators == other._numerators and
+                    self._keys == other._keys)
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash((self._numerators, self._denominator))
+    
+    def _aligned(self, other: 'AnomalyVector') -> Tuple[List[int], List[int], int]:
+        """Numerators of both vectors over their common denominator"""
+        if not isinstance(other, AnomalyVector) or other._keys != self._keys:
+            raise TypeError("AnomalyVector operands must share a slot layout")
+        den = _lcm(self._denominator, other._denominator)
+        a, b = den // self._denominator, den // other._denominator
+        return ([n * a for n in self._numerators],
+                [n * b for n in other._numerators], den)
+    
+    def __add__(self, other: 'AnomalyVector') -> 'AnomalyVector':
+        left, right, den = self._aligned(other)
+        return AnomalyVector([x + y for x, y in zip(left, right)], den, self._keys)
+    
+    def __sub__(self, other: 'AnomalyVector') -> 'AnomalyVector':
+        left, right, den = self._aligned(other)
+        return AnomalyVector([x - y for x, y in zip(left, right)], den, self._keys)
+    
+    def __neg__(self) -> 'AnomalyVector':
+        return AnomalyVector([-n for n in self._numerators], self._denominator, self._keys)
+    
+    def scale(self, factor) -> 'AnomalyVector':
+        """
+        Multiply every component by a rational factor.
+        
+        Args:
+            factor: int or Fraction
+            
+        Returns:
+            Scaled AnomalyVector
+        """
+        factor = fractions.Fraction(factor)
+        return AnomalyVector([n * factor.numerator for n in self._numerators],
+                             self._denominator * factor.denominator, self._keys)
+    
+    def __mul__(self, factor) -> 'AnomalyVector':
+        if isinstance(factor, (int, fractions.Fraction)):
+            return self.scale(factor)
+        return NotImplemented
+    
+    __rmul__ = __mul__
+    
+    def is_zero(self) -> bool:
+        """True if every anomaly coefficient vanishes exactly"""
+        return not any(self._numerators)
+    
+    def to_dict(self) -> Dict[str, fractions.Fraction]:
+        """Convert to the legacy Dict[str, Fraction] used in reports"""
+        den = self._denominator
+        return {k: fractions.Fraction(n, den) for k, n in zip(self._keys, self._numerators)}
+    
+    def __repr__(self) -> str:
+        body = ", ".join(f"{k}: {v}" for k, v in self.to_dict().items())
+        return f"AnomalyVector({{{body}}})"
+
+
 class AnomalyChecker:
     """Main class for computing and verifying anomaly cancellation conditions"""
     
-    def __init__(self, fermions: List[Fermion]):
+    def __init__(self, fermions: Union[List[Fermion], Spectrum], engine: str = "reference",
+                 conditions: Conditions = None):
         """
         Initialize with a list of fermions.
         
         Args:
-            fermions: List of Fermion objects defining the spectrum
+            fermions: List of Fermion objects defining the spectrum, or a
+                Spectrum, which is evaluated once per distinct field type
+            engine: Evaluation backend, one of ENGINES. "reference" sums
+                Fractions directly; "integer" rescales hypercharges to a
+                common denominator and accumulates plain ints.
+            conditions: Registered condition names (see anomaly_conditions)
+                or a compiled plan; default is the ANOMALY_KEYS layout
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown anomaly engine: {engine}")
+        if isinstance(fermions, Spectrum):
+            fermions = fermions.fermions()
         self.fermions = fermions
+        self.engine = engine
+        self.plan = _resolve_plan(conditions)
         self._anomalies: Optional[Dict[str, fractions.Fraction]] = None
     
     @staticmethod
@@ -73,21 +532,16 @@ class AnomalyChecker:
         """
         Calculate the Dynkin index T(R) for SU(2) representations.
         
+        T(R) = (dimension³ - dimension) / 12, read from the memoized
+        group_theory.SU2 table.
+        
         Args:
             dimension: Representation dimension
             
         Returns:
             Dynkin index as a fraction
         """
-        if dimension == 1:
-            return fractions.Fraction(0)
-        elif dimension == 2:
-            return fractions.Fraction(1, 2)
-        elif dimension == 3:
-            return fractions.Fraction(2)
-        else:
-            # General formula: T(R) = (dimension³ - dimension) / 12
-            return fractions.Fraction(dimension**3 - dimension, 12)
+        return SU2.index(dimension)
     
     @staticmethod
     def su2_cubic_coeff(dimension: int) -> fractions.Fraction:
@@ -106,29 +560,33 @@ class AnomalyChecker:
         return fractions.Fraction(0)
     
     @staticmethod
-    def su3_dynkin_index(dimension: int) -> fractions.Fraction:
-        """Dynkin index T(R) for SU(3) reps."""
-        table = {1: fractions.Fraction(0),
-                 3: fractions.Fraction(1, 2),
-                 6: fractions.Fraction(5, 2),
-                 8: fractions.Fraction(3)}
-        return table.get(dimension, fractions.Fraction(0))
+    def su3_dynkin_index(dimension: Union[int, str]) -> fractions.Fraction:
         """
         Calculate the Dynkin index T(R) for SU(3) representations.
         
         Args:
-            dimension: Representation dimension
+            dimension: Representation dimension or name (e.g. 15, "15'", "3bar")
             
         Returns:
             Dynkin index as a fraction
+            
+        Raises:
+            ValueError: If no SU(3) irrep has that dimension or name
         """
-        indices = {
-            1: fractions.Fraction(0),      # Singlet
-            3: fractions.Fraction(1, 2),   # Fundamental
-            6: fractions.Fraction(5, 2),   # Symmetric
-            8: fractions.Fraction(3)       # Adjoint
-        }
-        return indices.get(dimension, fractions.Fraction(0))
+        return SU3.index(dimension)
+    
+    @staticmethod
+    def su3_cubic_coeff(dimension: Union[int, str]) -> int:
+        """
+        Calculate the cubic anomaly coefficient A(R) for SU(3) representations.
+        
+        Args:
+            dimension: Representation dimension or name (e.g. 15, "15'", "3bar")
+            
+        Returns:
+            Cubic anomaly coefficient, normalized to A(3) = 1
+        """
+        return SU3.cubic(dimension)
     
     def compute_anomalies(self) -> Dict[str, fractions.Fraction]:
         """
@@ -137,74 +595,96 @@ class AnomalyChecker:
         Returns:
             Dictionary containing all anomaly coefficients
         """
-        anomalies = {}
+        if self.engine == "integer":
+            self._anomalies = compute_anomalies_integer(self.fermions, self.plan)
+            return self._anomalies
         
-        # U(1)_Y anomalies
-        anomalies['[U(1)_Y]'] = sum(
-            f.hypercharge * f.chirality * f.generations * f.su3_rep * f.su2_rep
-            for f in self.fermions
-        )
-        
-        anomalies['[U(1)_Y]³'] = sum(
-            f.hypercharge**3 * f.chirality * f.generations * f.su3_rep * f.su2_rep
-            for f in self.fermions
-        )
-        
-        # Mixed U(1)_Y - SU(2)² anomaly
-        anomalies['[U(1)_Y][SU(2)]²'] = sum(
-            f.hypercharge * f.chirality * f.generations * f.su3_rep * 
-            self.su2_dynkin_index(f.su2_rep)
-            for f in self.fermions
-        )
+        self._anomalies = dict(zip(self.plan.keys, self._fused_kernel()))
+        return self._anomalies
+    
+    def invalidate(self) -> None:
+        """
+        Drop the cached coefficients after the fermion list was modified.
         
-        # Mixed U(1)_Y - SU(3)² anomaly
-        anomalies['[U(1)_Y][SU(3)]²'] = sum(
-            f.hypercharge * f.chirality * f.generations * f.su2_rep * 
-            self.su3_dynkin_index(f.su3_rep)
-            for f in self.fermions
-        )
+        For spectra that change often use IncrementalAnomalyChecker, which
+        updates its vector with every edit instead.
+        """
+        self._anomalies = None
+    
+    def compute_vector(self) -> AnomalyVector:
+        """
+        Compute all anomaly coefficients as a compact AnomalyVector.
         
-        # Pure non-abelian anomalies
-        anomalies['[SU(2)]³'] = sum(
-            f.chirality * f.generations * f.su3_rep * 
-            self.su2_cubic_coeff(f.su2_rep)
-            for f in self.fermions
-        )
+        Returns:
+            AnomalyVector in the layout of the checker's conditions
+        """
+        if self.engine == "integer":
+            return AnomalyVector.from_scaled(*integer_kernel(self.fermions, self.plan),
+                                             keys=self.plan.keys)
+        return AnomalyVector.from_fractions(self._fused_kernel(), keys=self.plan.keys)
+    
+    def fermion_weights(self, f: Fermion) -> Tuple[int, fractions.Fraction,
+                                                   fractions.Fraction,
+                                                   fractions.Fraction]:
+        """
+        Hypercharge-independent weights of a single fermion.
         
-        anomalies['[SU(3)]³'] = sum(
-            f.chirality * f.generations * f.su2_rep * 
-            self.su3_dynkin_index(f.su3_rep)
-            for f in self.fermions
+        Args:
+            f: Fermion to weigh
+            
+        Returns:
+            Tuple of (multiplicity, dim(SU(3)) × T_SU(2), dim(SU(2)) × T_SU(3),
+            dim(SU(3)) × A_SU(2)), each already multiplied by
+            chirality × generations
+        """
+        weight = f.chirality * f.generations
+        dim3 = SU3.dimension(f.su3_rep)
+        dim2 = SU2.dimension(f.su2_rep)
+        return (
+            weight * dim3 * dim2,
+            weight * dim3 * self.su2_dynkin_index(f.su2_rep),
+            weight * dim2 * self.su3_dynkin_index(f.su3_rep),
+            weight * dim3 * self.su2_cubic_coeff(f.su2_rep),
         )
+    
+    def _fused_kernel(self) -> List[fractions.Fraction]:
+        """
+        Fill the whole anomaly vector in a single traversal of the spectrum.
         
-        # Gravitational anomalies
-        anomalies['[Gravity]²[U(1)_Y]'] = sum(
-            f.hypercharge * f.chirality * f.generations * f.su3_rep * f.su2_rep
-            for f in self.fermions
-        )
+        The compiled plan computes each fermion's representation weights and
+        powers of Y once and shares them by every coefficient;
+        [Gravity]²[U(1)_Y] reuses the [U(1)_Y] sum.
         
-        self._anomalies = anomalies
-        return anomalies
+        Returns:
+            Anomaly coefficients in the order of self.plan.keys
+        """
+        return self.plan.evaluate(self.fermions)
     
-    def verify_cancellation(self, tolerance: float = 1e-10) -> Tuple[bool, List[str]]:
+    def verify_cancellation(self, tolerance: float = 1e-10,
+                            early_exit: bool = False) -> Tuple[bool, List[str]]:
         """
         Check if all anomalies cancel.
         
         Args:
             tolerance: Numerical tolerance for zero comparison
+            early_exit: Evaluate conditions one at a time, cheapest first,
+                and stop at the first one that does not cancel. At most one
+                failure is reported in this mode.
             
         Returns:
             Tuple of (all_cancel, list_of_non_cancelling_anomalies)
         """
+        if early_exit and self._anomalies is None:
+            for name in self.plan.early_exit_order():
+                value = condition_value(name, self.fermions, self.plan)
+                if abs(float(value)) > tolerance:
+                    return False, [f"{name} = {value}"]
+            return True, []
+        
         if self._anomalies is None:
             self.compute_anomalies()
         
-        non_cancelling: List[str] = []
-        for anomaly_type, value in self._anomalies.items():
-            if abs(float(value)) > tolerance:
-                non_cancelling.append(f"{anomaly_type} = {value}")
-        
-        return len(non_cancelling) == 0, non_cancelling
+        return check_cancellation(self._anomalies, tolerance)
     
     def generate_report(self) -> str:
         """Generate a comprehensive anomaly cancellation report"""
@@ -243,6 +723,720 @@ class AnomalyChecker:
         return "\n".join(report)
 
 
+def check_cancellation(anomalies: Mapping,
+                       tolerance: float = 1e-10) -> Tuple[bool, List[str]]:
+    """
+    Check whether a set of anomaly coefficients cancels.
+    
+    Args:
+        anomalies: Anomaly coefficients keyed by name
+        tolerance: Numerical tolerance for zero comparison
+        
+    Returns:
+        Tuple of (all_cancel, list_of_non_cancelling_anomalies)
+    """
+    non_cancelling: List[str] = []
+    for anomaly_type, value in anomalies.items():
+        if abs(float(value)) > tolerance:
+            non_cancelling.append(f"{anomaly_type} = {value}")
+    
+    return len(non_cancelling) == 0, non_cancelling
+
+
+def spectrum_signature(fermions: Union[List[Fermion], Spectrum]) -> Tuple:
+    """
+    Canonical, order-independent signature of a spectrum.
+    
+    Two spectra with equal signatures have identical anomaly coefficients,
+    e.g. a vector-like pair drops out of the signature entirely.
+    
+    Args:
+        fermions: Fields of the spectrum, or a Spectrum
+        
+    Returns:
+        Hashable sorted tuple of (field key, multiplicity) pairs
+    """
+    if not isinstance(fermions, Spectrum):
+        fermions = Spectrum(fermions)
+    return fermions.signature()
+
+
+@functools.lru_cache(maxsize=None)
+def _pair_cancels(plan: EvaluationPlan, a: Tuple, b: Tuple, sign: int) -> bool:
+    """
+    Whether two fields cancel for every value of Y_a when Y_b = sign × Y_a.
+    
+    A condition of power p picks up sign**p, so the pair cancels iff
+    chi_a n_a w(a) + sign**p chi_b n_b w(b) vanishes (modulo the modulus of
+    global conditions) for every condition. This depends only on the
+    representations, never on the hypercharge value.
+    
+    Args:
+        plan: Compiled conditions
+        a, b: (SU(3) rep, SU(2) rep, chirality, generations) of each field
+        sign: +1 or -1
+    """
+    weights_a = plan.rep_weights(a[0], a[1])
+    weights_b = plan.rep_weights(b[0], b[1])
+    for i, c in enumerate(plan.conditions):
+        w = plan.weight_index[i]
+        total = a[2] * a[3] * weights_a[w] + sign**c.power * b[2] * b[3] * weights_b[w]
+        m = plan.moduli[i]
+        if (total if m is None else total % m) != 0:
+            return False
+    return True
+
+
+def cancels_by_symmetry(fermions: Union[List[Fermion], Spectrum],
+                        conditions: Conditions = None) -> bool:
+    """
+    Whether a set of fields contributes nothing to any anomaly, by symmetry.
+    
+    The fields must split into pairs whose hypercharges agree up to sign
+    and whose contributions cancel structurally: a vector-like pair
+    (same quantum numbers, opposite chirality), or a (R)_{+Y} / (R)_{-Y}
+    pair of equal chirality whose representation carries no Y-even
+    anomaly, e.g. Higgsino-like doublets. No anomaly coefficient is
+    computed; the structural test is memoized per representation pair, so
+    every hypercharge value of a family is classified by lookups alone.
+    
+    Args:
+        fermions: Candidate fields (without the base spectrum)
+        conditions: Condition names or plan (default: ANOMALY_KEYS)
+        
+    Returns:
+        True if the total contribution vanishes for every hypercharge
+    """
+    if isinstance(fermions, Spectrum):
+        fermions = fermions.fermions()
+    plan = _resolve_plan(conditions)
+    unpaired = list(fermions)
+    while unpaired:
+        f = unpaired.pop()
+        key = (f.su3_rep, f.su2_rep, f.chirality, f.generations)
+        for j, g in enumerate(unpaired):
+            if g.hypercharge == f.hypercharge:
+                sign = 1
+            elif g.hypercharge == -f.hypercharge:
+                sign = -1
+            else:
+                continue
+            if _pair_cancels(plan, key, (g.su3_rep, g.su2_rep, g.chirality, g.generations), sign):
+                del unpaired[j]
+                break
+        else:
+            return False
+    return True
+
+
+def _reduce_modular(vector: AnomalyVector, plan: EvaluationPlan) -> AnomalyVector:
+    """Reduce global anomalies, which are only defined modulo their modulus"""
+    if all(m is None for m in plan.moduli):
+        return vector
+    return AnomalyVector.from_fractions(
+        [v if m is None else fractions.Fraction(int(v) % m)
+         for v, m in zip(vector.values(), plan.moduli)],
+        keys=plan.keys
+    )
+
+
+class BaseContext:
+    """
+    Precompiled base spectrum for delta evaluation of candidate additions.
+    
+    Anomaly coefficients are linear in the spectrum, so the base spectrum's
+    anomaly vector is computed once and each candidate is evaluated only
+    through the contribution of the fields it adds. The cost per candidate
+    is independent of the size of the base.
+    """
+    
+    def __init__(self, base: List[Fermion], engine: str = "reference",
+                 conditions: Conditions = None):
+        """
+        Initialize with a base spectrum.
+        
+        Args:
+            base: List of Fermion objects shared by every candidate
+            engine: Evaluation backend used for base and deltas
+            conditions: Condition names or plan (default: ANOMALY_KEYS)
+        """
+        self.base = list(base)
+        self.engine = engine
+        self.plan = _resolve_plan(conditions)
+        self.vector = AnomalyChecker(self.base, engine, self.plan).compute_vector()
+        self.spectrum = Spectrum(self.base)
+        # Stands in for the base in cache keys, so keys do not grow with it
+        self.base_digest = hashlib.sha1(repr(self.spectrum.signature()).encode()).hexdigest()
+    
+    def signature(self, extra: Union[List[Fermion], Spectrum]) -> Tuple:
+        """
+        Canonical signature of base + extra.
+        
+        Args:
+            extra: Fields added on top of the base spectrum
+            
+        Returns:
+            Same value as spectrum_signature(base + extra)
+        """
+        if isinstance(extra, Spectrum):
+            extra = extra.fermions()
+        return self.spectrum.extended(extra).signature()
+    
+    def cache_key(self, extra: Union[List[Fermion], Spectrum]) -> Tuple:
+        """
+        Order-independent cache key of base + extra under this plan.
+        
+        Built from the base digest and the signature of extra alone, so its
+        cost does not depend on the size of the base.
+        
+        Args:
+            extra: Fields added on top of the base spectrum
+            
+        Returns:
+            (condition names, base digest, signature of extra)
+        """
+        return (self.plan.keys, self.base_digest, spectrum_signature(extra))
+    
+    def delta(self, extra: Union[List[Fermion], Spectrum]) -> AnomalyVector:
+        """
+        Anomaly contribution of the added fields alone.
+        
+        Args:
+            extra: Fields added on top of the base spectrum
+            
+        Returns:
+            AnomalyVector of the contributions
+        """
+        return AnomalyChecker(extra, self.engine, self.plan).compute_vector()
+    
+    def evaluate(self, extra: Union[List[Fermion], Spectrum]) -> AnomalyVector:
+        """
+        Anomaly coefficients of base + extra.
+        
+        Args:
+            extra: Fields added on top of the base spectrum
+            
+        Returns:
+            AnomalyVector equal to AnomalyChecker(base + extra).compute_anomalies()
+        """
+        return _reduce_modular(self.vector + self.delta(extra), self.plan)
+    
+    def verify(self, extra: Union[List[Fermion], Spectrum],
+               tolerance: float = 1e-10) -> Tuple[bool, List[str]]:
+        """
+        Check anomaly cancellation of base + extra.
+        
+        Args:
+            extra: Fields added on top of the base spectrum
+            tolerance: Numerical tolerance for zero comparison
+            
+        Returns:
+            Tuple of (all_cancel, list_of_non_cancelling_anomalies)
+        """
+        return check_cancellation(self.evaluate(extra), tolerance)
+
+
+class IncrementalAnomalyChecker:
+    """
+    Editable spectrum whose anomaly vector is kept up to date.
+    
+    Every edit adds or subtracts the contribution of the fields involved,
+    so its cost does not depend on the size of the spectrum. Fields are
+    stored as immutable FermionType snapshots, so mutating a Fermion after
+    adding it cannot leave the cached vector stale. checkpoint() and
+    rollback() undo any number of edits, e.g. for local-search scanners.
+    """
+    
+    def __init__(self, fermions: Union[List[Fermion], Spectrum] = (),
+                 engine: str = "reference", conditions: Conditions = None):
+        """
+        Initialize with a starting spectrum.
+        
+        Args:
+            fermions: Initial fields (list or Spectrum)
+            engine: Evaluation backend for field contributions
+            conditions: Condition names or plan (default: ANOMALY_KEYS)
+        """
+        if isinstance(fermions, Spectrum):
+            fermions = fermions.fermions()
+        self.engine = engine
+        self.plan = _resolve_plan(conditions)
+        self._fields: List[FermionType] = [FermionType.from_fermion(f) for f in fermions]
+        self._vector = AnomalyChecker(self._fields, engine, self.plan).compute_vector()
+        # Undo log of (index, old field, new field, previous vector); only
+        # kept while a checkpoint is open
+        self._undo: List[Tuple[int, Optional[FermionType], Optional[FermionType], AnomalyVector]] = []
+        self._checkpoints: List[int] = []
+    
+    @property
+    def fermions(self) -> List[FermionType]:
+        """Current fields, in insertion order"""
+        return list(self._fields)
+    
+    @property
+    def vector(self) -> AnomalyVector:
+        """Current anomaly vector"""
+        return self._vector
+    
+    def compute_anomalies(self) -> Dict[str, fractions.Fraction]:
+        """Current anomaly coefficients as a legacy dictionary"""
+        return self._vector.to_dict()
+    
+    def verify_cancellation(self, tolerance: float = 1e-10) -> Tuple[bool, List[str]]:
+        """
+        Check if all anomalies of the current spectrum cancel.
+        
+        Args:
+            tolerance: Numerical tolerance for zero comparison
+            
+        Returns:
+            Tuple of (all_cancel, list_of_non_cancelling_anomalies)
+        """
+        return check_cancellation(self._vector, tolerance)
+    
+    def is_anomaly_free(self) -> bool:
+        """True if every coefficient vanishes exactly"""
+        return self._vector.is_zero()
+    
+    def __len__(self) -> int:
+        return len(self._fields)
+    
+    def _contribution(self, f: FermionType) -> AnomalyVector:
+        return AnomalyChecker([f], self.engine, self.plan).compute_vector()
+    
+    def _locate(self, field: Union[int, str]) -> int:
+        """Index of a field given by position or name"""
+        if isinstance(field, int):
+            if not -len(self._fields) <= field < len(self._fields):
+                raise IndexError(f"No field at position {field}")
+            return field % len(self._fields)
+        for i, f in enumerate(self._fields):
+            if f.name == field:
+                return i
+        raise ValueError(f"No field named {field!r}")
+    
+    def _apply(self, index: int, old: Optional[FermionType],
+               new: Optional[FermionType]) -> None:
+        """Swap old for new at index and update the vector"""
+        if self._checkpoints:
+            self._undo.append((index, old, new, self._vector))
+        vector = self._vector
+        if old is not None:
+            vector = vector - self._contribution(old)
+        if new is not None:
+            vector = vector + self._contribution(new)
+        self._vector = _reduce_modular(vector, self.plan)
+        
+        if old is None:
+            self._fields.insert(index, new)
+        elif new is None:
+            del self._fields[index]
+        else:
+            self._fields[index] = new
+    
+    def add_field(self, fermion: Fermion) -> int:
+        """
+        Append a field.
+        
+        Args:
+            fermion: Field to add (validated and stored immutably)
+            
+        Returns:
+            Position of the new field
+        """
+        index = len(self._fields)
+        self._apply(index, None, FermionType.from_fermion(fermion))
+        return index
+    
+    def remove_field(self, field: Union[int, str]) -> FermionType:
+        """
+        Remove a field.
+        
+        Args:
+            field: Position or name of the field
+            
+        Returns:
+            The removed field
+        """
+        index = self._locate(field)
+        old = self._fields[index]
+        self._apply(index, old, None)
+        return old
+    
+    def replace_field(self, field: Union[int, str], fermion: Fermion) -> FermionType:
+        """
+        Replace a field in place.
+        
+        Args:
+            field: Position or name of the field
+            fermion: Replacement field
+            
+        Returns:
+            The replaced field
+        """
+        index = self._locate(field)
+        old = self._fields[index]
+        self._apply(index, old, FermionType.from_fermion(fermion))
+        return old
+    
+    def set_generations(self, field: Union[int, str], generations: int) -> None:
+        """
+        Change the number of generations of a field.
+        
+        Args:
+            field: Position or name of the field
+            generations: New number of generations (positive)
+        """
+        index = self._locate(field)
+        f = self._fields[index]
+        self._apply(index, f, FermionType(f.name, f.su3_rep, f.su2_rep,
+                                          f.hypercharge, f.chirality, generations))
+    
+    def checkpoint(self) -> int:
+        """
+        Open a checkpoint to roll back to.
+        
+        Returns:
+            Checkpoint depth, accepted by rollback()
+        """
+        self._checkpoints.append(len(self._undo))
+        return len(self._checkpoints)
+    
+    def rollback(self, depth: Optional[int] = None) -> None:
+        """
+        Undo every edit since a checkpoint and close it.
+        
+        Args:
+            depth: Checkpoint returned by checkpoint() (default: the latest);
+                later checkpoints are closed as well
+        """
+        if not self._checkpoints:
+            raise RuntimeError("No open checkpoint")
+        depth = len(self._checkpoints) if depth is None else depth
+        if not 1 <= depth <= len(self._checkpoints):
+            raise ValueError(f"No open checkpoint at depth {depth}")
+        mark = self._checkpoints[depth - 1]
+        del self._checkpoints[depth - 1:]
+        
+        while len(self._undo) > mark:
+            index, old, new, vector = self._undo.pop()
+            if old is None:
+                del self._fields[index]
+            elif new is None:
+                self._fields.insert(index, old)
+            else:
+                self._fields[index] = old
+            self._vector = vector
+    
+    def commit(self) -> None:
+        """Close the latest checkpoint, keeping its edits"""
+        if not self._checkpoints:
+            raise RuntimeError("No open checkpoint")
+        self._checkpoints.pop()
+        if not self._checkpoints:
+            self._undo.clear()
+    
+    def to_checker(self) -> AnomalyChecker:
+        """AnomalyChecker for the current spectrum with its anomalies precomputed"""
+        checker = AnomalyChecker(list(self._fields), self.engine, self.plan)
+        checker._anomalies = self.compute_anomalies()
+        return checker
+
+
+class SpectrumTrie:
+    """
+    Prefix tree of spectra sharing leading fields.
+    
+    Each node stores the integer accumulators of the fields on its path
+    over their common hypercharge denominator (as in the integer engine),
+    so a spectrum costs a few integer operations per field not shared
+    with an earlier spectrum, plus one conversion to an AnomalyVector.
+    Fields are matched by quantum numbers and chirality × generations;
+    names are ignored.
+    """
+    
+    def __init__(self, conditions: Conditions = None):
+        """
+        Initialize an empty trie.
+        
+        Args:
+            conditions: Condition names or plan (default: ANOMALY_KEYS)
+        """
+        self.plan = _resolve_plan(conditions)
+        self._powers = [p for _, p, _ in self.plan.int_columns]
+        # Node: (denominator, accumulators, children keyed by field)
+        self._root: Tuple[int, Tuple[int, ...], Dict] = (1, (0,) * len(self._powers), {})
+        # Per denominator: common scale and per-condition factors
+        self._rescale: Dict[int, Tuple[int, Tuple[int, ...]]] = {}
+        self.nodes = 0
+        self.reused = 0
+    
+    def _extend(self, den: int, sums: Tuple[int, ...], key: Tuple) -> Tuple:
+        """Child node of (den, sums) for one more field"""
+        su3, su2, num, d, weight = key
+        if den % d:
+            common = den * d // math.gcd(den, d)
+            ratio = common // den
+            sums = [s * ratio**p for s, p in zip(sums, self._powers)]
+            den = common
+        rep = self.plan.int_weights(su3, su2)
+        n = num * (den // d)
+        sums = tuple(s + w * weight * n**p for s, w, p in zip(sums, rep, self._powers))
+        return (den, sums, {})
+    
+    def add(self, fermions: Iterable[Fermion]) -> AnomalyVector:
+        """
+        Insert a spectrum and return its anomaly vector.
+        
+        Args:
+            fermions: Fields in order; earlier fields are shared first
+            
+        Returns:
+            AnomalyVector of the spectrum
+        """
+        den, sums, children = self._root
+        for f in fermions:
+            y = f.hypercharge
+            # Fraction hashing is slow; its numerator and denominator are not
+            key = (f.su3_rep, f.su2_rep, y.numerator, y.denominator, f.chirality * f.generations)
+            node = children.get(key)
+            if node is None:
+                node = children[key] = self._extend(den, sums, key)
+                self.nodes += 1
+            else:
+                self.reused += 1
+            den, sums, children = node
+        
+        plan = self.plan
+        values = [sums[j] for j in plan.int_column_of]
+        for i, m in enumerate(plan.moduli):
+            if m is not None:
+                # Modular conditions have scale 1, so the value is exact
+                values[i] %= m
+        try:
+            common, factors = self._rescale[den]
+        except KeyError:
+            scales = plan.scales(den)
+            common = functools.reduce(_lcm, scales, 1)
+            factors = tuple(common // s for s in scales)
+            self._rescale[den] = (common, factors)
+        return AnomalyVector([v * k for v, k in zip(values, factors)], common, plan.keys)
+    
+    def statistics(self) -> dict:
+        """Node and sharing counters as a JSON-serializable dictionary"""
+        fields = self.nodes + self.reused
+        return {
+            'nodes': self.nodes,
+            'shared_fields': self.reused,
+            'sharing_rate': self.reused / fields if fields else 0.0,
+        }
+
+
+def check_many(spectra: Iterable[Iterable[Fermion]],
+               conditions: Conditions = None) -> List[AnomalyVector]:
+    """
+    Anomaly vectors of many spectra, sharing work on common field prefixes.
+    
+    Scan results and model lists are mostly one base spectrum plus a few
+    extra fields, so the cost is roughly the number of distinct suffixes.
+    
+    Args:
+        spectra: Spectra as sequences of fields
+        conditions: Condition names or plan (default: ANOMALY_KEYS)
+        
+    Returns:
+        One AnomalyVector per spectrum, in input order
+    """
+    trie = SpectrumTrie(conditions)
+    return [trie.add(fermions) for fermions in spectra]
+
+
+# Static evaluation order for early-exit checks: one condition per
+# independent sum, cheapest first
+EARLY_EXIT_ORDER: Tuple[str, ...] = tuple(compile_plan().early_exit_order())
+
+
+def condition_value(name: str, fermions: List[Fermion],
+                    conditions: Conditions = None) -> fractions.Fraction:
+    """
+    Value of a single anomaly condition, without computing the others.
+    
+    Args:
+        name: Anomaly coefficient name (one of the plan's keys)
+        fermions: List of Fermion objects
+        conditions: Condition names or plan containing name
+        
+    Returns:
+        The anomaly coefficient as a fraction
+    """
+    plan = _resolve_plan(conditions)
+    return plan.condition_sum(plan.keys.index(name), fermions)
+
+
+class EarlyExitVerifier:
+    """
+    Rejection filter that stops at the first non-cancelling condition.
+    
+    Conditions are evaluated one at a time in order of expected payoff,
+    i.e. the observed rejection rate divided by the condition's cost. With
+    adaptive ordering the order is refreshed from the collected rejection
+    statistics every reorder_every candidates, so the most discriminating
+    conditions move to the front during a scan. An optional BaseContext
+    supplies the base spectrum's coefficients, so only the candidate's
+    fields are summed.
+    """
+    
+    def __init__(self, base: Optional[BaseContext] = None,
+                 adaptive: bool = True, reorder_every: int = 256,
+                 conditions: Conditions = None):
+        """
+        Initialize the verifier.
+        
+        Args:
+            base: Base spectrum added to every candidate (None for no base)
+            adaptive: Reorder conditions from the rejection statistics
+            reorder_every: Number of candidates between reorderings
+            conditions: Conditions to check (default: those of the base, or
+                the ANOMALY_KEYS layout)
+        """
+        self.base = base
+        self.adaptive = adaptive
+        self.reorder_every = reorder_every
+        if conditions is None and base is not None:
+            self.plan = base.plan
+        else:
+            self.plan = _resolve_plan(conditions)
+        self._index = {name: i for i, name in enumerate(self.plan.keys)}
+        self.order: List[str] = self.plan.early_exit_order()
+        self.candidates = 0
+        self.accepted = 0
+        self.reorderings = 0
+        self.evaluations: Dict[str, int] = {name: 0 for name in self.order}
+        self.rejections: Dict[str, int] = {name: 0 for name in self.order}
+        self._offsets = {
+            name: (base.vector[name] if base is not None else 0)
+            for name in self.order
+        }
+    
+    def check(self, fermions: Union[List[Fermion], Spectrum]) -> bool:
+        """
+        Exact anomaly-freedom test of base + fermions.
+        
+        Args:
+            fermions: Candidate fields (added on top of the base, if any)
+            
+        Returns:
+            True if every anomaly coefficient vanishes exactly
+        """
+        if isinstance(fermions, Spectrum):
+            fermions = fermions.fermions()
+        self.candidates += 1
+        if self.adaptive and self.candidates % self.reorder_every == 0:
+            self.reorder()
+        
+        plan = self.plan
+        for name in self.order:
+            self.evaluations[name] += 1
+            if plan.condition_sum(self._index[name], fermions, self._offsets[name]):
+                self.rejections[name] += 1
+                return False
+        
+        self.accepted += 1
+        return True
+    
+    def reorder(self) -> None:
+        """Sort conditions by observed rejection rate per unit cost"""
+        def payoff(name: str) -> float:
+            # Laplace-smoothed rejection rate, so unseen conditions keep
+            # their static position
+            rate = (self.rejections[name] + 1) / (self.evaluations[name] + 2)
+            return rate / self.plan.conditions[self._index[name]].cost
+        
+        new_order = sorted(self.order, key=payoff, reverse=True)
+        if new_order != self.order:
+            self.order = new_order
+            self.reorderings += 1
+    
+    def statistics(self) -> Dict[str, object]:
+        """
+        Rejection statistics collected so far.
+        
+        Returns:
+            Dictionary with candidate counts, the current condition order and
+            per-condition evaluation / rejection counts
+        """
+        return {
+            'candidates': self.candidates,
+            'accepted': self.accepted,
+            'rejected': self.candidates - self.accepted,
+            'reorderings': self.reorderings,
+            'order': list(self.order),
+            'evaluations': dict(self.evaluations),
+            'rejections': dict(self.rejections),
+        }
+
+
+def common_denominator(fermions: List[Fermion]) -> int:
+    """
+    Least common multiple of all hypercharge denominators in a spectrum.
+    
+    Args:
+        fermions: List of Fermion objects
+        
+    Returns:
+        Positive integer D such that D * Y is integral for every fermion
+    """
+    den = 1
+    for f in fermions:
+        d = f.hypercharge.denominator
+        if den % d:
+            den = den * d // math.gcd(den, d)
+    return den
+
+
+def integer_kernel(fermions: List[Fermion],
+                   conditions: Conditions = None) -> Tuple[List[int], Tuple[int, ...]]:
+    """
+    Integer-scaled exact anomaly engine.
+    
+    Every hypercharge is rewritten as n / D over the spectrum's common
+    denominator D and representation weights are scaled to integers (e.g.
+    doubled Dynkin indices), so all sums are accumulated in plain Python ints.
+    
+    Args:
+        fermions: List of Fermion objects defining the spectrum
+        conditions: Condition names or plan (default: ANOMALY_KEYS)
+        
+    Returns:
+        Tuple of (numerators, scales) in plan order; coefficient i equals
+        numerators[i] / scales[i]
+    """
+    return _resolve_plan(conditions).evaluate_integer(fermions)
+
+
+def compute_anomalies_integer(fermions: List[Fermion],
+                              conditions: Conditions = None) -> Dict[str, fractions.Fraction]:
+    """
+    Integer-scaled anomaly coefficients as a legacy dictionary.
+    
+    Each coefficient is normalized to a Fraction exactly once, which gives
+    results identical to the reference Fraction arithmetic.
+    
+    Args:
+        fermions: List of Fermion objects defining the spectrum
+        conditions: Condition names or plan (default: ANOMALY_KEYS)
+        
+    Returns:
+        Dictionary containing all anomaly coefficients, keyed by condition
+    """
+    plan = _resolve_plan(conditions)
+    numerators, scales = plan.evaluate_integer(fermions)
+    return {
+        key: fractions.Fraction(n, scale)
+        for key, n, scale in zip(plan.keys, numerators, scales)
+    }
+
+
 def standard_model_spectrum(include_right_neutrino: bool = False) -> List[Fermion]:
     """
     Generate the Standard Model fermion spectrum for one generation.
@@ -303,15 +1497,62 @@ def test_variations():
     
     # Test 4: Broken hypercharge assignment
     print("\n4. Broken model (wrong hypercharge):")
-    spectrum4 = standard_model_spectrum(False)
-    spectrum4[0].hypercharge = fractions.Fraction(1, 3)  # Wrong Q_L hypercharge
-    checker4 = AnomalyChecker(spectrum4)
+    checker4 = IncrementalAnomalyChecker(standard_model_spectrum(False))
+    checker4.replace_field("Q_L", Fermion("Q_L", su3_rep=3, su2_rep=2,
+                                          hypercharge=fractions.Fraction(1, 3)))  # Wrong Q_L hypercharge
     all_cancel, failures = checker4.verify_cancellation()
     print(f"Anomalies cancel: {all_cancel}")
     if not all_cancel:
         print("Failed anomalies:", failures[:3])  # Show first 3
 
 
+def load_spectrum(path: Union[str, Path]) -> List[Fermion]:
+    """
+    Load a spectrum from JSON.
+    
+    Args:
+        path: File holding either a bare list of fermions or an object
+            with a "fermions" list (e.g. a scanner result file)
+            
+    Returns:
+        List of fermions
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data['fermions']
+    return [
+        Fermion(
+            name=f['name'],
+            su3_rep=f['su3_rep'],
+            su2_rep=f['su2_rep'],
+            hypercharge=fractions.Fraction(f['hypercharge']),
+            chirality=f.get('chirality', 1),
+            generations=f.get('generations', 1)
+        )
+        for f in data
+    ]
+
+
+def verify_corpus(paths: Iterable[Union[str, Path]],
+                  conditions: Conditions = None) -> Dict[str, AnomalyVector]:
+    """
+    Re-verify stored spectra, sharing work on common prefixes.
+    
+    Args:
+        paths: JSON files, or directories whose *.json files are loaded
+        conditions: Condition names or plan (default: ANOMALY_KEYS)
+        
+    Returns:
+        Anomaly vector of every file, keyed by path
+    """
+    files: List[Path] = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    vectors = check_many((load_spectrum(f) for f in files), conditions)
+    return {str(f): v for f, v in zip(files, vectors)}
+
+
 def main():
     """Main entry point for command-line usage"""
     import argparse
@@ -330,11 +1571,42 @@ def main():
         type=str, 
         help="Path to JSON file with custom fermion spectrum"
     )
+    parser.add_argument(
+        "--corpus",
+        nargs="+",
+        default=None,
+        help="Re-verify spectrum JSON files or directories of them (e.g. results/)"
+    )
     parser.add_argument(
         "--test", 
         action="store_true", 
         help="Run test variations"
     )
+    parser.add_argument(
+        "--conditions",
+        nargs="+",
+        default=None,
+        help="Registered anomaly conditions to check (default: the standard set)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES + ("vector", "auto"),
+        default="reference",
+        help="Evaluation backend; auto picks one from the spectrum size "
+             "and NumPy availability (default: reference)"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Report the evaluation time of every condition"
+    )
+    parser.add_argument(
+        "--cache-db",
+        type=str,
+        default=None,
+        help="SQLite file for persistent anomaly results "
+             "(default: $ANOMALY_CACHE_DB, if set)"
+    )
     
     args = parser.parse_args()
     
@@ -342,31 +1614,63 @@ def main():
         test_variations()
         return
     
+    if args.corpus:
+        try:
+            vectors = verify_corpus(args.corpus, args.conditions)
+        except ValueError as e:
+            parser.error(str(e))
+            return
+        failing = [path for path, vector in vectors.items() if not vector.is_zero()]
+        print(f"Verified {len(vectors)} spectra: {len(vectors) - len(failing)} anomaly-free, "
+              f"{len(failing)} anomalous")
+        for path in failing:
+            print(f"  ✗ {path}")
+        sys.exit(1 if failing else 0)
+    
     if args.model == "sm":
         fermions = standard_model_spectrum(False)
     elif args.model == "sm-nu":
         fermions = standard_model_spectrum(True)
     elif args.model == "custom" and args.json:
-        # Load custom spectrum from JSON
-        with open(args.json, 'r') as f:
-            data = json.load(f)
-            fermions = [
-                Fermion(
-                    name=f['name'],
-                    su3_rep=f['su3_rep'],
-                    su2_rep=f['su2_rep'],
-                    hypercharge=fractions.Fraction(f['hypercharge']),
-                    chirality=f.get('chirality', 1),
-                    generations=f.get('generations', 1)
-                )
-                for f in data['fermions']
-            ]
+        fermions = load_spectrum(args.json)
     else:
         parser.error("Custom model requires --json parameter")
         return
     
-    checker = AnomalyChecker(fermions)
+    # Imported here: both modules themselves depend on this one
+    from src.batch_evaluator import select_engine, evaluate_spectrum
+    engine = select_engine(args.engine, spectrum_size=len(fermions))
+    try:
+        checker = AnomalyChecker(fermions, engine if engine in ENGINES else "integer",
+                                 conditions=args.conditions)
+    except ValueError as e:
+        parser.error(str(e))
+        return
+    if engine == "vector":
+        compute = lambda: evaluate_spectrum(fermions, checker.plan)
+    else:
+        compute = checker.compute_vector
+    
+    start = time.perf_counter()
+    if args.model == "custom" and args.conditions is None:
+        from src.anomaly_cache import configure_default_cache
+        cache = configure_default_cache(db_path=args.cache_db)
+        try:
+            vector = cache.lookup(("anomalies", spectrum_signature(fermions)), compute)
+        finally:
+            cache.close()
+    else:
+        vector = compute()
+    elapsed = time.perf_counter() - start
+    checker._anomalies = vector.to_dict()
     print(checker.generate_report())
+    
+    if args.profile:
+        rate = f"{1 / elapsed:.0f} spectra/s" if elapsed > 0 else "n/a"
+        print(f"\nEngine: {engine} ({rate})")
+        print("\nCondition timings (per evaluation):")
+        for name, seconds in checker.plan.profile(fermions).items():
+            print(f"  {name:20} {seconds * 1e6:10.2f} µs")
 
 
 if __name__ == "__main__":
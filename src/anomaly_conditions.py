@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+anomaly_conditions.py
+=====================
+Registry of anomaly conditions and the fused evaluation plans compiled from
+it. Every condition is a sum over fields of
+
+    chirality × generations × w(SU(3) rep, SU(2) rep) × Y^p
+
+optionally reduced modulo an integer (global anomalies). A plan evaluates
+any set of registered conditions in one traversal of the spectrum: each
+distinct representation weight and each power of Y is computed once per
+field and shared by every condition that needs it, and conditions with the
+same (weight, power) share one accumulator.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import fractions
+import math
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.group_theory import SU2, SU3
+
+RepLabel = Union[int, str]
+RepWeight = Callable[[RepLabel, RepLabel], Union[int, fractions.Fraction]]
+
+
+# Anomaly coefficient names, in the order compute_anomalies reports them
+ANOMALY_KEYS: Tuple[str, ...] = (
+    '[U(1)_Y]',
+    '[U(1)_Y]³',
+    '[U(1)_Y][SU(2)]²',
+    '[U(1)_Y][SU(3)]²',
+    '[SU(2)]³',
+    '[SU(3)]³',
+    '[Gravity]²[U(1)_Y]',
+)
+
+# Further registered conditions that are not part of the legacy layout
+EXTENDED_KEYS: Tuple[str, ...] = ANOMALY_KEYS + (
+    '[SU(3)]³ cubic',
+    'Witten SU(2)',
+)
+
+
+# Representation weights. Each takes the SU(3) and SU(2) labels of a field.
+
+def multiplicity(su3: RepLabel, su2: RepLabel) -> int:
+    """Number of components, dim(SU(3)) × dim(SU(2))"""
+    return SU3.dimension(su3) * SU2.dimension(su2)
+
+
+def su2_index_weight(su3: RepLabel, su2: RepLabel) -> fractions.Fraction:
+    """dim(SU(3)) × T_SU(2)"""
+    return SU3.dimension(su3) * SU2.index(su2)
+
+
+def su3_index_weight(su3: RepLabel, su2: RepLabel) -> fractions.Fraction:
+    """dim(SU(2)) × T_SU(3)"""
+    return SU2.dimension(su2) * SU3.index(su3)
+
+
+def su2_cubic_weight(su3: RepLabel, su2: RepLabel) -> int:
+    """dim(SU(3)) × A_SU(2), which vanishes identically"""
+    return SU3.dimension(su3) * SU2.cubic(su2)
+
+
+def su3_cubic_weight(su3: RepLabel, su2: RepLabel) -> int:
+    """dim(SU(2)) × A_SU(3)"""
+    return SU2.dimension(su2) * SU3.cubic(su3)
+
+
+def witten_weight(su3: RepLabel, su2: RepLabel) -> int:
+    """dim(SU(3)) × 2 T_SU(2): odd for an odd number of SU(2) doublets"""
+    return SU3.dimension(su3) * SU2.index_x2(su2)
+
+
+@dataclass(frozen=True)
+class AnomalyCondition:
+    """
+    One anomaly condition, sum of weight(su3, su2) × Y^power per field.
+
+    Attributes:
+        name: Coefficient name used as dictionary / vector key
+        weight: Representation weight function
+        power: Power of the hypercharge
+        weight_scale: Integer that makes weight × weight_scale integral for
+            every representation (used by the integer engines)
+        modulus: Reduce the sum modulo this integer (global anomalies)
+        cost: Relative cost per field, used to order early-exit checks
+        description: Human-readable description
+    """
+    name: str
+    weight: RepWeight
+    power: int = 0
+    weight_scale: int = 1
+    modulus: Optional[int] = None
+    cost: int = 1
+    description: str = ""
+
+    def __post_init__(self):
+        if self.power < 0:
+            raise ValueError(f"Hypercharge power must be non-negative, got {self.power}")
+        if self.modulus is not None and (self.power or self.weight_scale != 1):
+            raise ValueError(
+                f"Modular condition {self.name} needs an integer, Y-independent weight"
+            )
+
+
+def _fused_sums(fermions: Iterable, weights: Callable, columns: Sequence[Tuple[int, int]],
+                outputs: Sequence[int], max_power: int, zero: Union[int, fractions.Fraction],
+                den: Optional[int] = None) -> list:
+    """
+    Sums of weight × chirality × generations × Y^power over a spectrum, in one pass.
+
+    Args:
+        fermions: Fields with su3_rep, su2_rep, hypercharge, chirality and
+            generations attributes
+        weights: weights(su3, su2) -> tuple of weights, indexed by column
+        columns: (weight slot, power of Y) of every accumulator
+        outputs: Accumulator feeding each output position
+        max_power: Highest power of Y needed
+        zero: Initial value of every accumulator
+        den: Sum integer numerators of Y over den instead of Y itself
+
+    Returns:
+        One sum per output position
+    """
+    sums = [zero] * len(columns)
+    for f in fermions:
+        r = weights(f.su3_rep, f.su2_rep)
+        y = f.hypercharge
+        if den is not None:
+            y = y.numerator * (den // y.denominator)
+        # chirality × generations × Y^p for p = 0 .. max_power
+        terms = [f.chirality * f.generations]
+        for _ in range(max_power):
+            terms.append(terms[-1] * y)
+        for j, (w, p) in enumerate(columns):
+            sums[j] += r[w] * terms[p]
+    return [sums[j] for j in outputs]
+
+
+class EvaluationPlan:
+    """
+    Fused single-pass evaluation of a fixed list of conditions.
+
+    Conditions sharing a (weight, power) pair share one accumulator, e.g.
+    [Gravity]²[U(1)_Y] reuses the [U(1)_Y] sum. Representation weights are
+    memoized per (SU(3), SU(2)) pair, both as exact fractions and as
+    integers scaled by each condition's weight_scale.
+    """
+
+    def __init__(self, conditions: Sequence[AnomalyCondition]):
+        """
+        Compile a plan.
+
+        Args:
+            conditions: Conditions in output order
+        """
+        self.conditions: Tuple[AnomalyCondition, ...] = tuple(conditions)
+        self.keys: Tuple[str, ...] = tuple(c.name for c in self.conditions)
+
+        # Distinct weight functions, then distinct (weight, power) columns
+        self.weights: List[RepWeight] = []
+        for c in self.conditions:
+            if c.weight not in self.weights:
+                self.weights.append(c.weight)
+        self.columns: List[Tuple[int, int]] = []
+        self.column_of: List[int] = []
+        for c in self.conditions:
+            column = (self.weights.index(c.weight), c.power)
+            if column not in self.columns:
+                self.columns.append(column)
+            self.column_of.append(self.columns.index(column))
+        self.weight_index: List[int] = [self.weights.index(c.weight) for c in self.conditions]
+        self.max_power = max((p for _, p in self.columns), default=0)
+
+        # Integer accumulators: one per distinct (column, weight_scale)
+        self.int_columns: List[Tuple[int, int, int]] = []
+        self.int_column_of: List[int] = []
+        for c, col in zip(self.conditions, self.column_of):
+            int_column = (self.columns[col][0], c.power, c.weight_scale)
+            if int_column not in self.int_columns:
+                self.int_columns.append(int_column)
+            self.int_column_of.append(self.int_columns.index(int_column))
+        self.moduli: Tuple[Optional[int], ...] = tuple(c.modulus for c in self.conditions)
+
+        self._rep_weights: Dict[Tuple[RepLabel, RepLabel], Tuple] = {}
+        self._int_weights: Dict[Tuple[RepLabel, RepLabel], Tuple[int, ...]] = {}
+        self._scales: Dict[int, Tuple[int, ...]] = {}
+
+        # Integer accumulators read their own slot of int_weights
+        self._int_sum_columns: List[Tuple[int, int]] = [
+            (j, p) for j, (_, p, _) in enumerate(self.int_columns)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.conditions)
+
+    def rep_weights(self, su3: RepLabel, su2: RepLabel) -> Tuple:
+        """Exact value of every distinct weight function for one rep pair"""
+        key = (su3, su2)
+        try:
+            return self._rep_weights[key]
+        except KeyError:
+            value = self._rep_weights[key] = tuple(w(su3, su2) for w in self.weights)
+            return value
+
+    def int_weights(self, su3: RepLabel, su2: RepLabel) -> Tuple[int, ...]:
+        """Weight × weight_scale as integers, one per integer accumulator"""
+        key = (su3, su2)
+        try:
+            return self._int_weights[key]
+        except KeyError:
+            exact = self.rep_weights(su3, su2)
+            value = []
+            for w, _, scale in self.int_columns:
+                scaled = exact[w] * scale
+                if fractions.Fraction(scaled).denominator != 1:
+                    raise ArithmeticError(
+                        f"weight_scale {scale} does not make the weight "
+                        f"{self.weights[w].__name__} of ({su3}, {su2}) integral"
+                    )
+                value.append(int(scaled))
+            value = self._int_weights[key] = tuple(value)
+            return value
+
+    def scales(self, denominator: int) -> Tuple[int, ...]:
+        """
+        Per-condition scale making integer sums exact.
+
+        Args:
+            denominator: Common hypercharge denominator
+
+        Returns:
+            weight_scale × denominator^power for every condition
+        """
+        try:
+            return self._scales[denominator]
+        except KeyError:
+            value = self._scales[denominator] = tuple(
+                c.weight_scale * denominator**c.power for c in self.conditions
+            )
+            return value
+
+    def evaluate(self, fermions: Iterable) -> List[fractions.Fraction]:
+        """
+        Exact coefficients of a spectrum in one pass.
+
+        Args:
+            fermions: Fields with su3_rep, su2_rep, hypercharge, chirality
+                and generations attributes
+
+        Returns:
+            One Fraction per condition, in plan order
+        """
+        sums = _fused_sums(fermions, self.rep_weights, self.columns, self.column_of,
+                           self.max_power, fractions.Fraction(0))
+        for i, m in enumerate(self.moduli):
+            if m is not None:
+                sums[i] = fractions.Fraction(int(sums[i]) % m)
+        return sums
+
+    def evaluate_integer(self, fermions: Sequence) -> Tuple[List[int], Tuple[int, ...]]:
+        """
+        Integer-scaled coefficients of a spectrum in one pass.
+
+        Hypercharges are rewritten over the spectrum's common denominator D,
+        so all sums are plain Python ints.
+
+        Args:
+            fermions: Fields as for evaluate
+
+        Returns:
+            Tuple of (numerators, scales); coefficient i is
+            numerators[i] / scales[i]
+        """
+        den = 1
+        for f in fermions:
+            d = f.hypercharge.denominator
+            if den % d:
+                den = den * d // math.gcd(den, d)
+
+        sums = _fused_sums(fermions, self.int_weights, self._int_sum_columns,
+                           self.int_column_of, self.max_power, 0, den)
+        for i, m in enumerate(self.moduli):
+            if m is not None:
+                sums[i] %= m
+        return sums, self.scales(den)
+
+    def condition_sum(self, index: int, fermions: Iterable,
+                      start: fractions.Fraction = fractions.Fraction(0)) -> fractions.Fraction:
+        """
+        Exact value of a single condition of the plan.
+
+        Args:
+            index: Position of the condition in the plan
+            fermions: Fields to sum over
+            start: Initial value (e.g. a base spectrum's coefficient)
+
+        Returns:
+            start + the condition's sum, reduced by its modulus if any
+        """
+        c = self.conditions[index]
+        w, p = self.weight_index[index], c.power
+        value = start
+        for f in fermions:
+            value += (self.rep_weights(f.su3_rep, f.su2_rep)[w]
+                      * f.chirality * f.generations * f.hypercharge**p)
+        if c.modulus is not None:
+            value = fractions.Fraction(int(value) % c.modulus)
+        return value
+
+    def condition(self, name: str) -> 'EvaluationPlan':
+        """Plan for a single condition of this plan"""
+        return EvaluationPlan([self.conditions[self.keys.index(name)]])
+
+    def early_exit_order(self) -> List[str]:
+        """Independent conditions (one per accumulator), cheapest first"""
+        seen, order = set(), []
+        for c, col in zip(self.conditions, self.column_of):
+            key = (col, c.modulus)
+            if key not in seen:
+                seen.add(key)
+                order.append(c)
+        return [c.name for c in sorted(order, key=lambda c: c.cost)]
+
+    def profile(self, fermions: Sequence, repeat: int = 100) -> Dict[str, float]:
+        """
+        Time each condition on its own and the fused plan as a whole.
+
+        Args:
+            fermions: Spectrum to evaluate
+            repeat: Number of evaluations per measurement
+
+        Returns:
+            Seconds per evaluation for every condition and for 'fused'
+        """
+        fermions = list(fermions)
+        timings: Dict[str, float] = {}
+        plans = [(name, self.condition(name)) for name in self.keys]
+        plans.append(('fused', self))
+        for name, plan in plans:
+            plan.evaluate(fermions)  # warm the weight caches
+            start = time.perf_counter()
+            for _ in range(repeat):
+                plan.evaluate(fermions)
+            timings[name] = (time.perf_counter() - start) / repeat
+        return timings
+
+
+class ConditionRegistry:
+    """Named anomaly conditions and a cache of compiled plans"""
+
+    def __init__(self):
+        self._conditions: Dict[str, AnomalyCondition] = {}
+        self._plans: Dict[Tuple[str, ...], EvaluationPlan] = {}
+
+    def register(self, condition: AnomalyCondition, replace: bool = False) -> AnomalyCondition:
+        """
+        Add a condition.
+
+        Args:
+            condition: Condition to register
+            replace: Allow overwriting a condition of the same name
+
+        Returns:
+            The registered condition
+        """
+        if condition.name in self._conditions and not replace:
+            raise ValueError(f"Anomaly condition already registered: {condition.name}")
+        self._conditions[condition.name] = condition
+        self._plans.clear()
+        return condition
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._conditions
+
+    def __getitem__(self, name: str) -> AnomalyCondition:
+        try:
+            return self._conditions[name]
+        except KeyError:
+            raise ValueError(f"Unknown anomaly condition: {name}")
+
+    def names(self) -> List[str]:
+        """Registered condition names in registration order"""
+        return list(self._conditions)
+
+    def compile(self, names: Optional[Sequence[str]] = None) -> EvaluationPlan:
+        """
+        Compiled plan for a list of conditions (memoized).
+
+        Args:
+            names: Condition names in output order (default: ANOMALY_KEYS)
+
+        Returns:
+            EvaluationPlan evaluating those conditions in one pass
+        """
+        key = tuple(names) if names is not None else ANOMALY_KEYS
+        try:
+            return self._plans[key]
+        except KeyError:
+            plan = self._plans[key] = EvaluationPlan([self[name] for name in key])
+            return plan
+
+
+REGISTRY = ConditionRegistry()
+
+for _condition in (
+    AnomalyCondition('[U(1)_Y]', multiplicity, power=1,
+                     description="Mixed gravitational-hypercharge, Σ Y"),
+    AnomalyCondition('[U(1)_Y]³', multiplicity, power=3, cost=3,
+                     description="Cubic hypercharge, Σ Y³"),
+    AnomalyCondition('[U(1)_Y][SU(2)]²', su2_index_weight, power=1, weight_scale=2,
+                     description="Σ dim(SU(3)) T_SU(2) Y"),
+    AnomalyCondition('[U(1)_Y][SU(3)]²', su3_index_weight, power=1, weight_scale=2,
+                     description="Σ dim(SU(2)) T_SU(3) Y"),
+    AnomalyCondition('[SU(2)]³', su2_cubic_weight,
+                     description="SU(2) cubic anomaly (identically zero)"),
+    AnomalyCondition('[SU(3)]³', su3_index_weight, weight_scale=2,
+                     description="Legacy SU(3) condition, Σ dim(SU(2)) T_SU(3)"),
+    AnomalyCondition('[Gravity]²[U(1)_Y]', multiplicity, power=1,
+                     description="Same sum as [U(1)_Y]"),
+    AnomalyCondition('[SU(3)]³ cubic', su3_cubic_weight,
+                     description="SU(3) cubic anomaly, Σ dim(SU(2)) A_SU(3)"),
+    AnomalyCondition('Witten SU(2)', witten_weight, modulus=2,
+                     description="Global SU(2) anomaly, Σ dim(SU(3)) 2T_SU(2) mod 2"),
+):
+    REGISTRY.register(_condition)
+
+
+def register_condition(condition: AnomalyCondition, replace: bool = False) -> AnomalyCondition:
+    """Register a condition in the default registry"""
+    return REGISTRY.register(condition, replace)
+
+
+def compile_plan(names: Optional[Sequence[str]] = None) -> EvaluationPlan:
+    """Compiled plan from the default registry (default: ANOMALY_KEYS)"""
+    return REGISTRY.compile(names)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+contribution_table.py
+=====================
+Precomputed anomaly contributions of the standard candidate grid.
+Block A and Block B scan the same representation pairs over Y = k/D, so
+the integer-scaled contribution of every (SU(3), SU(2), k) cell is
+written once to a compact binary file and memory-mapped by later runs.
+Evaluating a candidate then reduces to a few table reads plus the base
+spectrum's offsets.
+
+File layout: an 8-byte magic, a little-endian uint32 header length, a
+JSON header (conditions, representations, denominator, k_max) padded to
+8 bytes, then one native int64 per (representation, k, condition) for a
+left-handed single generation. Contributions are linear in chirality ×
+generations, so right-handed cells are not stored.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import argparse
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import ENGINE_VERSION
+from src.anomaly_conditions import EvaluationPlan, RepLabel, compile_plan
+
+MAGIC = b"ANOMTBL1"
+
+# Representation pairs of Block A; Block B adds its configured products
+STANDARD_REPS: Tuple[Tuple[int, int], ...] = (
+    (1, 1), (1, 2), (1, 3), (3, 1), (3, 2), (6, 1), (8, 1)
+)
+
+DEFAULT_K_MAX = 48
+
+
+def _fingerprint(plan: EvaluationPlan) -> List[list]:
+    """Everything about the plan that changes the stored values"""
+    return [[c.name, c.weight.__name__, c.power, c.weight_scale]
+            for c in plan.conditions]
+
+
+class ContributionTable:
+    """
+    Memory-mapped table of single-field anomaly contributions.
+
+    Values are the plan's integer-scaled coefficients (see
+    EvaluationPlan.scales) of one left-handed field with Y = k / denominator,
+    before any modular reduction.
+    """
+
+    def __init__(self, path: Union[str, Path], plan: EvaluationPlan):
+        """
+        Map an existing table file.
+
+        Args:
+            path: Table file written by build()
+            plan: Conditions the table must have been built for
+
+        Raises:
+            ValueError: If the file is not a table for this plan
+        """
+        self.path = Path(path)
+        self.plan = plan
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header, offset = self._read_header(self._mmap)
+            if (header.get('engine_version') != ENGINE_VERSION
+                    or header.get('conditions') != _fingerprint(plan)
+                    or header.get('byteorder') != sys.byteorder):
+                raise ValueError(f"{self.path} was built for different conditions")
+            self.denominator: int = header['denominator']
+            self.k_max: int = header['k_max']
+            self.reps: List[Tuple[RepLabel, RepLabel]] = [tuple(r) for r in header['reps']]
+            self._values = memoryview(self._mmap)[offset:].cast('q')
+            expected = len(self.reps) * (2 * self.k_max + 1) * len(plan)
+            if len(self._values) != expected:
+                raise ValueError(f"{self.path} is truncated")
+        except Exception:
+            self.close()
+            raise
+        self._rep_index: Dict[Tuple[RepLabel, RepLabel], int] = {
+            rep: i for i, rep in enumerate(self.reps)
+        }
+        self._stride = len(plan)
+
+    @staticmethod
+    def _read_header(buffer) -> Tuple[dict, int]:
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not an anomaly contribution table")
+        start = len(MAGIC) + 4
+        (length,) = struct.unpack('<I', buffer[len(MAGIC):start])
+        header = json.loads(bytes(buffer[start:start + length]).decode())
+        return header, start + length
+
+    @classmethod
+    def build(cls, path: Union[str, Path], plan: Optional[EvaluationPlan] = None,
+              denominator: int = 6, k_max: int = DEFAULT_K_MAX,
+              reps: Sequence[Tuple[RepLabel, RepLabel]] = STANDARD_REPS) -> 'ContributionTable':
+        """
+        Compute every cell and write the table file.
+
+        The file is written next to its destination and renamed into
+        place, so concurrent scanners never map a partial table.
+
+        Args:
+            path: Destination file
+            plan: Compiled anomaly conditions (default: ANOMALY_KEYS)
+            denominator: Hypercharge denominator D of the grid
+            k_max: Largest |k| in Y = k / D
+            reps: (SU(3), SU(2)) representation pairs
+
+        Returns:
+            The mapped table
+        """
+        plan = plan or compile_plan()
+        path = Path(path)
+        reps = list(dict.fromkeys(tuple(r) for r in reps))
+        powers = [c.power for c in plan.conditions]
+
+        values = array.array('q')
+        for su3, su2 in reps:
+            weights = plan.int_weights(su3, su2)
+            row = [weights[j] for j in plan.int_column_of]
+            for k in range(-k_max, k_max + 1):
+                values.extend(w * k**p for w, p in zip(row, powers))
+
+        header = json.dumps({
+            'engine_version': ENGINE_VERSION,
+            'conditions': _fingerprint(plan),
+            'byteorder': sys.byteorder,
+            'denominator': denominator,
+            'k_max': k_max,
+            'reps': [list(r) for r in reps],
+        }).encode()
+        # Pad so the int64 block starts on an 8-byte boundary
+        header += b' ' * (-(len(MAGIC) + 4 + len(header)) % 8)
+
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            values.tofile(f)
+        os.replace(tmp, path)
+        return cls(path, plan)
+
+    @classmethod
+    def load_or_build(cls, path: Union[str, Path], plan: Optional[EvaluationPlan] = None,
+                      denominator: int = 6, k_max: int = DEFAULT_K_MAX,
+                      reps: Sequence[Tuple[RepLabel, RepLabel]] = STANDARD_REPS) -> 'ContributionTable':
+        """
+        Map the table at path, rebuilding it if it does not cover the request.
+
+        Args:
+            path: Table file
+            plan: Compiled anomaly conditions (default: ANOMALY_KEYS)
+            denominator: Required hypercharge denominator
+            k_max: Required largest |k|
+            reps: Required representation pairs
+
+        Returns:
+            A table covering every requested cell
+        """
+        plan = plan or compile_plan()
+        reps = [tuple(r) for r in reps]
+        try:
+            table = cls(path, plan)
+        except (OSError, ValueError):
+            return cls.build(path, plan, denominator, k_max, reps)
+        if (table.denominator == denominator and table.k_max >= k_max
+                and set(reps) <= set(table.reps)):
+            return table
+        # Keep whatever the old table covered when it used the same grid
+        if table.denominator == denominator:
+            k_max = max(k_max, table.k_max)
+            reps = table.reps + reps
+        table.close()
+        return cls.build(path, plan, denominator, k_max, reps)
+
+    def cell(self, su3: RepLabel, su2: RepLabel, k: int) -> Optional[List[int]]:
+        """
+        Scaled contributions of one left-handed field, or None if off the table.
+
+        Args:
+            su3: SU(3) representation
+            su2: SU(2) representation
+            k: Hypercharge numerator over the table's denominator
+
+        Returns:
+            One int per condition, in plan order
+        """
+        r = self._rep_index.get((su3, su2))
+        if r is None or not -self.k_max <= k <= self.k_max:
+            return None
+        start = (r * (2 * self.k_max + 1) + k + self.k_max) * self._stride
+        return self._values[start:start + self._stride].tolist()
+
+    def delta(self, extra: Sequence) -> Optional[List[int]]:
+        """
+        Scaled anomaly contributions of a list of fields.
+
+        Args:
+            extra: Fields with su3_rep, su2_rep, hypercharge, chirality and
+                generations attributes
+
+        Returns:
+            One int per condition (coefficient × plan.scales(denominator)),
+            or None if some field is not on the table
+        """
+        total = [0] * self._stride
+        den = self.denominator
+        for f in extra:
+            y = f.hypercharge
+            if den % y.denominator:
+                return None
+            row = self.cell(f.su3_rep, f.su2_rep, y.numerator * (den // y.denominator))
+            if row is None:
+                return None
+            weight = f.chirality * f.generations
+            for i in range(self._stride):
+                total[i] += weight * row[i]
+        return total
+
+    def __len__(self) -> int:
+        """Number of cells (representation pairs × k values)"""
+        return len(self.reps) * (2 * self.k_max + 1)
+
+    def close(self) -> None:
+        """Release the memory map"""
+        values = getattr(self, '_values', None)
+        if values is not None:
+            values.release()
+            self._values = None
+        self._mmap.close()
+
+    def __enter__(self) -> 'ContributionTable':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main():
+    """Build a contribution table from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Precompute the anomaly contribution table of the standard candidate grid"
+    )
+    parser.add_argument("path", help="Table file to write")
+    parser.add_argument("--denominator", type=int, default=6,
+                        help="Hypercharge denominator D of the grid Y = k/D (default: 6)")
+    parser.add_argument("--k-max", type=int, default=DEFAULT_K_MAX,
+                        help=f"Largest |k| in the grid (default: {DEFAULT_K_MAX})")
+    parser.add_argument("--conditions", nargs="+", default=None,
+                        help="Registered anomaly conditions (default: the standard seven)")
+    args = parser.parse_args()
+
+    with ContributionTable.build(args.path, compile_plan(args.conditions),
+                                 args.denominator, args.k_max) as table:
+        print(f"Wrote {len(table)} cells ({len(table.plan)} conditions) to {table.path}")
+
+
+if __name__ == "__main__":
+    main()
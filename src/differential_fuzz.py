@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+differential_fuzz.py
+====================
+Differential fuzzing of the accelerated anomaly evaluators against the
+reference AnomalyChecker. A seeded generator produces random spectra
+(exotic representations, huge hypercharge numerators, many generations,
+mixed chirality, and vector-like completions that make some of them
+anomaly-free); every engine must return exactly the reference vector and
+verdict. Failing spectra are shrunk to a minimal reproducer.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import argparse
+import fractions
+import json
+import random
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import (
+    Fermion, AnomalyChecker, AnomalyVector, BaseContext, EarlyExitVerifier,
+    IncrementalAnomalyChecker, Spectrum, SpectrumTrie
+)
+from src.anomaly_conditions import EXTENDED_KEYS, EvaluationPlan, compile_plan
+from src.batch_evaluator import evaluate_spectrum
+from src.modular_sieve import ModularSieve
+
+# Environment variable enabling the long-running mode of the test suite
+FUZZ_ENV = "ANOMALY_FUZZ_ITERATIONS"
+
+SU3_CHOICES = (1, 3, "3bar", 6, "6bar", 8, 10, "10bar", 15, "15'", "15'bar", 24, 27)
+SU2_CHOICES = (1, 2, 3, 4, 5, 6, 7, 8)
+
+
+class SpectrumGenerator:
+    """
+    Seed-controlled source of random spectra.
+
+    Spectrum i depends only on (seed, i), so any failure can be
+    regenerated from the two numbers in its report.
+    """
+
+    def __init__(self, seed: int = 0, max_fields: int = 8, max_generations: int = 1000,
+                 max_numerator: int = 10**24, max_denominator: int = 10**6):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Base seed
+            max_fields: Largest number of independent fields per spectrum
+            max_generations: Largest generation count
+            max_numerator: Largest |numerator| of "huge" hypercharges
+            max_denominator: Largest denominator of "huge" hypercharges
+        """
+        self.seed = seed
+        self.max_fields = max_fields
+        self.max_generations = max_generations
+        self.max_numerator = max_numerator
+        self.max_denominator = max_denominator
+
+    def _hypercharge(self, rng: random.Random) -> fractions.Fraction:
+        style = rng.random()
+        if style < 0.5:
+            return fractions.Fraction(rng.randint(-12, 12), 6)
+        if style < 0.8:
+            return fractions.Fraction(rng.randint(-100, 100), rng.randint(1, 60))
+        return fractions.Fraction(rng.randint(-self.max_numerator, self.max_numerator),
+                                  rng.randint(1, self.max_denominator))
+
+    def _generations(self, rng: random.Random) -> int:
+        if rng.random() < 0.7:
+            return rng.randint(1, 3)
+        return rng.randint(1, self.max_generations)
+
+    def spectrum(self, index: int) -> List[Fermion]:
+        """
+        Spectrum number index.
+
+        A third of the spectra are made vector-like by adding every field
+        with flipped chirality, so both verdicts are exercised.
+
+        Args:
+            index: Position in the sequence
+
+        Returns:
+            List of fermions
+        """
+        rng = random.Random(self.seed * 1_000_003 + index)
+        fields = [
+            Fermion(
+                name=f"F{i}",
+                su3_rep=rng.choice(SU3_CHOICES),
+                su2_rep=rng.choice(SU2_CHOICES),
+                hypercharge=self._hypercharge(rng),
+                chirality=rng.choice((1, -1)),
+                generations=self._generations(rng)
+            )
+            for i in range(rng.randint(1, self.max_fields))
+        ]
+        if rng.random() < 1 / 3:
+            fields += [
+                Fermion(f.name + "bar", f.su3_rep, f.su2_rep, f.hypercharge,
+                        -f.chirality, f.generations)
+                for f in fields
+            ]
+            rng.shuffle(fields)
+        return fields
+
+    def __iter__(self) -> Iterator[List[Fermion]]:
+        index = 0
+        while True:
+            yield self.spectrum(index)
+            index += 1
+
+
+# Accelerated evaluators: name -> (fermions, plan) -> AnomalyVector
+def _split(fermions: Sequence[Fermion]) -> int:
+    return len(fermions) // 2
+
+
+def _delta(fermions, plan):
+    k = _split(fermions)
+    return BaseContext(fermions[:k], "integer", plan).evaluate(fermions[k:])
+
+
+def _incremental(fermions, plan):
+    k = _split(fermions)
+    checker = IncrementalAnomalyChecker(fermions[:k], "integer", plan)
+    for f in fermions[k:]:
+        checker.add_field(f)
+    return checker.vector
+
+
+VECTOR_ENGINES: Dict[str, Callable[[Sequence[Fermion], EvaluationPlan], AnomalyVector]] = {
+    "integer": lambda fs, plan: AnomalyChecker(fs, "integer", plan).compute_vector(),
+    "spectrum": lambda fs, plan: AnomalyChecker(Spectrum(fs), "integer", plan).compute_vector(),
+    "vector": lambda fs, plan: evaluate_spectrum(fs, plan),
+    "vector-python": lambda fs, plan: evaluate_spectrum(fs, plan, use_numpy=False),
+    "delta": _delta,
+    "incremental": _incremental,
+    "trie": lambda fs, plan: SpectrumTrie(plan).add(fs),
+}
+
+
+def _early_exit(fermions, plan, anomaly_free):
+    k = _split(fermions)
+    verifier = EarlyExitVerifier(BaseContext(fermions[:k], "integer", plan))
+    return verifier.check(fermions[k:]) is anomaly_free
+
+
+def _sieve(fermions, plan, anomaly_free):
+    # The sieve may pass anomalous spectra, but must pass every hit
+    k = _split(fermions)
+    return ModularSieve(BaseContext(fermions[:k], "integer", plan)).check(fermions[k:]) or not anomaly_free
+
+
+# Verdict filters: name -> (fermions, plan, reference verdict) -> consistent?
+VERDICT_ENGINES: Dict[str, Callable[[Sequence[Fermion], EvaluationPlan, bool], bool]] = {
+    "early-exit": _early_exit,
+    "sieve": _sieve,
+}
+
+
+def compare_engines(fermions: Sequence[Fermion],
+                    plan: Optional[EvaluationPlan] = None) -> List[str]:
+    """
+    Engines that disagree with the reference checker on one spectrum.
+
+    Args:
+        fermions: Spectrum to evaluate
+        plan: Compiled anomaly conditions (default: EXTENDED_KEYS)
+
+    Returns:
+        Descriptions of every mismatch (empty if all engines agree)
+    """
+    plan = plan or compile_plan(EXTENDED_KEYS)
+    fermions = list(fermions)
+    reference = AnomalyChecker(fermions, "reference", plan).compute_vector()
+    anomaly_free = reference.is_zero()
+
+    mismatches = []
+    for name, engine in VECTOR_ENGINES.items():
+        try:
+            value = engine(fermions, plan)
+        except Exception as e:
+            mismatches.append(f"{name}: raised {type(e).__name__}: {e}")
+            continue
+        if value != reference:
+            mismatches.append(f"{name}: {dict(value)} != {dict(reference)}")
+    for name, check in VERDICT_ENGINES.items():
+        try:
+            consistent = check(fermions, plan, anomaly_free)
+        except Exception as e:
+            mismatches.append(f"{name}: raised {type(e).__name__}: {e}")
+            continue
+        if not consistent:
+            mismatches.append(f"{name}: wrong verdict (reference anomaly-free: {anomaly_free})")
+    return mismatches
+
+
+def _simplifications(f: Fermion) -> Iterator[Fermion]:
+    """Smaller variants of one field, simplest first"""
+    y = f.hypercharge
+    candidates = [
+        (f.su3_rep, f.su2_rep, fractions.Fraction(0), f.chirality, f.generations),
+        (f.su3_rep, f.su2_rep, y, f.chirality, 1),
+        (1, f.su2_rep, y, f.chirality, f.generations),
+        (f.su3_rep, 1, y, f.chirality, f.generations),
+        (f.su3_rep, f.su2_rep, y, 1, f.generations),
+        (f.su3_rep, f.su2_rep, fractions.Fraction(y.numerator), f.chirality, f.generations),
+        (f.su3_rep, f.su2_rep, fractions.Fraction(y.numerator // 2, y.denominator),
+         f.chirality, f.generations),
+        (f.su3_rep, f.su2_rep, y, f.chirality, f.generations // 2 or 1),
+    ]
+    for su3, su2, hypercharge, chirality, generations in candidates:
+        if (su3, su2, hypercharge, chirality, generations) != (
+                f.su3_rep, f.su2_rep, f.hypercharge, f.chirality, f.generations):
+            yield Fermion(f.name, su3, su2, hypercharge, chirality, generations)
+
+
+def shrink(fermions: Sequence[Fermion], failing: Callable[[List[Fermion]], bool],
+           max_steps: int = 10000) -> List[Fermion]:
+    """
+    Minimize a failing spectrum.
+
+    Fields are dropped one at a time, then simplified (hypercharge to 0 or
+    smaller numerators, one generation, trivial representations, left
+    chirality) for as long as the failure persists.
+
+    Args:
+        fermions: Spectrum on which failing() is True
+        failing: Predicate reproducing the failure
+        max_steps: Upper bound on predicate evaluations
+
+    Returns:
+        A spectrum on which failing() is still True and no single
+        removal or simplification keeps it failing
+    """
+    current = list(fermions)
+    steps = 0
+    progress = True
+    while progress and steps < max_steps:
+        progress = False
+        i = 0
+        while i < len(current) and steps < max_steps:
+            trial = current[:i] + current[i + 1:]
+            steps += 1
+            if trial and failing(trial):
+                current = trial
+                progress = True
+            else:
+                i += 1
+        for i in range(len(current)):
+            for simpler in _simplifications(current[i]):
+                if steps >= max_steps:
+                    break
+                trial = current[:i] + [simpler] + current[i + 1:]
+                steps += 1
+                if failing(trial):
+                    current = trial
+                    progress = True
+                    break
+    return current
+
+
+def _fermion_to_dict(f: Fermion) -> Dict:
+    return {
+        'name': f.name,
+        'su3_rep': f.su3_rep,
+        'su2_rep': f.su2_rep,
+        'hypercharge': str(f.hypercharge),
+        'chirality': f.chirality,
+        'generations': f.generations
+    }
+
+
+@dataclass
+class FuzzFailure:
+    """Minimal disagreement found by fuzz()"""
+    seed: int
+    index: int
+    spectrum: List[Fermion]
+    mismatches: List[str]
+    original_size: int = 0
+
+    def to_json(self) -> str:
+        """Reproducer in the JSON format of anomaly_checker --json"""
+        return json.dumps({
+            'seed': self.seed,
+            'index': self.index,
+            'mismatches': self.mismatches,
+            'fermions': [_fermion_to_dict(f) for f in self.spectrum],
+        }, indent=2)
+
+
+@dataclass
+class FuzzReport:
+    """Outcome of a fuzzing run"""
+    seed: int
+    spectra: int = 0
+    anomaly_free: int = 0
+    failures: List[FuzzFailure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+def fuzz(seed: int = 0, iterations: int = 100, plan: Optional[EvaluationPlan] = None,
+         generator: Optional[SpectrumGenerator] = None, max_failures: int = 1) -> FuzzReport:
+    """
+    Compare every engine with the reference on generated spectra.
+
+    Args:
+        seed: Generator seed (ignored if a generator is given)
+        iterations: Number of spectra
+        plan: Compiled anomaly conditions (default: EXTENDED_KEYS)
+        generator: Custom spectrum generator
+        max_failures: Stop after this many (shrunk) failures
+
+    Returns:
+        FuzzReport with counts and minimal failing spectra
+    """
+    plan = plan or compile_plan(EXTENDED_KEYS)
+    generator = generator or SpectrumGenerator(seed)
+    report = FuzzReport(seed=generator.seed)
+    for index in range(iterations):
+        fermions = generator.spectrum(index)
+        report.spectra += 1
+        mismatches = compare_engines(fermions, plan)
+        if not mismatches:
+            report.anomaly_free += AnomalyChecker(fermions, "integer", plan).compute_vector().is_zero()
+            continue
+        minimal = shrink(fermions, lambda fs: bool(compare_engines(fs, plan)))
+        report.failures.append(FuzzFailure(
+            seed=generator.seed, index=index, spectrum=minimal,
+            mismatches=compare_engines(minimal, plan), original_size=len(fermions)
+        ))
+        if len(report.failures) >= max_failures:
+            break
+    return report
+
+
+def main():
+    """Run the differential fuzzer from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Compare accelerated anomaly engines with the reference checker"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0)")
+    parser.add_argument("--iterations", type=int, default=1000,
+                        help="Number of random spectra (default: 1000)")
+    parser.add_argument("--max-fields", type=int, default=8,
+                        help="Largest number of independent fields per spectrum (default: 8)")
+    parser.add_argument("--conditions", nargs="+", default=None,
+                        help="Registered anomaly conditions (default: the extended set)")
+    args = parser.parse_args()
+
+    plan = compile_plan(args.conditions or EXTENDED_KEYS)
+    report = fuzz(iterations=args.iterations, plan=plan,
+                  generator=SpectrumGenerator(args.seed, max_fields=args.max_fields))
+    print(f"Seed {report.seed}: {report.spectra} spectra, "
+          f"{report.anomaly_free} anomaly-free, {len(report.failures)} failures")
+    for failure in report.failures:
+        print(f"\nSpectrum {failure.index} ({failure.original_size} fields) "
+              f"shrunk to {len(failure.spectrum)}:")
+        print(failure.to_json())
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+flavored_u1.py
+==============
+Family-dependent U(1)' extensions of a spectrum. Every generation of every
+field carries its own U(1)' charge, so a spectrum with g generations of n
+fields has n × g charge slots instead of the n charges that the
+generations multiplier can express. For one or more extra abelian factors
+X_1 ... X_k the conditions are
+
+- [X_a][SU(3)]² and [X_a][SU(2)]²
+- every cubic multiset of U(1)_Y, X_1 ... X_k containing at least one X_a
+  (X³, X²Y, XY², and the mixed X_a X_b ... terms)
+- [Gravity]²[X_a]
+
+and the Standard Model conditions of the spectrum itself, which do not
+depend on the new charges and are computed once by AnomalyChecker.
+
+Each condition is a weighted sum over slots of one monomial in the new
+charges, so a batch of charge assignments is evaluated as a single
+contraction of the (candidates, slots, monomials) tensor with a fixed
+(slots, conditions) coefficient matrix. As in batch_evaluator, NumPy is
+optional and an int64 overflow guard falls back to exact Python ints.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import fractions
+import itertools
+import math
+import sys
+from pathlib import Path
+from typing import Any, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import AnomalyChecker, AnomalyVector, Conditions, Fermion
+from src.batch_evaluator import BatchResult, _INT64_SAFE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+HYPERCHARGE = "U(1)_Y"
+
+# Candidates evaluated per vectorized pass in scan()
+DEFAULT_BATCH_SIZE = 4096
+
+
+def _power_suffix(count: int) -> str:
+    return "" if count == 1 else "²" if count == 2 else "³"
+
+
+def _lcm(values: Sequence[int]) -> int:
+    result = 1
+    for v in values:
+        result = result * v // math.gcd(result, v)
+    return result
+
+
+class FlavoredU1Checker:
+    """
+    Anomaly conditions of a spectrum extended by U(1)' factors with
+    per-generation charges.
+    """
+
+    def __init__(self, fermions: Sequence[Fermion],
+                 names: Union[str, Sequence[str]] = "U(1)'",
+                 engine: str = "reference", conditions: Conditions = None):
+        """
+        Compile the U(1)' conditions of a spectrum.
+
+        Args:
+            fermions: Base spectrum; a field with g generations contributes
+                g charge slots
+            names: Name of the extra abelian factor, or one name per factor
+            engine: AnomalyChecker engine for the Standard Model conditions
+            conditions: Standard Model conditions (default: ANOMALY_KEYS)
+        """
+        self.names: Tuple[str, ...] = (names,) if isinstance(names, str) else tuple(names)
+        if not self.names:
+            raise ValueError("At least one U(1)' factor is required")
+        if len(set(self.names)) != len(self.names) or HYPERCHARGE in self.names:
+            raise ValueError(f"U(1)' names must be distinct and differ from {HYPERCHARGE}: "
+                             f"{self.names}")
+
+        self.fermions = list(fermions)
+        self.checker = AnomalyChecker(self.fermions, engine, conditions)
+        self.base = self.checker.compute_vector()
+
+        # One slot per (field, generation) with per-generation weights
+        self.fields: Tuple[str, ...] = tuple(f.name for f in self.fermions)
+        slots: List[Tuple[int, int]] = []
+        weights: List[Tuple[fractions.Fraction, ...]] = []
+        for i, f in enumerate(self.fermions):
+            w = self.checker.fermion_weights(f)
+            w = tuple(fractions.Fraction(x) / f.generations for x in w[:3])
+            for g in range(f.generations):
+                slots.append((i, g))
+                weights.append(w + (fractions.Fraction(f.hypercharge),))
+        self.slots: Tuple[Tuple[int, int], ...] = tuple(slots)
+
+        # Conditions as (name, coefficient per slot, U(1)' indices)
+        k = len(self.names)
+        conditions_: List[Tuple[str, Tuple[fractions.Fraction, ...], Tuple[int, ...]]] = []
+        for a, name in enumerate(self.names):
+            conditions_.append((f"[{name}][SU(3)]²", tuple(w[2] for w in weights), (a,)))
+            conditions_.append((f"[{name}][SU(2)]²", tuple(w[1] for w in weights), (a,)))
+        # U(1)_Y is factor k; multisets without any X_a are Standard Model conditions
+        for triple in itertools.combinations_with_replacement(range(k + 1), 3):
+            if triple == (k, k, k):
+                continue
+            counts = {a: triple.count(a) for a in dict.fromkeys(triple)}
+            name = "".join(
+                f"[{self.names[a] if a < k else HYPERCHARGE}]" + _power_suffix(c)
+                for a, c in counts.items()
+            )
+            y_power = counts.get(k, 0)
+            coefficient = tuple(w[0] * w[3]**y_power for w in weights)
+            conditions_.append((name, coefficient, tuple(a for a in triple if a < k)))
+        for a, name in enumerate(self.names):
+            conditions_.append((f"[Gravity]²[{name}]", tuple(w[0] for w in weights), (a,)))
+
+        self.conditions = tuple(conditions_)
+        self.keys: Tuple[str, ...] = self.base.layout + tuple(c[0] for c in conditions_)
+
+        # Integer coefficients: condition c is lifts[c] × (its exact value)
+        self._lifts = tuple(_lcm([v.denominator for v in c[1]]) for c in conditions_)
+        self._int_coefficients = tuple(
+            tuple(int(v * lift) for v in c[1])
+            for c, lift in zip(conditions_, self._lifts)
+        )
+        self.monomials: Tuple[Tuple[int, ...], ...] = tuple(dict.fromkeys(c[2] for c in conditions_))
+        self._monomial_of = tuple(self.monomials.index(c[2]) for c in conditions_)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @property
+    def slot_labels(self) -> Tuple[str, ...]:
+        """Slot names such as "L_L[2]" for the second generation of L_L"""
+        return tuple(f"{self.fields[i]}[{g + 1}]" for i, g in self.slots)
+
+    def assignment(self, charges: Mapping[str, Any]) -> Tuple[fractions.Fraction, ...]:
+        """
+        Per-slot charges of one U(1)' from per-field charges.
+
+        Args:
+            charges: Field name to a single charge (shared by every
+                generation) or a list with one charge per generation;
+                omitted fields are neutral
+
+        Returns:
+            One charge per slot
+        """
+        unknown = set(charges) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+        result = []
+        for i, g in self.slots:
+            value = charges.get(self.fields[i], 0)
+            if isinstance(value, (list, tuple)):
+                if len(value) != self.fermions[i].generations:
+                    raise ValueError(f"{self.fields[i]} needs {self.fermions[i].generations} "
+                                     f"charges, got {len(value)}")
+                value = value[g]
+            result.append(fractions.Fraction(value))
+        return tuple(result)
+
+    def _rows(self, charges) -> List[Tuple[fractions.Fraction, ...]]:
+        """Normalize one assignment to one tuple of k charges per slot"""
+        if isinstance(charges, Mapping):
+            charges = self.assignment(charges) if len(self.names) == 1 else list(zip(
+                *(self.assignment(charges.get(name, {})) for name in self.names)
+            ))
+        if len(charges) != len(self.slots):
+            raise ValueError(f"Expected {len(self.slots)} slot charges, got {len(charges)}")
+        rows = []
+        for value in charges:
+            row = (value,) if len(self.names) == 1 and not isinstance(value, (list, tuple)) else value
+            if len(row) != len(self.names):
+                raise ValueError(f"Expected {len(self.names)} charges per slot, got {len(row)}")
+            rows.append(tuple(fractions.Fraction(v) for v in row))
+        return rows
+
+    def anomalies(self, charges) -> AnomalyVector:
+        """
+        Every anomaly coefficient of one charge assignment, exactly.
+
+        Args:
+            charges: One charge per slot (a tuple of k charges per slot for
+                k factors), or a per-field mapping as accepted by
+                assignment(); with several factors the mapping is keyed by
+                factor name first
+
+        Returns:
+            AnomalyVector with the Standard Model conditions followed by
+            the U(1)' conditions
+        """
+        rows = self._rows(charges)
+        values = []
+        for _, coefficient, factors in self.conditions:
+            total = fractions.Fraction(0)
+            for c, row in zip(coefficient, rows):
+                if c:
+                    for a in factors:
+                        c *= row[a]
+                    total += c
+            values.append(total)
+        base = [self.base[key] for key in self.base.layout]
+        return AnomalyVector.from_fractions(base + values, self.keys)
+
+    def verify_cancellation(self, charges) -> Tuple[bool, List[str]]:
+        """
+        Check one charge assignment.
+
+        Returns:
+            Tuple of (all_cancel, names of the non-cancelling conditions)
+        """
+        vector = self.anomalies(charges)
+        failed = [key for key in self.keys if vector[key] != 0]
+        return not failed, failed
+
+    def evaluate_batch(self, charges, denominator: int = 1,
+                       use_numpy: Optional[bool] = None) -> BatchResult:
+        """
+        Evaluate a batch of charge assignments in one vectorized pass.
+
+        Args:
+            charges: Integer charge numerators of shape (candidates, slots)
+                for a single U(1)', or (candidates, slots, factors)
+            denominator: Common denominator of the charges
+            use_numpy: Force (True) or disable (False) the int64 NumPy path;
+                by default it is used whenever NumPy is importable
+
+        Returns:
+            BatchResult over self.keys; column scales include the base
+            spectrum's Standard Model denominators
+        """
+        if denominator <= 0:
+            raise ValueError(f"Denominator must be positive, got {denominator}")
+        if use_numpy and not HAS_NUMPY:
+            raise ImportError("NumPy is required for use_numpy=True")
+
+        base = [self.base[key] for key in self.base.layout]
+        offsets = [v.numerator for v in base]
+        scales = tuple([v.denominator for v in base] + [
+            lift * denominator**len(factors)
+            for lift, (_, _, factors) in zip(self._lifts, self.conditions)
+        ])
+
+        if use_numpy is not False and HAS_NUMPY:
+            try:
+                array = np.asarray(charges, dtype=np.int64)
+            except (OverflowError, ValueError, TypeError):
+                array = None
+            if array is not None and array.size and self._fits_int64(array):
+                return self._evaluate_numpy(array, offsets, scales)
+        return self._evaluate_python(charges, offsets, scales)
+
+    def _fits_int64(self, array) -> bool:
+        """Overflow guard: bound every slot product of the int64 path"""
+        max_charge = max(int(np.abs(array).max(initial=0)), 1)
+        max_coefficient = max((abs(v) for c in self._int_coefficients for v in c), default=0)
+        return max_coefficient * max_charge**3 * len(self.slots) < _INT64_SAFE
+
+    def _evaluate_numpy(self, array, offsets, scales) -> BatchResult:
+        """int64 evaluation; the caller has already checked the overflow guard"""
+        array = array.reshape(array.shape[0], len(self.slots), len(self.names))
+        monomials = np.stack([
+            np.prod(array[:, :, list(m)], axis=2) for m in self.monomials
+        ], axis=2)
+        coefficients = np.asarray(self._int_coefficients, dtype=np.int64).T
+        values = np.einsum("bsc,sc->bc", monomials[:, :, self._monomial_of], coefficients)
+        constant = np.broadcast_to(np.asarray(offsets, dtype=np.int64), (array.shape[0], len(offsets)))
+        matrix = np.concatenate([constant, values], axis=1)
+        mask = ~matrix.any(axis=1)
+        return BatchResult(matrix=matrix, mask=mask, scales=scales, exact=False, keys=self.keys)
+
+    def _evaluate_python(self, charges, offsets, scales) -> BatchResult:
+        """Exact evaluation over Python ints"""
+        if np is not None and isinstance(charges, np.ndarray):
+            charges = charges.tolist()
+        matrix: List[List[int]] = []
+        mask: List[bool] = []
+        for candidate in charges:
+            rows = [[int(x) for x in v] if isinstance(v, (list, tuple)) else [int(v)]
+                    for v in candidate]
+            products = []
+            for m in self.monomials:
+                column = []
+                for row in rows:
+                    value = 1
+                    for a in m:
+                        value *= row[a]
+                    column.append(value)
+                products.append(column)
+            row = list(offsets)
+            for c, coefficient in enumerate(self._int_coefficients):
+                column = products[self._monomial_of[c]]
+                row.append(sum(w * x for w, x in zip(coefficient, column)))
+            matrix.append(row)
+            mask.append(not any(row))
+        return BatchResult(matrix=matrix, mask=mask, scales=scales, exact=True, keys=self.keys)
+
+    def candidate_count(self, numerators: Sequence[int], fixed: Optional[Mapping[str, Any]] = None,
+                        universal: Sequence[str] = ()) -> int:
+        """Number of assignments scan() enumerates (including the trivial one)"""
+        return len(numerators) ** len(self._free_slots(fixed or {}, universal))
+
+    def _free_slots(self, fixed: Mapping[str, Any], universal: Sequence[str]) -> List[List[int]]:
+        """Groups of slots that share one free charge"""
+        unknown = (set(fixed) | set(universal)) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}")
+        groups: List[List[int]] = []
+        for i, name in enumerate(self.fields):
+            if name in fixed:
+                continue
+            indices = [s for s, (j, _) in enumerate(self.slots) if j == i]
+            if name in universal:
+                groups.append(indices)
+            else:
+                groups.extend([s] for s in indices)
+        return groups
+
+    def scan(self, numerators: Sequence[int], denominator: int = 1,
+             fixed: Optional[Mapping[str, Any]] = None, universal: Sequence[str] = (),
+             batch_size: int = DEFAULT_BATCH_SIZE,
+             use_numpy: Optional[bool] = None) -> Iterator[Tuple[fractions.Fraction, ...]]:
+        """
+        Enumerate anomaly-free assignments of a single U(1)'.
+
+        Every free slot takes each charge numerator / denominator; the
+        candidates are evaluated batch_size at a time. The all-zero
+        assignment is skipped.
+
+        Args:
+            numerators: Allowed charge numerators
+            denominator: Common charge denominator
+            fixed: Field name to fixed charge(s), as accepted by assignment()
+            universal: Fields whose generations share one charge
+            batch_size: Candidates per vectorized pass
+            use_numpy: Passed to evaluate_batch()
+
+        Yields:
+            Per-slot charges of every anomaly-free assignment
+        """
+        if len(self.names) != 1:
+            raise ValueError("scan() enumerates a single U(1)' factor")
+        fixed = dict(fixed or {})
+        groups = self._free_slots(fixed, universal)
+
+        template = []
+        for value in self.assignment(fixed):
+            scaled = value * denominator
+            if scaled.denominator != 1:
+                raise ValueError(f"Fixed charge {value} is not a multiple of 1/{denominator}")
+            template.append(int(scaled))
+
+        candidates = itertools.product(numerators, repeat=len(groups))
+        while True:
+            chunk = list(itertools.islice(candidates, batch_size))
+            if not chunk:
+                return
+            batch = []
+            for values in chunk:
+                row = list(template)
+                for group, value in zip(groups, values):
+                    for s in group:
+                        row[s] = value
+                batch.append(row)
+            result = self.evaluate_batch(batch, denominator, use_numpy)
+            for i in result.hits():
+                if any(batch[i]):
+                    yield tuple(fractions.Fraction(n, denominator) for n in batch[i])
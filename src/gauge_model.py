@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+gauge_model.py
+==============
+Anomaly conditions of arbitrary product gauge groups
+SU(N_1) × ... × SU(N_m) × U(1)^k. A model is declared as a list of factors
+(for example "SU(3)_C x SU(2)_L x SU(2)_R x U(1)_B-L"); every
+perturbative condition is derived from it:
+
+- [SU(N)]³ cubic anomaly of every factor with N >= 3
+- Witten's global anomaly of every SU(2) factor (mod 2)
+- [U(1)_a][SU(N)]² for every abelian and non-abelian factor
+- [U(1)_a][U(1)_b][U(1)_c] for every multiset of abelian factors
+- [Gravity]²[U(1)_a] for every abelian factor
+
+Mixed conditions with a single non-abelian generator vanish identically
+and are not generated. Each model is compiled once into a ModelPlan: the
+conditions become (weight column, U(1) factor indices) pairs, and the
+non-abelian weights of each representation tuple are computed once, so a
+field costs one table lookup plus a few products per condition and every
+added factor adds conditions linearly.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import fractions
+import functools
+import itertools
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import AnomalyVector, Fermion, check_cancellation
+from src.group_theory import SU2, SU3, IrrepTable, RepLabel
+
+_FACTOR_PATTERN = re.compile(r"^(SU\((\d+)\)|U\(1\))(?:_(.+))?$")
+
+# Representation of one field under one factor: an irrep or a U(1) charge
+Charge = Union[RepLabel, fractions.Fraction]
+
+
+@functools.lru_cache(maxsize=None)
+def su_table(n: int) -> IrrepTable:
+    """Irrep table of SU(n), shared with group_theory for SU(2) and SU(3)"""
+    if n == 2:
+        return SU2
+    if n == 3:
+        return SU3
+    return IrrepTable(n)
+
+
+@dataclass(frozen=True)
+class GaugeFactor:
+    """
+    One factor of a product gauge group.
+
+    Attributes:
+        name: Unique label, e.g. "SU(2)_R" or "U(1)_B-L"
+        n: N of SU(N), or 1 for U(1)
+    """
+    name: str
+    n: int
+
+    @classmethod
+    def parse(cls, text: str) -> 'GaugeFactor':
+        """
+        Parse "SU(N)", "SU(N)_label", "U(1)" or "U(1)_label".
+
+        Raises:
+            ValueError: For anything else
+        """
+        text = text.strip()
+        match = _FACTOR_PATTERN.match(text)
+        if not match:
+            raise ValueError(f"Unsupported gauge factor: {text!r}")
+        n = int(match.group(2)) if match.group(2) else 1
+        if match.group(2) and n < 2:
+            raise ValueError(f"SU(N) requires N >= 2, got {text!r}")
+        return cls(text, n)
+
+    @property
+    def abelian(self) -> bool:
+        return self.n == 1
+
+    @property
+    def table(self) -> IrrepTable:
+        """Irrep table of a non-abelian factor"""
+        return su_table(self.n)
+
+
+@dataclass(frozen=True)
+class ModelField:
+    """
+    Chiral fermion of a gauge model.
+
+    Attributes:
+        name: Field identifier
+        reps: One entry per factor, in model order: an irrep label for
+            SU(N) factors, a Fraction for U(1) factors
+        chirality: +1 for left-handed, -1 for right-handed
+        generations: Number of copies
+    """
+    name: str
+    reps: Tuple[Charge, ...]
+    chirality: int = 1
+    generations: int = 1
+
+
+class ModelPlan:
+    """
+    Compiled anomaly conditions of one gauge model.
+
+    Each condition is sum over fields of chirality × generations ×
+    weight[column] × product of the U(1) charges at its abelian indices,
+    where the weight columns are products of non-abelian invariants
+    computed once per representation tuple.
+    """
+
+    def __init__(self, factors: Sequence[GaugeFactor]):
+        """
+        Derive and index every condition of the model.
+
+        Args:
+            factors: Gauge factors in model order
+        """
+        self.factors = tuple(factors)
+        nonabelian = [i for i, f in enumerate(self.factors) if not f.abelian]
+        abelian = [i for i, f in enumerate(self.factors) if f.abelian]
+        self.nonabelian = tuple(nonabelian)
+
+        # Weight columns: ("dim", None) is the non-abelian multiplicity;
+        # ("index" | "cubic" | "witten", i) replace factor i's dimension
+        # by T(R), A(R) or 2T(R)
+        columns: List[Tuple[str, Optional[int]]] = [("dim", None)]
+        conditions: List[Tuple[str, int, Tuple[int, ...], Optional[int]]] = []
+
+        def column(kind: str, i: Optional[int]) -> int:
+            if (kind, i) not in columns:
+                columns.append((kind, i))
+            return columns.index((kind, i))
+
+        for i in nonabelian:
+            f = self.factors[i]
+            if f.n >= 3:
+                conditions.append((f"[{f.name}]³", column("cubic", i), (), None))
+            else:
+                conditions.append((f"Witten {f.name}", column("witten", i), (), 2))
+        for a in abelian:
+            for i in nonabelian:
+                conditions.append((
+                    f"[{self.factors[a].name}][{self.factors[i].name}]²",
+                    column("index", i), (a,), None
+                ))
+        for triple in itertools.combinations_with_replacement(abelian, 3):
+            counts = {a: triple.count(a) for a in dict.fromkeys(triple)}
+            name = "".join(
+                f"[{self.factors[a].name}]" + ("" if c == 1 else "²" if c == 2 else "³")
+                for a, c in counts.items()
+            )
+            conditions.append((name, 0, triple, None))
+        for a in abelian:
+            conditions.append((f"[Gravity]²[{self.factors[a].name}]", 0, (a,), None))
+
+        self.columns = tuple(columns)
+        self.conditions = tuple(conditions)
+        self.keys: Tuple[str, ...] = tuple(c[0] for c in conditions)
+        self.moduli: Tuple[Optional[int], ...] = tuple(c[3] for c in conditions)
+        self._weights: Dict[Tuple[RepLabel, ...], Tuple[fractions.Fraction, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.conditions)
+
+    def rep_weights(self, reps: Tuple[RepLabel, ...]) -> Tuple[fractions.Fraction, ...]:
+        """
+        Weight columns of a tuple of non-abelian irreps (memoized).
+
+        Args:
+            reps: One irrep per non-abelian factor, in model order
+
+        Returns:
+            One value per column
+        """
+        try:
+            return self._weights[reps]
+        except KeyError:
+            pass
+        tables = [self.factors[i].table for i in self.nonabelian]
+        dims = [t.dimension(r) for t, r in zip(tables, reps)]
+        position = {i: k for k, i in enumerate(self.nonabelian)}
+        row = []
+        for kind, i in self.columns:
+            values = list(dims)
+            if kind != "dim":
+                k = position[i]
+                t, r = tables[k], reps[k]
+                values[k] = (t.index(r) if kind == "index"
+                             else t.cubic(r) if kind == "cubic" else t.index_x2(r))
+            row.append(functools.reduce(lambda x, y: x * y, values, fractions.Fraction(1)))
+        value = self._weights[reps] = tuple(row)
+        return value
+
+    def evaluate(self, fields: Sequence[ModelField]) -> AnomalyVector:
+        """
+        Every anomaly coefficient of a spectrum.
+
+        Args:
+            fields: Fields of the model
+
+        Returns:
+            AnomalyVector keyed by the derived condition names; global
+            conditions are reduced modulo their modulus
+        """
+        totals = [fractions.Fraction(0)] * len(self.conditions)
+        nonabelian = self.nonabelian
+        for f in fields:
+            row = self.rep_weights(tuple(f.reps[i] for i in nonabelian))
+            weight = f.chirality * f.generations
+            for c, (_, col, charges, _) in enumerate(self.conditions):
+                value = row[col]
+                if not value:
+                    continue
+                for a in charges:
+                    value *= f.reps[a]
+                totals[c] += weight * value
+        for c, m in enumerate(self.moduli):
+            if m is not None:
+                totals[c] = fractions.Fraction(int(totals[c]) % m)
+        return AnomalyVector.from_fractions(totals, self.keys)
+
+
+class GaugeModel:
+    """
+    Product gauge group SU(N_1) × ... × U(1)^k with derived anomaly conditions.
+    """
+
+    def __init__(self, factors: Union[str, Sequence[Union[str, GaugeFactor]]]):
+        """
+        Initialize from factor names.
+
+        Args:
+            factors: "SU(3)_C x SU(2)_L x U(1)_Y" (separated by x, × or *)
+                or a sequence of factor names / GaugeFactor objects
+        """
+        if isinstance(factors, str):
+            factors = re.split(r"\s*[x×*]\s*(?=S?U\()", factors.strip())
+        self.factors: Tuple[GaugeFactor, ...] = tuple(
+            f if isinstance(f, GaugeFactor) else GaugeFactor.parse(f) for f in factors
+        )
+        if not self.factors:
+            raise ValueError("A gauge model needs at least one factor")
+        names = [f.name for f in self.factors]
+        duplicates = {n for n in names if names.count(n) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate gauge factors: {', '.join(sorted(duplicates))}")
+        self._index = {n: i for i, n in enumerate(names)}
+        self._plan: Optional[ModelPlan] = None
+
+    @classmethod
+    def standard_model(cls) -> 'GaugeModel':
+        """SU(3)_C × SU(2)_L × U(1)_Y"""
+        return cls(["SU(3)_C", "SU(2)_L", "U(1)_Y"])
+
+    def __str__(self) -> str:
+        return " × ".join(f.name for f in self.factors)
+
+    @property
+    def plan(self) -> ModelPlan:
+        """Compiled conditions, built on first use"""
+        if self._plan is None:
+            self._plan = ModelPlan(self.factors)
+        return self._plan
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        """Names of the derived anomaly conditions"""
+        return self.plan.keys
+
+    def field(self, name: str, reps: Union[Sequence[Any], Mapping[str, Any]],
+              chirality: int = 1, generations: int = 1) -> ModelField:
+        """
+        Validated field of this model.
+
+        Args:
+            name: Field identifier
+            reps: One entry per factor in model order, or a mapping from
+                factor name to entry; omitted factors default to the
+                singlet (charge 0). U(1) charges may be strings like "-1/3".
+            chirality: +1 for left-handed, -1 for right-handed
+            generations: Number of copies
+
+        Returns:
+            ModelField with parsed charges
+        """
+        if isinstance(reps, Mapping):
+            unknown = set(reps) - set(self._index)
+            if unknown:
+                raise ValueError(f"Unknown gauge factors for {name}: {', '.join(sorted(unknown))}")
+            reps = [reps.get(f.name, 0 if f.abelian else 1) for f in self.factors]
+        if len(reps) != len(self.factors):
+            raise ValueError(f"{name}: expected {len(self.factors)} entries, got {len(reps)}")
+        parsed = []
+        for f, r in zip(self.factors, reps):
+            if f.abelian:
+                parsed.append(fractions.Fraction(str(r)))
+            elif r not in f.table:
+                raise ValueError(f"Unsupported {f.name} representation for {name}: {r}")
+            else:
+                parsed.append(r)
+        if chirality not in (1, -1):
+            raise ValueError(f"Chirality must be ±1, got {chirality}")
+        if generations < 1:
+            raise ValueError(f"Generations must be positive, got {generations}")
+        return ModelField(name, tuple(parsed), chirality, generations)
+
+    def from_fermion(self, fermion: Fermion) -> ModelField:
+        """Field of a Standard Model-like model (SU(3), SU(2), U(1) first)"""
+        return self.field(fermion.name, [fermion.su3_rep, fermion.su2_rep, fermion.hypercharge]
+                          + [1 if f.n > 1 else 0 for f in self.factors[3:]],
+                          fermion.chirality, fermion.generations)
+
+    def fields_from_dicts(self, entries: Sequence[Mapping[str, Any]]) -> List[ModelField]:
+        """
+        Fields from YAML/JSON entries {name, reps, chirality, generations}.
+
+        Args:
+            entries: Dictionaries whose "reps" is a list or a mapping by
+                factor name
+
+        Returns:
+            Parsed fields
+        """
+        return [
+            self.field(e['name'], e['reps'], e.get('chirality', 1), e.get('generations', 1))
+            for e in entries
+        ]
+
+    def anomalies(self, fields: Sequence[ModelField]) -> AnomalyVector:
+        """Anomaly coefficients of a spectrum"""
+        return self.plan.evaluate(fields)
+
+    def verify_cancellation(self, fields: Sequence[ModelField]) -> Tuple[bool, List[str]]:
+        """
+        Check if all anomalies of a spectrum cancel.
+
+        Returns:
+            Tuple of (all_cancel, list_of_non_cancelling_anomalies)
+        """
+        return check_cancellation(self.anomalies(fields))
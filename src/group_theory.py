@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+group_theory.py
+===============
+Table-driven group theory for arbitrary SU(N) irreducible representations.
+Dimensions, Dynkin indices and cubic anomaly coefficients are computed from
+Dynkin labels and memoized, and per-group IrrepTable objects map the usual
+dimension names (3, 3bar, 15, 15', ...) to Dynkin labels so that hot loops
+only perform dictionary lookups.
+
+Normalization: T(fundamental) = 1/2 and A(fundamental) = 1.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import fractions
+import functools
+import itertools
+import re
+from typing import Dict, List, Tuple, Union, Iterator
+
+DynkinLabels = Tuple[int, ...]
+RepLabel = Union[int, str]
+
+# Dimension names: digits, optional primes, optional "bar" for conjugates
+_NAME_PATTERN = re.compile(r"^(\d+)('*)(bar)?$")
+
+
+def partition(labels: DynkinLabels) -> Tuple[int, ...]:
+    """
+    Young diagram row lengths of an SU(N) irrep.
+
+    Args:
+        labels: Dynkin labels (a_1, ..., a_{N-1})
+
+    Returns:
+        Row lengths (l_1, ..., l_N) with l_N = 0
+    """
+    rows = [0]
+    for a in reversed(labels):
+        rows.append(rows[-1] + a)
+    return tuple(reversed(rows))
+
+
+def _dimension_of_partition(rows: Tuple[int, ...]) -> int:
+    """Weyl dimension formula in Young diagram coordinates"""
+    n = len(rows)
+    num = den = 1
+    for i, j in itertools.combinations(range(n), 2):
+        num *= rows[i] - rows[j] + j - i
+        den *= j - i
+    return num // den
+
+
+@functools.lru_cache(maxsize=None)
+def irrep_dimension(labels: DynkinLabels) -> int:
+    """
+    Dimension of the SU(N) irrep with the given Dynkin labels.
+
+    Args:
+        labels: Dynkin labels (a_1, ..., a_{N-1})
+
+    Returns:
+        Dimension of the representation
+    """
+    return _dimension_of_partition(partition(labels))
+
+
+@functools.lru_cache(maxsize=None)
+def quadratic_casimir(labels: DynkinLabels) -> fractions.Fraction:
+    """
+    Quadratic Casimir C_2(R), normalized so that C_2(fund) = (N² - 1) / 2N.
+
+    Args:
+        labels: Dynkin labels (a_1, ..., a_{N-1})
+
+    Returns:
+        Quadratic Casimir as a fraction
+    """
+    rows = partition(labels)
+    n = len(rows)
+    boxes = sum(rows)
+    total = (sum(l * l for l in rows)
+             - fractions.Fraction(boxes * boxes, n)
+             + sum(l * (n + 1 - 2 * (i + 1)) for i, l in enumerate(rows)))
+    return total / 2
+
+
+@functools.lru_cache(maxsize=None)
+def dynkin_index(labels: DynkinLabels) -> fractions.Fraction:
+    """
+    Dynkin index T(R) = dim(R) C_2(R) / dim(G), with T(fund) = 1/2.
+
+    Args:
+        labels: Dynkin labels (a_1, ..., a_{N-1})
+
+    Returns:
+        Dynkin index as a fraction
+    """
+    n = len(labels) + 1
+    return irrep_dimension(labels) * quadratic_casimir(labels) / (n * n - 1)
+
+
+def _interlacing(rows: Tuple[int, ...]) -> Iterator[Tuple[int, ...]]:
+    """GL(N-1) diagrams obtained by removing a horizontal strip from rows"""
+    ranges = [range(rows[i + 1], rows[i] + 1) for i in range(len(rows) - 1)]
+    return itertools.product(*ranges)
+
+
+def _cubic_trace(rows: Tuple[int, ...]) -> fractions.Fraction:
+    """
+    tr_R(H³) for H = diag(1, 0, ..., 0) - 1/N.
+
+    Under GL(N) ⊃ GL(1) × GL(N-1) every weight with first component k comes
+    from a diagram nu interlacing rows with |rows| - |nu| = k, and there are
+    dim(nu) of them.
+    """
+    n = len(rows)
+    boxes = sum(rows)
+    shift = fractions.Fraction(boxes, n)
+    total = fractions.Fraction(0)
+    for nu in _interlacing(rows):
+        k = boxes - sum(nu)
+        total += _dimension_of_partition(nu) * (k - shift) ** 3
+    return total
+
+
+@functools.lru_cache(maxsize=None)
+def cubic_anomaly(labels: DynkinLabels) -> int:
+    """
+    Cubic anomaly coefficient A(R), normalized to A(fund) = 1.
+
+    A(R) vanishes for real representations and for every SU(2) irrep, and
+    changes sign under conjugation.
+
+    Args:
+        labels: Dynkin labels (a_1, ..., a_{N-1})
+
+    Returns:
+        Cubic anomaly coefficient (always an integer)
+    """
+    n = len(labels) + 1
+    if n < 3:
+        return 0
+    fundamental = fractions.Fraction((n - 1) * (n - 2), n * n)
+    value = _cubic_trace(partition(labels)) / fundamental
+    if value.denominator != 1:
+        raise ArithmeticError(f"Non-integral cubic anomaly for {labels}: {value}")
+    return value.numerator
+
+
+def conjugate(labels: DynkinLabels) -> DynkinLabels:
+    """Dynkin labels of the conjugate representation"""
+    return tuple(reversed(labels))
+
+
+class IrrepTable:
+    """
+    Name and invariant tables for the irreps of one SU(N) group.
+
+    Irreps up to max_dimension are enumerated once and named following the
+    usual conventions: the dimension, primes to distinguish inequivalent
+    irreps of equal dimension (ordered by Dynkin index), and a "bar" suffix
+    for conjugates. Plain ints name the unprimed, unbarred irrep of that
+    dimension. Invariants are cached per label, so lookups in hot loops are
+    single dictionary accesses.
+    """
+
+    def __init__(self, n: int, max_dimension: int = 100):
+        """
+        Build the table for SU(n).
+
+        Args:
+            n: Rank + 1 of the group (n >= 2)
+            max_dimension: Largest irrep dimension to enumerate
+        """
+        if n < 2:
+            raise ValueError(f"SU(N) requires N >= 2, got {n}")
+        self.n = n
+        self.max_dimension = max_dimension
+        self._labels: Dict[RepLabel, DynkinLabels] = {}
+        self._names: Dict[DynkinLabels, str] = {}
+        self._dimension: Dict[RepLabel, int] = {}
+        self._index: Dict[RepLabel, fractions.Fraction] = {}
+        self._index_x2: Dict[RepLabel, int] = {}
+        self._cubic: Dict[RepLabel, int] = {}
+        self._build()
+
+    def _enumerate(self) -> List[DynkinLabels]:
+        """All Dynkin labels with dimension <= max_dimension"""
+        found: List[DynkinLabels] = []
+
+        def extend(prefix: List[int]) -> None:
+            if len(prefix) == self.n - 1:
+                found.append(tuple(prefix))
+                return
+            a = 0
+            while True:
+                # Dimension grows with every label, so completing the
+                # prefix with zeros gives the smallest candidate
+                trial = tuple(prefix + [a] + [0] * (self.n - 2 - len(prefix)))
+                if irrep_dimension(trial) > self.max_dimension:
+                    break
+                extend(prefix + [a])
+                a += 1
+
+        extend([])
+        return found
+
+    def _build(self) -> None:
+        """Assign names to every enumerated irrep"""
+        by_dimension: Dict[int, List[DynkinLabels]] = {}
+        for labels in self._enumerate():
+            by_dimension.setdefault(irrep_dimension(labels), []).append(labels)
+
+        for dim, members in by_dimension.items():
+            # One representative per conjugate pair
+            unbarred = sorted(
+                {max(labels, conjugate(labels)) for labels in members},
+                key=lambda labels: (dynkin_index(labels), [-a for a in labels])
+            )
+            for primes, labels in enumerate(unbarred):
+                name = str(dim) + "'" * primes
+                self._register(name, labels)
+                if conjugate(labels) != labels:
+                    self._register(name + "bar", conjugate(labels))
+                if primes == 0:
+                    self._labels[dim] = labels
+
+    def _register(self, name: str, labels: DynkinLabels) -> None:
+        self._labels[name] = labels
+        self._names[labels] = name
+
+    def resolve(self, label: RepLabel) -> DynkinLabels:
+        """
+        Dynkin labels for a representation name.
+
+        Args:
+            label: Dimension (int) or name such as "15'", "3bar" or "10"
+
+        Returns:
+            Dynkin labels of the irrep
+
+        Raises:
+            ValueError: If no SU(N) irrep has that name
+        """
+        try:
+            return self._labels[label]
+        except (KeyError, TypeError):
+            pass
+        if isinstance(label, str):
+            match = _NAME_PATTERN.match(label.strip())
+            if match and not match.group(2) and not match.group(3):
+                if int(match.group(1)) in self._labels:
+                    return self._labels[int(match.group(1))]
+        raise ValueError(f"Unsupported SU({self.n}) representation: {label}")
+
+    def name(self, labels: DynkinLabels) -> str:
+        """Conventional name of the irrep with the given Dynkin labels"""
+        try:
+            return self._names[tuple(labels)]
+        except KeyError:
+            raise ValueError(f"Irrep {labels} of SU({self.n}) is beyond the table")
+
+    def __contains__(self, label: RepLabel) -> bool:
+        try:
+            self.resolve(label)
+        except ValueError:
+            return False
+        return True
+
+    def names(self) -> List[str]:
+        """All named irreps, ordered by dimension"""
+        return sorted(self._names.values(),
+                      key=lambda name: (irrep_dimension(self._labels[name]), name))
+
+    def dimension(self, label: RepLabel) -> int:
+        """Dimension of a named irrep"""
+        try:
+            return self._dimension[label]
+        except KeyError:
+            value = self._dimension[label] = irrep_dimension(self.resolve(label))
+            return value
+
+    def index(self, label: RepLabel) -> fractions.Fraction:
+        """Dynkin index T(R) of a named irrep"""
+        try:
+            return self._index[label]
+        except KeyError:
+            value = self._index[label] = dynkin_index(self.resolve(label))
+            return value
+
+    def index_x2(self, label: RepLabel) -> int:
+        """Twice the Dynkin index, which is always an integer"""
+        try:
+            return self._index_x2[label]
+        except KeyError:
+            value = self._index_x2[label] = int(2 * self.index(label))
+            return value
+
+    def cubic(self, label: RepLabel) -> int:
+        """Cubic anomaly coefficient A(R) of a named irrep"""
+        try:
+            return self._cubic[label]
+        except KeyError:
+            value = self._cubic[label] = cubic_anomaly(self.resolve(label))
+            return value
+
+
+SU2 = IrrepTable(2, max_dimension=100)
+SU3 = IrrepTable(3, max_dimension=100)
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+gut_branching.py
+================
+Branching of grand-unified multiplets into Standard Model fields.
+SU(5) irreps are decomposed under SU(3) × SU(2) × U(1)_Y from their weight
+systems, so every SU(5) irrep is supported. SO(10) and E6 irreps branch
+through SO(10) ⊃ SU(5) × U(1) and E6 ⊃ SO(10) × U(1) rules, tabulated for
+the irreps used in model building and extensible with register_branching.
+
+Decompositions are memoized in the process, so scans over GUT multiplets
+compute each one once, and optionally in a JSON file on disk given by a
+path or $ANOMALY_BRANCHING_CACHE, so later runs reuse them. Entries are keyed by the
+rules they were derived from, so a rule replaced with register_branching
+never returns a stale decomposition.
+
+Convention: 5 = (3, 1)_{-1/3} + (1, 2)_{1/2}, so 10 contains Q_L and
+5bar contains L_L; all components are left-handed. Multiplets with real
+SU(3) components (the 8 in a 24, ...) need the '[SU(3)]³ cubic' condition,
+since the legacy [SU(3)]³ index sum does not vanish for them.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import argparse
+import contextlib
+import fractions
+import functools
+import hashlib
+import itertools
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import AnomalyChecker, Fermion, Conditions, check_many
+from src.anomaly_conditions import ANOMALY_KEYS
+from src.group_theory import SU3, IrrepTable, RepLabel, partition
+
+# Environment variable naming the default persistent decomposition cache
+BRANCHING_CACHE_ENV = "ANOMALY_BRANCHING_CACHE"
+
+# Bump when the conventions of stored decompositions change
+BRANCHING_VERSION = 2
+
+GUT_GROUPS = ("SU(5)", "SO(10)", "E6")
+
+# Standard conditions with the true SU(3) cubic anomaly, plus Witten's
+GUT_CONDITIONS = tuple(
+    '[SU(3)]³ cubic' if key == '[SU(3)]³' else key for key in ANOMALY_KEYS
+) + ('Witten SU(2)',)
+
+# (su3_rep, su2_rep, hypercharge, multiplicity)
+Component = Tuple[RepLabel, int, fractions.Fraction, int]
+
+# Maximal-subgroup rules: irrep -> irreps of the next group in the chain.
+# SU(5) names follow group_theory (45 = (1,0,1,0)); the SO(10) content is
+# fixed by 16 = 10 + 5bar + 1 through 16 × 16 = 10 + 120 + 126 and
+# 16 × 10 = 16bar + 144
+BRANCHING_RULES: Dict[str, Dict[str, Tuple[str, Tuple[str, ...]]]] = {
+    "SO(10)": {
+        "1": ("SU(5)", ("1",)),
+        "10": ("SU(5)", ("5", "5bar")),
+        "16": ("SU(5)", ("10", "5bar", "1")),
+        "16bar": ("SU(5)", ("10bar", "5", "1")),
+        "45": ("SU(5)", ("24", "10", "10bar", "1")),
+        "54": ("SU(5)", ("15", "15bar", "24")),
+        "120": ("SU(5)", ("5", "5bar", "10", "10bar", "45", "45bar")),
+        "126": ("SU(5)", ("1", "5bar", "10", "15bar", "45bar", "50")),
+        "126bar": ("SU(5)", ("1", "5", "10bar", "15", "45", "50bar")),
+        "144": ("SU(5)", ("5", "5bar", "10bar", "15bar", "24", "40", "45bar")),
+        "144bar": ("SU(5)", ("5bar", "5", "10", "15", "24", "40bar", "45")),
+        "210": ("SU(5)", ("1", "5", "5bar", "10", "10bar", "24", "40", "40bar", "75")),
+    },
+    "E6": {
+        "1": ("SO(10)", ("1",)),
+        "27": ("SO(10)", ("16", "10", "1")),
+        "27bar": ("SO(10)", ("16bar", "10", "1")),
+        "78": ("SO(10)", ("45", "16", "16bar", "1")),
+    },
+}
+
+
+def normalize_irrep(name: Union[int, str]) -> str:
+    """
+    Canonical irrep name: "5̄", "5¯", "5b" and "5bar" all become "5bar".
+
+    Args:
+        name: Dimension or irrep name
+
+    Returns:
+        Name in group_theory conventions
+    """
+    text = str(name).strip().replace("\u0304", "bar").replace("\u00af", "bar")
+    if text.endswith("b") and not text.endswith("bar"):
+        text += "ar"
+    return text
+
+
+def register_branching(group: str, irrep: str, subgroup: str,
+                       content: Sequence[str]) -> None:
+    """
+    Add or replace a branching rule.
+
+    Decompositions cached from an earlier rule, including those of irreps
+    that branch through it, are not reused (see rule_fingerprint).
+
+    Args:
+        group: "SO(10)" or "E6" (or a new group name)
+        irrep: Irrep of group
+        subgroup: Group of the content ("SU(5)", "SO(10)" or another
+            registered group)
+        content: Irreps of subgroup, repeated for multiplicity
+    """
+    if subgroup != "SU(5)" and subgroup not in BRANCHING_RULES:
+        raise ValueError(f"Unknown subgroup: {subgroup}")
+    BRANCHING_RULES.setdefault(group, {})[normalize_irrep(irrep)] = (
+        subgroup, tuple(normalize_irrep(r) for r in content)
+    )
+
+
+def rule_fingerprint(group: str, irrep: str) -> str:
+    """
+    Digest of the rules a decomposition is derived from.
+
+    Covers the rule for irrep and, recursively, the rules of every irrep
+    it branches into, so replacing an SO(10) rule also changes the
+    fingerprint of the E6 irreps that branch through it. SU(5) irreps are
+    computed from their weights and have an empty fingerprint.
+
+    Args:
+        group: GUT group
+        irrep: Normalized irrep name
+
+    Returns:
+        Hex digest, or "" for SU(5) and irreps without a rule
+    """
+    rule = BRANCHING_RULES.get(group, {}).get(irrep)
+    if rule is None:
+        return ""
+    subgroup, content = rule
+    text = json.dumps([subgroup, content, [rule_fingerprint(subgroup, r) for r in content]])
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def su5_table() -> IrrepTable:
+    """Irrep names of SU(5)"""
+    return IrrepTable(5, max_dimension=400)
+
+
+def _gelfand_tsetlin(rows: Tuple[int, ...]) -> Iterator[Tuple[int, ...]]:
+    """Weights of the GL(N) irrep with Young diagram rows, with multiplicity"""
+    if len(rows) == 1:
+        yield rows
+        return
+    total = sum(rows)
+    for nu in itertools.product(*(range(rows[i + 1], rows[i] + 1) for i in range(len(rows) - 1))):
+        for weight in _gelfand_tsetlin(nu):
+            yield weight + (total - sum(nu),)
+
+
+@functools.lru_cache(maxsize=None)
+def _weights(rows: Tuple[int, ...]) -> Tuple[Tuple[int, ...], ...]:
+    return tuple(_gelfand_tsetlin(rows))
+
+
+def branch_su5(irrep: Union[int, str]) -> List[Component]:
+    """
+    Standard Model content of an SU(5) irrep.
+
+    The weights of the irrep are split into SU(3) and SU(2) parts and
+    peeled into irreducible pieces, highest weight first.
+
+    Args:
+        irrep: SU(5) irrep name such as "5bar", "10" or "45"
+
+    Returns:
+        Components (su3_rep, su2_rep, hypercharge, multiplicity), sorted
+    """
+    rows = partition(su5_table().resolve(normalize_irrep(irrep)))
+    remaining = Counter((w[:3], w[3:]) for w in _weights(rows))
+    found: Counter = Counter()
+    while remaining:
+        # The lexicographically highest weight is a highest weight of
+        # SU(3) × SU(2)
+        mu, nu = max(remaining)
+        count = remaining[mu, nu]
+        for a in _weights(mu):
+            for b in _weights(nu):
+                remaining[a, b] -= count
+                if not remaining[a, b]:
+                    del remaining[a, b]
+        su3 = SU3.name((mu[0] - mu[1], mu[1] - mu[2]))
+        su3_rep = int(su3) if su3.isdigit() else su3
+        hypercharge = fractions.Fraction(-sum(mu), 3) + fractions.Fraction(sum(nu), 2)
+        found[su3_rep, nu[0] - nu[1] + 1, hypercharge] += count
+    return sorted(((*key, n) for key, n in found.items()), key=_component_order)
+
+
+def _component_order(c: Component) -> tuple:
+    return (str(c[0]), c[1], c[2])
+
+
+def _encode(components: List[Component]) -> list:
+    return [[su3, su2, str(y), n] for su3, su2, y, n in components]
+
+
+def _decode(entries: list) -> List[Component]:
+    return [(su3, su2, fractions.Fraction(y), n) for su3, su2, y, n in entries]
+
+
+class BranchingEngine:
+    """
+    Memoized decompositions of GUT irreps into Standard Model fields.
+    """
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None,
+                 persist: bool = True):
+        """
+        Initialize the engine and load stored decompositions.
+
+        Args:
+            cache_path: JSON cache file (default: $ANOMALY_BRANCHING_CACHE;
+                without either, decompositions are kept in memory only)
+            persist: Read and write the cache file
+        """
+        cache_path = cache_path or os.environ.get(BRANCHING_CACHE_ENV)
+        self.cache_path: Optional[Path] = Path(cache_path) if persist and cache_path else None
+        self._memo: Dict[str, List[Component]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._dirty = False
+        self._batch_depth = 0
+        self._load()
+
+    def _load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != BRANCHING_VERSION:
+            return
+        for key, entries in data.get('decompositions', {}).items():
+            self._memo[key] = _decode(entries)
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator['BranchingEngine']:
+        """Defer writing the cache file to the end of the outermost batch"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the cache atomically if it changed; an unwritable cache is not an error"""
+        if self.cache_path is None or not self._dirty:
+            return
+        self._dirty = False
+        data = {
+            'version': BRANCHING_VERSION,
+            'decompositions': {k: _encode(v) for k, v in sorted(self._memo.items())},
+        }
+        tmp = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+            self.writes += 1
+        except OSError:
+            pass
+
+    def decompose(self, group: str, irrep: Union[int, str]) -> List[Component]:
+        """
+        Standard Model content of a GUT irrep.
+
+        Args:
+            group: One of GUT_GROUPS
+            irrep: Irrep name, e.g. "5̄", "10", "16" or "27"
+
+        Returns:
+            Components (su3_rep, su2_rep, hypercharge, multiplicity), sorted
+
+        Raises:
+            ValueError: For unknown groups or irreps without a rule
+        """
+        irrep = normalize_irrep(irrep)
+        fingerprint = rule_fingerprint(group, irrep)
+        key = f"{group}:{irrep}@{fingerprint}" if fingerprint else f"{group}:{irrep}"
+        if key in self._memo:
+            self.hits += 1
+            return self._memo[key]
+        self.misses += 1
+        # The sub-decompositions of a miss are written in one go
+        with self.batch():
+            components = self._compute(group, irrep)
+            self._memo[key] = components
+            self._dirty = True
+        return components
+
+    def _compute(self, group: str, irrep: str) -> List[Component]:
+        if group == "SU(5)":
+            return branch_su5(irrep)
+        if group not in BRANCHING_RULES:
+            raise ValueError(f"Unsupported GUT group: {group}")
+        try:
+            subgroup, content = BRANCHING_RULES[group][irrep]
+        except KeyError:
+            raise ValueError(f"No branching rule for the {irrep} of {group}")
+        total: Counter = Counter()
+        for sub in content:
+            for su3, su2, y, n in self.decompose(subgroup, sub):
+                total[su3, su2, y] += n
+        return sorted(((*key, n) for key, n in total.items()), key=_component_order)
+
+    def dimension(self, group: str, irrep: Union[int, str]) -> int:
+        """Dimension of a GUT irrep, from its decomposition"""
+        return sum(SU3.dimension(su3) * su2 * n for su3, su2, _, n in self.decompose(group, irrep))
+
+    def fermions(self, group: str, irrep: Union[int, str], name: Optional[str] = None,
+                 chirality: int = 1, generations: int = 1) -> List[Fermion]:
+        """
+        Fermions of one GUT multiplet.
+
+        Args:
+            group: One of GUT_GROUPS
+            irrep: Irrep name
+            name: Prefix of the field names (default: the irrep)
+            chirality: Chirality of the whole multiplet
+            generations: Copies of the multiplet
+
+        Returns:
+            One Fermion per distinct component; multiplicities are folded
+            into generations. Components in barred SU(3) irreps are written
+            as the opposite-chirality field in the conjugate irrep with
+            opposite hypercharge (u_R rather than u^c), the convention of
+            the standard model spectrum and of the legacy [SU(3)]³ condition.
+        """
+        prefix = name or normalize_irrep(irrep)
+        result = []
+        for su3, su2, y, n in self.decompose(group, irrep):
+            chi = chirality
+            if isinstance(su3, str) and su3.endswith("bar"):
+                su3 = su3[:-3]
+                su3 = int(su3) if su3.isdigit() else su3
+                y, chi = -y, -chi
+            result.append(Fermion(
+                name=f"{prefix}_{su3}{su2}_{y}",
+                su3_rep=su3,
+                su2_rep=su2,
+                hypercharge=y,
+                chirality=chi,
+                generations=generations * n
+            ))
+        return result
+
+    def expand(self, entries: Iterable[Dict]) -> List[Dict]:
+        """
+        Replace GUT multiplet entries of a JSON spectrum by their fields.
+
+        Entries with a "gut" key, e.g. {"gut": "SO(10)", "irrep": "16",
+        "generations": 3}, are expanded; other entries are kept as they are.
+
+        Args:
+            entries: Fermion dictionaries as in scan templates
+
+        Returns:
+            Fermion dictionaries
+        """
+        result = []
+        with self.batch():
+            for entry in entries:
+                if 'gut' not in entry:
+                    result.append(entry)
+                    continue
+                for f in self.fermions(entry['gut'], entry['irrep'], entry.get('name'),
+                                       entry.get('chirality', 1), entry.get('generations', 1)):
+                    result.append({
+                        'name': f.name,
+                        'su3_rep': f.su3_rep,
+                        'su2_rep': f.su2_rep,
+                        'hypercharge': str(f.hypercharge),
+                        'chirality': f.chirality,
+                        'generations': f.generations
+                    })
+        return result
+
+    def statistics(self) -> dict:
+        """Cache counters as a JSON-serializable dictionary"""
+        return {
+            'cached': len(self._memo),
+            'hits': self.hits,
+            'misses': self.misses,
+            'writes': self.writes,
+            'path': str(self.cache_path) if self.cache_path else None,
+        }
+
+
+_default_engine: Optional[BranchingEngine] = None
+
+
+def default_engine() -> BranchingEngine:
+    """Process-wide branching engine, backed by $ANOMALY_BRANCHING_CACHE if set"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = BranchingEngine()
+    return _default_engine
+
+
+def scan_multiplets(group: str, irreps: Sequence[Union[int, str]], max_multiplets: int = 3,
+                    base: Sequence[Fermion] = (), conditions: Conditions = GUT_CONDITIONS,
+                    engine: Optional[BranchingEngine] = None) -> List[Tuple[str, ...]]:
+    """
+    Anomaly-free combinations of GUT multiplets.
+
+    Every multiset of up to max_multiplets irreps (left-handed) is added to
+    base; the combinations share their prefixes in check_many.
+
+    Args:
+        group: One of GUT_GROUPS
+        irreps: Irreps to combine
+        max_multiplets: Largest number of multiplets per combination
+        base: Fields every spectrum contains
+        conditions: Condition names or plan (default: GUT_CONDITIONS)
+        engine: Branching engine (default: the process-wide one)
+
+    Returns:
+        Anomaly-free combinations as tuples of irrep names
+    """
+    engine = engine or default_engine()
+    irreps = [normalize_irrep(r) for r in irreps]
+    with engine.batch():
+        fields = {r: engine.fermions(group, r) for r in irreps}
+    combos = [
+        combo
+        for size in range(1, max_multiplets + 1)
+        for combo in itertools.combinations_with_replacement(irreps, size)
+    ]
+    spectra = (list(base) + [f for r in combo for f in fields[r]] for combo in combos)
+    vectors = check_many(spectra, conditions)
+    return [combo for combo, v in zip(combos, vectors) if v.is_zero()]
+
+
+def main():
+    """Print GUT decompositions or scan multiplet combinations."""
+    parser = argparse.ArgumentParser(
+        description="Decompose GUT irreps into Standard Model fields"
+    )
+    parser.add_argument("group", choices=GUT_GROUPS, help="Unified group")
+    parser.add_argument("irreps", nargs="+", help="Irreps, e.g. 5bar 10 or 16")
+    parser.add_argument("--scan", type=int, default=None, metavar="N",
+                        help="List anomaly-free combinations of up to N multiplets")
+    parser.add_argument("--cache", default=None,
+                        help=f"Decomposition cache file (default: ${BRANCHING_CACHE_ENV}, "
+                             f"if set; otherwise nothing is written)")
+    args = parser.parse_args()
+
+    engine = BranchingEngine(args.cache)
+    if args.scan is not None:
+        for combo in scan_multiplets(args.group, args.irreps, args.scan, engine=engine):
+            print(" + ".join(combo))
+        return
+
+    with engine.batch():
+        for irrep in args.irreps:
+            components = engine.decompose(args.group, irrep)
+            print(f"{args.group} {normalize_irrep(irrep)} "
+                  f"(dimension {engine.dimension(args.group, irrep)}):")
+            for su3, su2, y, n in components:
+                print(f"  {n} × ({su3}, {su2})_{y}" if n > 1 else f"  ({su3}, {su2})_{y}")
+            checker = AnomalyChecker(engine.fermions(args.group, irrep), conditions=GUT_CONDITIONS)
+            anomalous = [k for k, v in checker.compute_anomalies().items() if v]
+            print(f"  anomalous: {', '.join(anomalous)}" if anomalous else "  anomaly-free")
+
+
+if __name__ == "__main__":
+    main()
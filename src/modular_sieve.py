@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+modular_sieve.py
+================
+Modular pre-filter for candidate additions to a fixed base spectrum.
+Over a common hypercharge denominator every anomaly condition becomes an
+integer sum, and an anomaly-free candidate makes each sum vanish, hence
+also vanish modulo any prime. The sieve evaluates the sums modulo a few
+small primes, where every intermediate value is a small machine int, and
+rejects a candidate as soon as one residue is non-zero. Only survivors
+need the exact check, so the sieve never loses a hit.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import math
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import BaseContext
+from src.batch_evaluator import base_offsets
+
+# Largest primes below 2^15: residue products stay below 2^30
+DEFAULT_PRIMES = (32749, 32719)
+
+
+class ModularSieve:
+    """
+    Reject candidates whose scaled anomaly sums are non-zero modulo a prime.
+
+    A candidate with hypercharges n / D contributes, to each integer
+    accumulator of the plan, sum(weight × chirality × generations × n^p);
+    the scaled total of a condition is offset + lift × sum (see
+    batch_evaluator.base_offsets). Global (modular) conditions are
+    checked modulo their own modulus instead. Residue tables are built per
+    denominator, so grids with a fixed denominator reuse one table.
+    """
+
+    def __init__(self, context: BaseContext, primes: Sequence[int] = DEFAULT_PRIMES):
+        """
+        Initialize for one base spectrum.
+
+        Args:
+            context: Compiled base spectrum and anomaly conditions
+            primes: Moduli of the sieve, tried in order
+        """
+        if not primes:
+            raise ValueError("The sieve needs at least one prime")
+        self.context = context
+        self.plan = context.plan
+        self.primes = tuple(primes)
+        self.passed = 0
+        self.rejected = 0
+        # Per denominator: (modulus, offset, lift, integer column) per check
+        self._checks: Dict[int, List[Tuple[int, int, int, int]]] = {}
+        self._weights: Dict[Tuple, Tuple[int, ...]] = {}
+
+    def _checks_for(self, denominator: int) -> List[Tuple[int, int, int, int]]:
+        """Residue checks for one denominator, in evaluation order"""
+        try:
+            return self._checks[denominator]
+        except KeyError:
+            pass
+        plan = self.plan
+        offsets, lifts, _ = base_offsets(self.context.vector, denominator, plan)
+        checks = []
+        for p in self.primes:
+            for i, m in enumerate(plan.moduli):
+                if m is None:
+                    checks.append((p, offsets[i] % p, lifts[i] % p, plan.int_column_of[i]))
+        for i, m in enumerate(plan.moduli):
+            if m is not None:
+                checks.append((m, offsets[i] % m, lifts[i] % m, plan.int_column_of[i]))
+        value = self._checks[denominator] = checks
+        return value
+
+    def _accumulate(self, extra: Sequence, denominator: int, modulus: int) -> List[int]:
+        """Integer accumulators of the candidate modulo one modulus"""
+        plan = self.plan
+        acc = [0] * len(plan.int_columns)
+        for f in extra:
+            key = (f.su3_rep, f.su2_rep, modulus)
+            try:
+                rep = self._weights[key]
+            except KeyError:
+                rep = self._weights[key] = tuple(
+                    w % modulus for w in plan.int_weights(f.su3_rep, f.su2_rep)
+                )
+            y = f.hypercharge
+            if denominator % y.denominator:
+                raise ValueError(f"Hypercharge {y} is not on the 1/{denominator} grid")
+            n = y.numerator * (denominator // y.denominator) % modulus
+            powers = [f.chirality * f.generations % modulus]
+            for _ in range(plan.max_power):
+                powers.append(powers[-1] * n % modulus)
+            for j, (_, p, _) in enumerate(plan.int_columns):
+                acc[j] = (acc[j] + rep[j] * powers[p]) % modulus
+        return acc
+
+    def check(self, extra: Iterable, denominator: Optional[int] = None) -> bool:
+        """
+        False if base + extra is certainly not anomaly-free.
+
+        Args:
+            extra: Added fields
+            denominator: Common hypercharge denominator of the grid
+                (default: the least common denominator of extra)
+
+        Returns:
+            True if the candidate survives and needs the exact check
+        """
+        extra = list(extra)
+        if denominator is None:
+            denominator = 1
+            for f in extra:
+                d = f.hypercharge.denominator
+                if denominator % d:
+                    denominator = denominator * d // math.gcd(denominator, d)
+
+        accumulators: Dict[int, List[int]] = {}
+        for modulus, offset, lift, column in self._checks_for(denominator):
+            acc = accumulators.get(modulus)
+            if acc is None:
+                acc = accumulators[modulus] = self._accumulate(extra, denominator, modulus)
+            if (offset + lift * acc[column]) % modulus:
+                self.rejected += 1
+                return False
+        self.passed += 1
+        return True
+
+    def statistics(self) -> dict:
+        """Pass / reject counters as a JSON-serializable dictionary"""
+        total = self.passed + self.rejected
+        return {
+            'primes': list(self.primes),
+            'passed': self.passed,
+            'rejected': self.rejected,
+            'rejection_rate': self.rejected / total if total else 0.0,
+        }
@@ -17,28 +17,71 @@ import argparse
 import sys
 import hashlib
 import os
+import time
+import functools
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Union
 from dataclasses import dataclass, asdict
-from copy import deepcopy
 
 # Add parent directory to path for anomaly_checker import
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
-    from src.anomaly_checker import Fermion, AnomalyChecker
+    from src.anomaly_checker import (
+        Fermion, FermionType, AnomalyVector, BaseContext,
+        EarlyExitVerifier, Spectrum, cancels_by_symmetry
+    )
+    from src.anomaly_cache import AnomalyCache, default_cache, configure_default_cache
+    from src.batch_evaluator import (
+        evaluate_batch, hypercharge_grid, base_offsets, select_engine, ENGINE_CHOICES
+    )
+    from src.contribution_table import ContributionTable, STANDARD_REPS, DEFAULT_K_MAX
+    from src.modular_sieve import ModularSieve
+    from src.parametric import ParametricChecker, SymbolicFermion
+    from src.gut_branching import default_engine as default_branching
 except ImportError:
     print("Error: anomaly_checker.py not found. Please ensure it's in the parent directory.")
     sys.exit(1)
 
 
+def fermion_to_dict(f: Fermion) -> Dict:
+    """JSON-serializable form of a fermion, as used in templates and results"""
+    return {
+        'name': f.name,
+        'su3_rep': f.su3_rep,
+        'su2_rep': f.su2_rep,
+        'hypercharge': str(f.hypercharge),
+        'chirality': f.chirality,
+        'generations': f.generations
+    }
+
+
 @dataclass
 class ScanResult:
     """Container for scan results"""
     spectrum: List[Fermion]
-    anomalies: Dict[str, fractions.Fraction]
+    anomalies: AnomalyVector
     is_anomaly_free: bool
     description: str
+    # Values of the symbol y for a parametric family (spectrum uses "y")
+    family: Optional[Dict[str, List[fractions.Fraction]]] = None
+
+
+# Scanner backends: the AnomalyChecker engines, the batch evaluator and
+# "auto", which picks a backend per block from the grid size
+SCANNER_ENGINES = ENGINE_CHOICES
+
+
+def _timed(method):
+    """Add the running time of a scan block to the scanner's scan_seconds"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.scan_seconds += time.perf_counter() - start
+    return wrapper
 
 
 class ParameterSpaceScanner:
@@ -46,19 +89,71 @@ class ParameterSpaceScanner:
     Scanner for systematically exploring fermion parameter space.
     """
     
-    def __init__(self, base_spectrum: List[Dict], scan_config: Dict):
+    def __init__(self, base_spectrum: Union[List[Dict], Spectrum], scan_config: Dict,
+                 engine: str = "reference", cache: Optional[AnomalyCache] = None,
+                 sieve: bool = False, table: Optional[Union[str, Path]] = None,
+                 parametric: bool = False, off_grid: bool = False,
+                 families: Optional[bool] = None):
         """
         Initialize scanner with base spectrum and configuration.
         
         Args:
-            base_spectrum: List of fermion dictionaries from JSON
+            base_spectrum: List of fermion dictionaries from JSON, or a
+                Spectrum (one entry per distinct field type). Entries with a
+                "gut" key name a GUT multiplet (see gut_branching) and are
+                expanded into its Standard Model fields.
             scan_config: Configuration for parameter variations
+            engine: Evaluation backend, one of SCANNER_ENGINES. "vector"
+                feeds whole hypercharge grids through the batch evaluator;
+                "auto" decides per block (see batch_evaluator.select_engine).
+            cache: Anomaly cache for candidate spectra (default: the
+                process-wide cache shared by all scanners)
+            sieve: Reject candidates modulo small primes before the cache
+                and exact checks (see modular_sieve)
+            table: Contribution table file for the k/6 grid, mapped (and
+                built or extended if it does not cover the scanned grid) on
+                the first candidate
+            parametric: Solve Block A and Block C once per representation
+                with a symbolic hypercharge instead of testing every grid
+                value (see parametric)
+            off_grid: Report every Block A root within abs_max, at any
+                denominator, instead of the k/6 grid points only; implies
+                parametric
+            families: Report candidates that cancel by symmetry (Block B
+                pairs, Block C (1, 2)_{±y} pairs) as one parametric family
+                per representation instead of one result per grid value
+                (default: scan_config "families", else True)
         """
+        if engine not in SCANNER_ENGINES:
+            raise ValueError(f"Unknown scanner engine: {engine}")
+        if isinstance(base_spectrum, Spectrum):
+            base_spectrum = [fermion_to_dict(f) for f in base_spectrum.fermions()]
+        elif any('gut' in f for f in base_spectrum):
+            base_spectrum = default_branching().expand(base_spectrum)
         self.base_spectrum = base_spectrum
         self.scan_config = scan_config
+        self.engine = engine
+        self.cache = cache if cache is not None else default_cache()
         self.results = []
         self.anomaly_free_models = []
         self.block_a_hits = []  # Store single fermion additions that work
+        self.scan_seconds = 0.0
+        # Configurations evaluated per backend ("table" for table lookups)
+        self.engines_used: Dict[str, int] = {}
+        self._base_context: Optional[BaseContext] = None
+        self._verifier: Optional[EarlyExitVerifier] = None
+        self.sieve: Optional[ModularSieve] = None
+        self._use_sieve = sieve
+        self.table_path = table
+        self.table: Optional[ContributionTable] = None
+        self._table_offsets: Optional[Tuple] = None
+        # Largest |k| the table must cover, raised by each scanned grid
+        self.table_k_max = DEFAULT_K_MAX
+        self.off_grid = off_grid or self.scan_config.get('off_grid', False)
+        self.parametric = (parametric or self.off_grid
+                           or self.scan_config.get('parametric', False))
+        self.families = (families if families is not None
+                         else self.scan_config.get('families', True))
         
         # Create results directory if it doesn't exist
         os.makedirs('results', exist_ok=True)
@@ -80,39 +175,228 @@ class ParameterSpaceScanner:
             generations=fdict.get('generations', 1)
         )
     
-    def dump_result(self, spectrum: List[Fermion], tag: str) -> None:
+    @property
+    def base_context(self) -> BaseContext:
+        """Base spectrum compiled once for delta evaluation of candidates"""
+        if self._base_context is None:
+            base = [self.create_fermion_from_dict(f) for f in self.base_spectrum]
+            engine = self.engine if self.engine in ("reference", "integer") else "integer"
+            # Optional list of registered anomaly conditions to enforce
+            conditions = self.scan_config.get('anomaly_conditions')
+            self._base_context = BaseContext(base, engine, conditions)
+        return self._base_context
+    
+    @property
+    def verifier(self) -> EarlyExitVerifier:
+        """Adaptive early-exit filter shared by all blocks of this scanner"""
+        if self._verifier is None:
+            self._verifier = EarlyExitVerifier(self.base_context)
+        return self._verifier
+    
+    @property
+    def modular_sieve(self) -> Optional[ModularSieve]:
+        """Modular pre-filter, if enabled"""
+        if self._use_sieve and self.sieve is None:
+            self.sieve = ModularSieve(self.base_context)
+        return self.sieve
+    
+    @property
+    def contribution_table(self) -> Optional[ContributionTable]:
+        """Memory-mapped contribution table, if enabled"""
+        if self.table_path is not None and self.table is None:
+            plan = self.base_context.plan
+            reps = list(STANDARD_REPS) + list(itertools.product(
+                self.generate_su3_representations(), self.generate_su2_representations()
+            ))
+            self.table = ContributionTable.load_or_build(
+                self.table_path, plan, 6, self.table_k_max, reps=reps
+            )
+            self._table_offsets = base_offsets(self.base_context.vector, self.table.denominator, plan)
+        return self.table
+    
+    def _cover_grid(self, hypercharges: List[fractions.Fraction]) -> None:
+        """Make the contribution table, if enabled, cover these k/6 values"""
+        k_max = max((abs(6 * Y) for Y in hypercharges if (6 * Y).denominator == 1), default=0)
+        if k_max > self.table_k_max:
+            self.table_k_max = int(k_max)
+            if self.table is not None:
+                # Remapped (and extended on disk) on the next candidate
+                self.table.close()
+                self.table = None
+    
+    def _use_vector(self, batch_size: int, fields_per_row: int) -> bool:
+        """Whether a block of batch_size candidates goes through the batch evaluator"""
+        if select_engine(self.engine, fields_per_row, batch_size) != "vector":
+            return False
+        self._count("vector", batch_size)
+        return True
+    
+    def _count(self, engine: str, n: int = 1) -> None:
+        self.engines_used[engine] = self.engines_used.get(engine, 0) + n
+    
+    @property
+    def tested_configurations_count(self) -> int:
+        """Number of candidate configurations evaluated so far"""
+        return sum(self.engines_used.values())
+    
+    def statistics(self) -> dict:
+        """Engine and throughput of the scan as a JSON-serializable dictionary"""
+        tested = self.tested_configurations_count
+        return {
+            'engine': self.engine,
+            'engines_used': dict(self.engines_used),
+            'configurations_tested': tested,
+            'scan_seconds': self.scan_seconds,
+            'configurations_per_second': tested / self.scan_seconds if self.scan_seconds else 0.0,
+        }
+    
+    def _table_verdict(self, delta: List[int]) -> Optional[AnomalyVector]:
+        """Verdict for a candidate whose scaled contributions came from the table"""
+        plan = self.table.plan
+        offsets, lifts, _ = self._table_offsets
+        for i, m in enumerate(plan.moduli):
+            total = offsets[i] + lifts[i] * delta[i]
+            if m is not None:
+                total %= m * lifts[i]
+            if total:
+                return None
+        return AnomalyVector.zero(plan.keys)
+    
+    def _parametric_hypercharges(self, extra: List[SymbolicFermion],
+                                 abs_max: Optional[float] = None) -> Optional[set]:
+        """
+        Hypercharges y for which base + extra is anomaly-free.
+        
+        Args:
+            extra: Added fields whose hypercharges depend on the symbol y
+            abs_max: Only return solutions with |y| <= abs_max
+            
+        Returns:
+            Set of solutions, or None if every value of y works
+        """
+        self._count("parametric")
+        # The base enters as its (constant) anomaly deficit
+        checker = ParametricChecker(
+            extra, self.base_context.plan, base=self.base_context.vector
+        )
+        bounds = None
+        if abs_max is not None:
+            limit = fractions.Fraction(abs_max).limit_denominator()
+            bounds = (-limit, limit)
+        solutions = checker.solve(bounds)
+        if {} in solutions:
+            return None
+        return {s['y'] for s in solutions}
+    
+    def _evaluate_candidate(self, extra: Union[List[Fermion], Spectrum]) -> Optional[AnomalyVector]:
+        """
+        Anomaly vector of base + extra, or None if it is not anomaly-free.
+        
+        Results are memoized by the enforced conditions, a digest of the
+        base and the canonical signature of extra, so candidates seen before
+        (in any block, or by another scanner with the same base and
+        conditions) are not re-evaluated. New candidates are rejected by the
+        early-exit verifier, usually after a single condition; the full
+        vector is computed only for hits. Candidates on the contribution
+        table are decided by table reads alone, and with the modular sieve
+        enabled most other misses are rejected before the signature is
+        even computed. Candidates that cancel among themselves by symmetry
+        are decided by the base alone.
+        """
+        if cancels_by_symmetry(extra, self.base_context.plan):
+            return self._neutral_verdict()
+        context = self.base_context
+        table = self.contribution_table
+        if table is not None:
+            delta = table.delta(extra)
+            if delta is not None:
+                self._count("table")
+                return self._table_verdict(delta)
+        self._count(context.engine)
+        sieve = self.modular_sieve
+        if sieve is not None and not sieve.check(extra):
+            return None
+        
+        def evaluate() -> Optional[AnomalyVector]:
+            if not self.verifier.check(extra):
+                return None
+            return context.evaluate(extra)
+        
+        # A verdict only holds for the conditions it was checked against
+        return self.cache.lookup(("candidate",) + context.cache_key(extra), evaluate)
+    
+    def _neutral_verdict(self) -> Optional[AnomalyVector]:
+        """
+        Verdict for a candidate whose fields cancel among themselves.
+        
+        Such a candidate leaves every anomaly of the base unchanged, so
+        base + candidate is anomaly-free exactly when the base is.
+        """
+        self._count("structural")
+        vector = self.base_context.vector
+        return vector if vector.is_zero() else None
+    
+    def _report_family(self, family: List[SymbolicFermion],
+                       values: List[fractions.Fraction], tag: str,
+                       description: str) -> ScanResult:
+        """
+        Record base + family as a single anomaly-free result.
+        
+        Args:
+            family: Added fields with the symbolic hypercharge y
+            values: Scanned values of y, all anomaly-free
+            tag: Human-readable tag for the file
+            description: Description without the values of y
+            
+        Returns:
+            The recorded ScanResult
+        """
+        spectrum = list(self.base_context.base) + family
+        self.dump_result(spectrum, tag, family={'y': values})
+        result = ScanResult(
+            spectrum=spectrum,
+            anomalies=self.base_context.vector,
+            is_anomaly_free=True,
+            description=f"{description}, y ∈ {{{', '.join(str(v) for v in values)}}}",
+            family={'y': values}
+        )
+        self.anomaly_free_models.append(result)
+        return result
+    
+    def dump_result(self, spectrum: List[Fermion], tag: str,
+                    family: Optional[Dict[str, List[fractions.Fraction]]] = None) -> None:
         """
         Save anomaly-free spectrum to JSON file with SHA1-based naming.
         
+        The hash depends only on the fields' quantum numbers, not on their
+        order or names, so the same spectrum always maps to the same file.
+        
         Args:
             spectrum: List of Fermion objects
             tag: Human-readable tag for the file
+            family: Values of the symbols in a parametric spectrum
         """
         # Convert spectrum to JSON-serializable format
-        spec_json = []
-        for f in spectrum:
-            fdict = {
-                'name': f.name,
-                'su3_rep': f.su3_rep,
-                'su2_rep': f.su2_rep,
-                'hypercharge': str(f.hypercharge),
-                'chirality': f.chirality,
-                'generations': f.generations
-            }
-            spec_json.append(fdict)
+        spec_json = [fermion_to_dict(f) for f in spectrum]
         
         # Create SHA1 hash of the spectrum
-        spec_str = json.dumps(spec_json, sort_keys=True)
-        h = hashlib.sha1(spec_str.encode()).hexdigest()[:10]
+        entries = sorted(
+            json.dumps({k: v for k, v in fdict.items() if k != 'name'}, sort_keys=True)
+            for fdict in spec_json
+        )
+        h = hashlib.sha1("\n".join(entries).encode()).hexdigest()[:10]
         
         # Save to file
+        data = {
+            'tag': tag,
+            'is_anomaly_free': True,
+            'fermions': spec_json
+        }
+        if family is not None:
+            data['family'] = {k: [str(v) for v in vs] for k, vs in family.items()}
         path = f"results/{tag}_{h}.json"
         with open(path, "w") as f:
-            json.dump({
-                'tag': tag,
-                'is_anomaly_free': True,
-                'fermions': spec_json
-            }, f, indent=2)
+            json.dump(data, f, indent=2)
     
     def generate_hypercharge_values(self, hyper_max: Optional[int] = None) -> List[fractions.Fraction]:
         """Generate rational hypercharge values to scan"""
@@ -175,6 +459,7 @@ class ParameterSpaceScanner:
         else:
             return [1, 2, 3]  # Standard representations
     
+    @_timed
     def scan_single_additions(self, hyper_max: Optional[int] = None) -> List[ScanResult]:
         """
         Block A: Scan single fermion additions to the base spectrum.
@@ -186,7 +471,8 @@ class ParameterSpaceScanner:
             List of ScanResult objects
         """
         results = []
-        base = [self.create_fermion_from_dict(f) for f in self.base_spectrum]
+        context = self.base_context
+        base = context.base
         
         # Define the representation combinations to scan
         # [(1,1), (1,2), (1,3), (3,1), (3,2), (6,1), (8,1)]
@@ -201,46 +487,112 @@ class ParameterSpaceScanner:
         # Get absolute Y max from config, default to 1.0 for Block A
         abs_y_max = self.scan_config.get('hypercharge', {}).get('abs_max', 1.0)
         
+        # Grid values beyond abs_max are never visited, however large k_max
+        k_bound = min(k_max, int(6 * abs_y_max) + 1)
+        
+        def k_points(su3, su2, chiralities):
+            """Grid points of one representation in scan order: k, then chirality"""
+            return [
+                (su3, su2, k, chi)
+                for k in range(-k_bound, k_bound + 1)
+                if abs(float(fractions.Fraction(k, 6))) <= abs_y_max
+                for chi in chiralities
+            ]
+        
+        batch = None
+        hits = None
+        if self.parametric:
+            # One exact solve per (representation, chirality) replaces the k loop
+            hits = {
+                (su3, su2, chi): self._parametric_hypercharges(
+                    [SymbolicFermion("X", su3, su2, "y", chi)], abs_y_max
+                )
+                for su3, su2 in rep_combinations
+                for chi in (1, -1)
+            }
+        
+        if self.off_grid:
+            # Only the roots are visited (k = 6Y may be fractional); grid
+            # points are built only for a (representation, chirality) for
+            # which every Y works, so the cost does not depend on hyper_max
+            grid = [
+                g
+                for su3, su2 in rep_combinations
+                for g in k_points(su3, su2, [chi for chi in (1, -1) if hits[su3, su2, chi] is None])
+            ]
+            for su3, su2 in rep_combinations:
+                roots = set()
+                for chi in (1, -1):
+                    roots |= hits[su3, su2, chi] or set()
+                grid += [
+                    (su3, su2, 6 * Y, chi)
+                    for Y in sorted(roots)
+                    for chi in (1, -1)
+                    if hits[su3, su2, chi] is not None and Y in hits[su3, su2, chi]
+                ]
+        else:
+            # Enumerate the grid in scan order: reps, then k, then chirality
+            grid = [g for su3, su2 in rep_combinations for g in k_points(su3, su2, (1, -1))]
+            if hits is None:
+                self._cover_grid([fractions.Fraction(g[2], 6) for g in grid])
+            if hits is None and self._use_vector(len(grid), 1):
+                batch = evaluate_batch(
+                    [g[0] for g in grid], [g[1] for g in grid],
+                    [g[2] for g in grid], [g[3] for g in grid],
+                    denominator=6, base=context.vector, plan=context.plan
+                )
+        
         count = 0
-        for su3, su2 in rep_combinations:
-            for k in range(-k_max, k_max + 1):
-                Y = fractions.Fraction(k, 6)
-                if abs(float(Y)) > abs_y_max:
+        for i, (su3, su2, k, chi) in enumerate(grid):
+            Y = fractions.Fraction(k, 6)
+            chi_str = "L" if chi == 1 else "R"
+            # Off-grid hypercharges are labelled by numerator and denominator
+            label = k if Y.denominator in (1, 2, 3, 6) else f"{Y.numerator}_{Y.denominator}"
+            
+            if hits is not None:
+                solutions = hits[su3, su2, chi]
+                if solutions is not None and Y not in solutions:
                     continue
-                    
-                for chi in (1, -1):
-                    # Create fermion with proper name upfront
-                    chi_str = "L" if chi == 1 else "R"
-                    F = Fermion(f"X_{su3}{su2}_{k}_{chi_str}", su3, su2, Y, chi)
-                    test_spectrum = base + [F]
-                    
-                    checker = AnomalyChecker(test_spectrum)
-                    all_cancel, failures = checker.verify_cancellation()
-                    
-                    if all_cancel:
-                        # Save the successful single fermion (make a copy to avoid mutation issues)
-                        self.block_a_hits.append(deepcopy(F))
-                        
-                        # Save to file
-                        tag = f"single_{su3}{su2}_{k}_{chi}"
-                        self.dump_result(test_spectrum, tag)
-                        
-                        # Create result object
-                        desc = f"Single fermion: ({su3}, {su2})_{Y} × {chi}"
-                        result = ScanResult(
-                            spectrum=test_spectrum,
-                            anomalies=checker.compute_anomalies(),
-                            is_anomaly_free=True,
-                            description=desc
-                        )
-                        
-                        results.append(result)
-                        self.anomaly_free_models.append(result)
-                        count += 1
+                F = FermionType.unchecked(f"X_{su3}{su2}_{label}_{chi_str}", su3, su2, Y, chi)
+                anomalies = context.evaluate([F])
+            elif batch is not None:
+                if not batch.mask[i]:
+                    continue
+                F = FermionType.unchecked(f"X_{su3}{su2}_{label}_{chi_str}", su3, su2, Y, chi)
+                anomalies = batch.vector(i)
+            else:
+                # Create fermion with proper name upfront
+                F = FermionType.unchecked(f"X_{su3}{su2}_{label}_{chi_str}", su3, su2, Y, chi)
+                anomalies = self._evaluate_candidate([F])
+                if anomalies is None:
+                    continue
+            
+            test_spectrum = base + [F]
+            
+            # Save the successful single fermion (immutable, so no copy needed)
+            self.block_a_hits.append(F)
+            
+            # Save to file
+            tag = f"single_{su3}{su2}_{label}_{chi}"
+            self.dump_result(test_spectrum, tag)
+            
+            # Create result object
+            desc = f"Single fermion: ({su3}, {su2})_{Y} × {chi}"
+            result = ScanResult(
+                spectrum=test_spectrum,
+                anomalies=anomalies,
+                is_anomaly_free=True,
+                description=desc
+            )
+            
+            results.append(result)
+            self.anomaly_free_models.append(result)
+            count += 1
         
         print(f"Block A: Found {count} anomaly-free single fermion additions")
         return results
     
+    @_timed
     def scan_vector_like_pairs(self, use_block_a: bool = False, hyper_max: Optional[int] = None) -> List[ScanResult]:
         """
         Block B: Scan for vector-like fermion pairs that preserve anomaly cancellation.
@@ -250,14 +602,13 @@ class ParameterSpaceScanner:
             hyper_max: Maximum k value for Y = k/6 grid
         """
         results = []
-        base_spectrum_fermions = [
-            self.create_fermion_from_dict(f) for f in self.base_spectrum
-        ]
+        context = self.base_context
+        base_spectrum_fermions = context.base
         
         if use_block_a and self.block_a_hits:
             # Use Block A results as seeds
             for F in self.block_a_hits:
-                Fbar = Fermion(
+                Fbar = FermionType.unchecked(
                     name=F.name + "bar",
                     su3_rep=F.su3_rep,
                     su2_rep=F.su2_rep,
@@ -265,15 +616,13 @@ class ParameterSpaceScanner:
                     chirality=-F.chirality
                 )
                 
-                # Create test spectrum
-                test_spectrum = base_spectrum_fermions + [F, Fbar]
-                
-                # Check anomalies
-                checker = AnomalyChecker(test_spectrum)
-                anomalies = checker.compute_anomalies()
-                all_cancel, failures = checker.verify_cancellation()
+                # Check anomalies of base + pair through the pair's delta
+                anomalies = self._evaluate_candidate([F, Fbar])
+                all_cancel = anomalies is not None
                 
                 if all_cancel:
+                    test_spectrum = base_spectrum_fermions + [F, Fbar]
+                    
                     # Save to file
                     tag = f"vector_like_{F.su3_rep}{F.su2_rep}_{F.hypercharge.numerator}_{F.hypercharge.denominator}"
                     self.dump_result(test_spectrum, tag)
@@ -294,34 +643,53 @@ class ParameterSpaceScanner:
             hypercharges = self.generate_hypercharge_values(hyper_max)
             su3_reps = self.generate_su3_representations()
             su2_reps = self.generate_su2_representations()
+            self._cover_grid(hypercharges)
             
-            for Y, su3, su2 in itertools.product(hypercharges, su3_reps, su2_reps):
-                # Create vector-like pair
-                left_fermion = Fermion(
-                    name=f"X_L",
-                    su3_rep=su3,
-                    su2_rep=su2,
-                    hypercharge=Y,
-                    chirality=1
-                )
-                
-                right_fermion = Fermion(
-                    name=f"X_R",
-                    su3_rep=su3,
-                    su2_rep=su2,
-                    hypercharge=Y,
-                    chirality=-1
+            grid = list(itertools.product(hypercharges, su3_reps, su2_reps))
+            pairs = [
+                (FermionType.unchecked("X_L", su3, su2, Y, 1),
+                 FermionType.unchecked("X_R", su3, su2, Y, -1))
+                for Y, su3, su2 in grid
+            ]
+            
+            # X_L / X_R cancel by symmetry: classified without evaluation
+            neutral = [cancels_by_symmetry(pair, context.plan) for pair in pairs]
+            rows = [i for i, n in enumerate(neutral) if not n]
+            
+            batch = None
+            if rows and self._use_vector(len(rows), 2):
+                # Each row is one (X_L, X_R) pair over the common denominator
+                numerators, denominator = hypercharge_grid([grid[i][0] for i in rows])
+                batch = evaluate_batch(
+                    [(grid[i][1],) * 2 for i in rows],
+                    [(grid[i][2],) * 2 for i in rows],
+                    [(n, n) for n in numerators],
+                    [(1, -1)] * len(rows),
+                    denominator=denominator, base=context.vector,
+                    plan=context.plan
                 )
+                batch_row = {i: r for r, i in enumerate(rows)}
+            
+            families: Dict[Tuple, List[fractions.Fraction]] = {}
+            for i, (Y, su3, su2) in enumerate(grid):
+                left_fermion, right_fermion = pairs[i]
                 
-                # Create test spectrum
-                test_spectrum = base_spectrum_fermions + [left_fermion, right_fermion]
-                
-                # Check anomalies
-                checker = AnomalyChecker(test_spectrum)
-                anomalies = checker.compute_anomalies()
-                all_cancel, failures = checker.verify_cancellation()
+                if neutral[i]:
+                    anomalies = self._neutral_verdict()
+                    if anomalies is not None and self.families:
+                        families.setdefault((su3, su2), []).append(Y)
+                        continue
+                elif batch is not None:
+                    r = batch_row[i]
+                    anomalies = batch.vector(r) if batch.mask[r] else None
+                else:
+                    # Check anomalies of base + pair through the pair's delta
+                    anomalies = self._evaluate_candidate([left_fermion, right_fermion])
+                all_cancel = anomalies is not None
                 
                 if all_cancel:
+                    test_spectrum = base_spectrum_fermions + [left_fermion, right_fermion]
+                    
                     # Save to file
                     tag = f"vector_like_{su3}{su2}_{Y.numerator}_{Y.denominator}"
                     self.dump_result(test_spectrum, tag)
@@ -337,34 +705,64 @@ class ParameterSpaceScanner:
                     
                     results.append(result)
                     self.anomaly_free_models.append(result)
+            
+            # One parametric family per representation instead of one file per Y
+            for (su3, su2), values in families.items():
+                family = [SymbolicFermion("X_L", su3, su2, "y", 1),
+                          SymbolicFermion("X_R", su3, su2, "y", -1)]
+                result = self._report_family(
+                    family, values, f"vector_like_family_{su3}{su2}",
+                    f"Vector-like family: ({su3}, {su2})_y"
+                )
+                results.append(result)
         
         return results
     
+    @_timed
     def scan_chiral_pairs(self) -> List[ScanResult]:
         """
         Block C: Scan for Higgsino-style chiral fermion pairs.
         Restricted to (su3=1, su2=2, chi=+1) with Y in {1/2, 1, 3/2}.
         """
         results = []
-        base_spectrum_fermions = [
-            self.create_fermion_from_dict(f) for f in self.base_spectrum
-        ]
+        context = self.base_context
+        base_spectrum_fermions = context.base
+        
+        solutions = None
+        solved = False
+        family_values = []
         
         # Higgsino-specific hypercharges
         for Y in [fractions.Fraction(1, 2), fractions.Fraction(1), fractions.Fraction(3, 2)]:
             # Create Higgsino-style pair
-            F1 = Fermion("Hu", su3_rep=1, su2_rep=2, hypercharge=Y, chirality=1)
-            F2 = Fermion("Hd", su3_rep=1, su2_rep=2, hypercharge=-Y, chirality=1)
-            
-            # Create test spectrum
-            test_spectrum = base_spectrum_fermions + [F1, F2]
+            F1 = FermionType.unchecked("Hu", su3_rep=1, su2_rep=2, hypercharge=Y, chirality=1)
+            F2 = FermionType.unchecked("Hd", su3_rep=1, su2_rep=2, hypercharge=-Y, chirality=1)
             
-            # Check anomalies
-            checker = AnomalyChecker(test_spectrum)
-            anomalies = checker.compute_anomalies()
-            all_cancel, failures = checker.verify_cancellation()
+            if cancels_by_symmetry([F1, F2], context.plan):
+                # (1, 2)_{+Y} and (1, 2)_{-Y} cancel for every Y
+                anomalies = self._neutral_verdict()
+                if anomalies is not None and self.families:
+                    family_values.append(Y)
+                    continue
+            elif self.parametric:
+                if not solved:
+                    # Hu(y) + Hd(-y) solved once for all hypercharges
+                    solutions = self._parametric_hypercharges([
+                        SymbolicFermion("Hu", 1, 2, "y", 1),
+                        SymbolicFermion("Hd", 1, 2, "-y", 1),
+                    ])
+                    solved = True
+                anomalies = None
+                if solutions is None or Y in solutions:
+                    anomalies = context.evaluate([F1, F2])
+            else:
+                # Check anomalies of base + pair through the pair's delta
+                anomalies = self._evaluate_candidate([F1, F2])
+            all_cancel = anomalies is not None
             
             if all_cancel:
+                test_spectrum = base_spectrum_fermions + [F1, F2]
+                
                 # Save to file
                 tag = f"higgsino_{Y.numerator}_{Y.denominator}"
                 self.dump_result(test_spectrum, tag)
@@ -381,6 +779,12 @@ class ParameterSpaceScanner:
                 results.append(result)
                 self.anomaly_free_models.append(result)
         
+        if family_values:
+            family = [SymbolicFermion("Hu", 1, 2, "y", 1), SymbolicFermion("Hd", 1, 2, "-y", 1)]
+            results.append(self._report_family(
+                family, family_values, "higgsino_family", "Chiral pair: (1, 2)_[+y, -y]"
+            ))
+        
         return results
     
     def run_comprehensive_scan(self, hyper_max: Optional[int] = None, limit: Optional[int] = None) -> None:
@@ -504,24 +908,32 @@ class ParameterSpaceScanner:
         # Check for standard vector-like lepton (Block B)
         vl_lepton = next((m for m in self.anomaly_free_models 
                           if "Vector-like" in m.description and 
-                          "(1, 2)_-1/2" in m.description), None)
+                          ("(1, 2)_-1/2" in m.description or
+                           self._in_family(m, "(1, 2)_y", fractions.Fraction(-1, 2)))), None)
         if vl_lepton:
             print("✓ Found vector-like lepton doublet: (1, 2)_-1/2")
         
         # Check for MSSM Higgsinos (Block C)
         higgsinos = next((m for m in self.anomaly_free_models 
                          if "Chiral pair:" in m.description and 
-                         "(1, 2)_[+1/2, -1/2]" in m.description), None)
+                         ("(1, 2)_[+1/2, -1/2]" in m.description or
+                          self._in_family(m, "(1, 2)_[+y, -y]", fractions.Fraction(1, 2)))), None)
         if higgsinos:
             print("✓ Found MSSM Higgsino pair: (1, 2)_[+1/2, -1/2]")
         
         # Check for vector-like quark (Block B)
         vl_quark = next((m for m in self.anomaly_free_models 
                         if "Vector-like" in m.description and 
-                        "(3, 2)_1/6" in m.description), None)
+                        ("(3, 2)_1/6" in m.description or
+                         self._in_family(m, "(3, 2)_y", fractions.Fraction(1, 6)))), None)
         if vl_quark:
             print("✓ Found vector-like quark doublet: (3, 2)_1/6")
     
+    @staticmethod
+    def _in_family(model: ScanResult, fields: str, y: fractions.Fraction) -> bool:
+        """Whether model is a family with the given fields that contains y"""
+        return model.family is not None and fields in model.description and y in model.family['y']
+    
     def export_results(self, filename: str) -> None:
         """
         Export anomaly-free models to JSON file.
@@ -529,6 +941,7 @@ class ParameterSpaceScanner:
         export_data = {
             "scan_config": self.scan_config,
             "base_spectrum": self.base_spectrum,
+            "scan_statistics": self.statistics(),
             "anomaly_free_models": []
         }
         
@@ -559,6 +972,10 @@ class ParameterSpaceScanner:
                 ],
                 "is_anomaly_free": True
             }
+            if model.family is not None:
+                model_data["family"] = {
+                    k: [str(v) for v in vs] for k, vs in model.family.items()
+                }
             export_data["anomaly_free_models"].append(model_data)
         
         with open(filename, 'w') as f:
@@ -605,6 +1022,62 @@ def main():
         help="Maximum number of anomaly-free models to find before stopping"
     )
     
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=None,
+        help="Maximum number of cached anomaly evaluations (0 disables caching)"
+    )
+    
+    parser.add_argument(
+        "--cache-db",
+        default=None,
+        help="SQLite file for persistent anomaly results (default: $ANOMALY_CACHE_DB, if set)"
+    )
+    
+    parser.add_argument(
+        "--engine",
+        choices=SCANNER_ENGINES,
+        default="reference",
+        help="Evaluation backend; auto picks one per block from the grid size "
+             "and NumPy availability (default: reference)"
+    )
+    
+    parser.add_argument(
+        "--sieve",
+        action="store_true",
+        help="Pre-filter candidates modulo small primes before exact checks"
+    )
+    
+    parser.add_argument(
+        "--table",
+        default=None,
+        help="Contribution table file for the k/6 grid (built on first use if missing)"
+    )
+    
+    parser.add_argument(
+        "--parametric",
+        action="store_true",
+        help="Solve Blocks A and C exactly with a symbolic hypercharge instead of grid tests"
+    )
+    
+    parser.add_argument(
+        "--off-grid",
+        action="store_true",
+        help="With the exact Block A solve, report hypercharges at any denominator "
+             "within abs_max, independent of --hyper-max (implies --parametric)"
+    )
+    
+    parser.add_argument(
+        "--no-families",
+        dest="families",
+        action="store_const",
+        const=False,
+        default=None,
+        help="Report pairs that cancel by symmetry as one model per hypercharge "
+             "instead of one family per representation"
+    )
+    
     parser.add_argument(
         "--quick",
         action="store_true",
@@ -640,16 +1113,33 @@ def main():
     if 'hypercharge' not in scan_config:
         scan_config['hypercharge'] = {'use_k_over_6': True}
     
+    cache = configure_default_cache(args.cache_size, args.cache_db)
+    
     # Create and run scanner
-    scanner = ParameterSpaceScanner(base_spectrum, scan_config)
-    scanner.run_comprehensive_scan(hyper_max=args.hyper_max, limit=args.limit)
+    scanner = ParameterSpaceScanner(base_spectrum, scan_config, engine=args.engine,
+                                    cache=cache, sieve=args.sieve, table=args.table,
+                                    parametric=args.parametric, off_grid=args.off_grid,
+                                    families=args.families)
+    try:
+        scanner.run_comprehensive_scan(hyper_max=args.hyper_max, limit=args.limit)
+    finally:
+        cache.close()
+        if scanner.table is not None:
+            scanner.table.close()
     scanner.print_anomaly_free_models(max_display=args.max_display)
     
     # Export results
     if scanner.anomaly_free_models:
         scanner.export_results(args.output)
     
+    info = scanner.cache.cache_info()
     print("\nScan complete!")
+    print(f"Anomaly cache: {info.hits} hits, {info.misses} misses, {info.evictions} evictions")
+    if scanner.sieve is not None:
+        print(f"Modular sieve: {scanner.sieve.passed} passed, {scanner.sieve.rejected} rejected")
+    stats = scanner.statistics()
+    print(f"Engine: {stats['engine']} ({stats['configurations_tested']} configurations, "
+          f"{stats['configurations_per_second']:.0f}/s)")
     print(f"Individual model files saved in: results/")
 
 
@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""
+parametric.py
+=============
+Anomaly conditions of spectra with symbolic hypercharges. Fields may carry
+charges such as Y = a or Y = -a + 1/2; every anomaly condition of the
+spectrum is then an exact polynomial with rational coefficients in the
+symbols. A small exact solver (rational roots of univariate polynomials,
+resultants to eliminate further symbols) returns every rational solution
+within bounds, so one solve replaces a whole hypercharge grid scan.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import ast
+import fractions
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.anomaly_checker import Fermion, Conditions, _resolve_plan
+from src.group_theory import SU2, SU3
+
+# A monomial is a sorted tuple of (symbol, exponent) pairs; () is 1
+Monomial = Tuple[Tuple[str, int], ...]
+Number = Union[int, fractions.Fraction]
+Bounds = Union[None, Tuple[Number, Number], Mapping[str, Tuple[Number, Number]]]
+
+
+def _multiply_monomials(a: Monomial, b: Monomial) -> Monomial:
+    powers = dict(a)
+    for name, exp in b:
+        powers[name] = powers.get(name, 0) + exp
+    return tuple(sorted(powers.items()))
+
+
+class Polynomial:
+    """
+    Immutable multivariate polynomial with Fraction coefficients.
+    """
+
+    __slots__ = ('terms',)
+
+    def __init__(self, terms: Optional[Mapping[Monomial, Number]] = None):
+        """
+        Initialize from a monomial -> coefficient mapping.
+
+        Args:
+            terms: Coefficients keyed by monomial; zeros are dropped
+        """
+        self.terms: Dict[Monomial, fractions.Fraction] = {
+            m: fractions.Fraction(c) for m, c in (terms or {}).items() if c
+        }
+
+    @classmethod
+    def symbol(cls, name: str) -> 'Polynomial':
+        """The polynomial consisting of one symbol"""
+        if not name.isidentifier():
+            raise ValueError(f"Invalid symbol name: {name!r}")
+        return cls({((name, 1),): 1})
+
+    @classmethod
+    def constant(cls, value: Number) -> 'Polynomial':
+        """A constant polynomial"""
+        return cls({(): value})
+
+    @staticmethod
+    def _coerce(other) -> 'Polynomial':
+        if isinstance(other, Polynomial):
+            return other
+        if isinstance(other, (int, fractions.Fraction)):
+            return Polynomial.constant(other)
+        return NotImplemented
+
+    def __add__(self, other) -> 'Polynomial':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        terms = dict(self.terms)
+        for m, c in other.terms.items():
+            terms[m] = terms.get(m, 0) + c
+        return Polynomial(terms)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> 'Polynomial':
+        return Polynomial({m: -c for m, c in self.terms.items()})
+
+    def __sub__(self, other) -> 'Polynomial':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        return self + (-other)
+
+    def __rsub__(self, other) -> 'Polynomial':
+        return (-self) + other
+
+    def __mul__(self, other) -> 'Polynomial':
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return other
+        terms: Dict[Monomial, fractions.Fraction] = {}
+        for m1, c1 in self.terms.items():
+            for m2, c2 in other.terms.items():
+                m = _multiply_monomials(m1, m2)
+                terms[m] = terms.get(m, 0) + c1 * c2
+        return Polynomial(terms)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other) -> 'Polynomial':
+        value = self._coerce(other)
+        if value is NotImplemented:
+            return value
+        divisor = value.constant_value()
+        if divisor is None:
+            raise ValueError("Polynomials can only be divided by constants")
+        if divisor == 0:
+            raise ZeroDivisionError("Polynomial division by zero")
+        return Polynomial({m: c / divisor for m, c in self.terms.items()})
+
+    def __pow__(self, exponent: int) -> 'Polynomial':
+        if not isinstance(exponent, int) or exponent < 0:
+            raise ValueError(f"Exponent must be a non-negative integer, got {exponent}")
+        result = Polynomial.constant(1)
+        base = self
+        while exponent:
+            if exponent & 1:
+                result = result * base
+            base = base * base
+            exponent >>= 1
+        return result
+
+    def __eq__(self, other) -> bool:
+        other = self._coerce(other)
+        if other is NotImplemented:
+            return False
+        return self.terms == other.terms
+
+    def __hash__(self) -> int:
+        return hash(frozenset(self.terms.items()))
+
+    def is_zero(self) -> bool:
+        return not self.terms
+
+    def constant_value(self) -> Optional[fractions.Fraction]:
+        """The value if the polynomial is constant, else None"""
+        if not self.terms:
+            return fractions.Fraction(0)
+        if len(self.terms) == 1 and () in self.terms:
+            return self.terms[()]
+        return None
+
+    def variables(self) -> List[str]:
+        """Symbols occurring in the polynomial, sorted"""
+        return sorted({name for m in self.terms for name, _ in m})
+
+    def degree(self, name: str) -> int:
+        """Degree in one symbol (0 if absent)"""
+        return max((dict(m).get(name, 0) for m in self.terms), default=0)
+
+    def coefficients(self, name: str) -> List['Polynomial']:
+        """
+        Coefficients as a polynomial in one symbol.
+
+        Returns:
+            List c with self = sum(c[k] × name^k)
+        """
+        result = [dict() for _ in range(self.degree(name) + 1)]
+        for m, c in self.terms.items():
+            powers = dict(m)
+            k = powers.pop(name, 0)
+            result[k][tuple(sorted(powers.items()))] = c
+        return [Polynomial(t) for t in result]
+
+    def substitute(self, values: Mapping[str, Union[Number, 'Polynomial']]) -> 'Polynomial':
+        """
+        Replace symbols by numbers or polynomials.
+
+        Args:
+            values: Symbol -> value; other symbols are kept
+
+        Returns:
+            The substituted polynomial
+        """
+        result = Polynomial()
+        for m, c in self.terms.items():
+            term = Polynomial.constant(c)
+            kept = []
+            for name, exp in m:
+                if name in values:
+                    term = term * Polynomial._coerce(values[name]) ** exp
+                else:
+                    kept.append((name, exp))
+            result = result + term * Polynomial({tuple(kept): 1})
+        return result
+
+    def evaluate(self, values: Mapping[str, Number]) -> fractions.Fraction:
+        """Value at a point; every symbol must be given"""
+        value = self.substitute(values).constant_value()
+        if value is None:
+            missing = set(self.variables()) - set(values)
+            raise ValueError(f"No value for {', '.join(sorted(missing))}")
+        return value
+
+    def __str__(self) -> str:
+        if not self.terms:
+            return "0"
+        parts = []
+        for m in sorted(self.terms, key=lambda m: (-sum(e for _, e in m), m)):
+            c = self.terms[m]
+            factors = [name if exp == 1 else f"{name}^{exp}" for name, exp in m]
+            if not factors:
+                text = str(abs(c))
+            elif abs(c) == 1:
+                text = "*".join(factors)
+            else:
+                text = "*".join([str(abs(c))] + factors)
+            parts.append(("- " if c < 0 else "+ ") + text)
+        text = " ".join(parts)
+        return text[2:] if text.startswith("+ ") else "-" + text[2:]
+
+    def __repr__(self) -> str:
+        return f"Polynomial('{self}')"
+
+
+_BINARY_OPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+}
+
+
+def _from_ast(node: ast.AST) -> Polynomial:
+    if isinstance(node, ast.Expression):
+        return _from_ast(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return Polynomial.constant(node.value)
+    if isinstance(node, ast.Name):
+        return Polynomial.symbol(node.id)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = _from_ast(node.operand)
+        return -operand if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, ast.Pow):
+            exponent = _from_ast(node.right).constant_value()
+            if exponent is None or exponent.denominator != 1:
+                raise ValueError("Exponents must be non-negative integers")
+            return _from_ast(node.left) ** int(exponent)
+        if type(node.op) in _BINARY_OPS:
+            return _BINARY_OPS[type(node.op)](_from_ast(node.left), _from_ast(node.right))
+    raise ValueError(f"Unsupported charge expression: {ast.dump(node)}")
+
+
+def parse_charge(value: Union[str, Number, Polynomial]) -> Polynomial:
+    """
+    Polynomial for a hypercharge given as number, expression or polynomial.
+
+    Expressions use symbols, integers, +, -, *, / and ** (or ^), e.g.
+    "a", "-a + 1/2" or "2*a/3".
+
+    Args:
+        value: Hypercharge specification
+
+    Returns:
+        The hypercharge as a polynomial
+    """
+    if isinstance(value, Polynomial):
+        return value
+    if isinstance(value, (int, fractions.Fraction)):
+        return Polynomial.constant(value)
+    try:
+        return Polynomial.constant(fractions.Fraction(value))
+    except (ValueError, TypeError):
+        pass
+    try:
+        tree = ast.parse(str(value).replace("^", "**"), mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Unsupported charge expression: {value!r}")
+    return _from_ast(tree)
+
+
+@dataclass
+class SymbolicFermion:
+    """Fermion whose hypercharge may depend on symbols"""
+    name: str
+    su3_rep: Union[int, str]
+    su2_rep: Union[int, str]
+    hypercharge: Union[str, Number, Polynomial]
+    chirality: int = 1
+    generations: int = 1
+
+    def __post_init__(self):
+        """Validate representations and parse the hypercharge"""
+        if self.su3_rep not in SU3:
+            raise ValueError(f"Unsupported SU(3) representation: {self.su3_rep}")
+        if self.su2_rep not in SU2:
+            raise ValueError(f"Unsupported SU(2) representation: {self.su2_rep}")
+        if self.chirality not in (1, -1):
+            raise ValueError(f"Chirality must be ±1, got {self.chirality}")
+        if self.generations < 1:
+            raise ValueError(f"Generations must be positive, got {self.generations}")
+        self.hypercharge = parse_charge(self.hypercharge)
+
+    def bind(self, values: Mapping[str, Number]) -> Fermion:
+        """Concrete Fermion for given symbol values"""
+        return Fermion(self.name, self.su3_rep, self.su2_rep,
+                       self.hypercharge.evaluate(values), self.chirality, self.generations)
+
+
+class ParametricChecker:
+    """
+    Anomaly conditions of a spectrum as polynomials in symbolic charges.
+    """
+
+    def __init__(self, fermions: Sequence[Union[Fermion, SymbolicFermion]],
+                 conditions: Conditions = None, base: Optional[Mapping] = None):
+        """
+        Initialize with a spectrum.
+
+        Args:
+            fermions: Concrete and symbolic fields
+            conditions: Condition names or plan (default: ANOMALY_KEYS)
+            base: Anomaly coefficients of further concrete fields (e.g. the
+                AnomalyVector of a fixed base spectrum), added as constants
+                so that the base is not summed again for every solve
+        """
+        self.fermions = list(fermions)
+        self.plan = _resolve_plan(conditions)
+        self.base = base
+        self._constraints: Optional[Dict[str, Polynomial]] = None
+
+    def constraints(self) -> Dict[str, Polynomial]:
+        """
+        Every anomaly coefficient as a polynomial in the symbols.
+
+        Returns:
+            Dictionary keyed by condition name, in plan order
+        """
+        if self._constraints is not None:
+            return self._constraints
+        plan = self.plan
+        powers: Dict[Tuple[Polynomial, int], Polynomial] = {}
+        sums = [Polynomial() for _ in plan.conditions]
+        if self.base is not None:
+            sums = [Polynomial.constant(self.base[key]) for key in plan.keys]
+        for f in self.fermions:
+            y = parse_charge(f.hypercharge)
+            weights = plan.rep_weights(f.su3_rep, f.su2_rep)
+            for i, c in enumerate(plan.conditions):
+                key = (y, c.power)
+                if key not in powers:
+                    powers[key] = y ** c.power
+                sums[i] = sums[i] + powers[key] * (
+                    weights[plan.weight_index[i]] * f.chirality * f.generations
+                )
+        for i, m in enumerate(plan.moduli):
+            if m is not None:
+                # Global anomalies do not depend on the charges
+                sums[i] = Polynomial.constant(int(sums[i].constant_value()) % m)
+        self._constraints = dict(zip(plan.keys, sums))
+        return self._constraints
+
+    def variables(self) -> List[str]:
+        """Symbols occurring in the spectrum"""
+        return sorted({v for p in self.constraints().values() for v in p.variables()})
+
+    def solve(self, bounds: Bounds = None) -> List[Dict[str, fractions.Fraction]]:
+        """
+        Every rational assignment of the symbols that cancels all anomalies.
+
+        Args:
+            bounds: (low, high) for every symbol, or a mapping of symbol to
+                (low, high); bounds are inclusive
+
+        Returns:
+            Solutions as symbol -> value dictionaries. A symbol missing from
+            a solution is unconstrained (any value works).
+        """
+        return solve(self.constraints().values(), bounds)
+
+
+# Univariate helpers: polynomials as coefficient lists, lowest degree first
+
+def _trim(coeffs: List[fractions.Fraction]) -> List[fractions.Fraction]:
+    while coeffs and coeffs[-1] == 0:
+        coeffs.pop()
+    return coeffs
+
+
+def _univariate(p: Polynomial, name: str) -> List[fractions.Fraction]:
+    return _trim([c.constant_value() for c in p.coefficients(name)])
+
+
+def _poly_mod(a: List[fractions.Fraction], b: List[fractions.Fraction]) -> List[fractions.Fraction]:
+    a = list(a)
+    while len(a) >= len(b):
+        factor = a[-1] / b[-1]
+        shift = len(a) - len(b)
+        for i, c in enumerate(b):
+            a[shift + i] -= factor * c
+        _trim(a)
+    return a
+
+
+def _poly_gcd(a: List[fractions.Fraction], b: List[fractions.Fraction]) -> List[fractions.Fraction]:
+    while b:
+        a, b = b, _poly_mod(a, b)
+    return [c / a[-1] for c in a] if a else a
+
+
+def _divisors(n: int) -> List[int]:
+    n = abs(n)
+    small, large = [], []
+    d = 1
+    while d * d <= n:
+        if n % d == 0:
+            small.append(d)
+            if d * d != n:
+                large.append(n // d)
+        d += 1
+    return small + large[::-1]
+
+
+def rational_roots(coeffs: Sequence[Number]) -> List[fractions.Fraction]:
+    """
+    Distinct rational roots of a univariate polynomial.
+
+    Linear and quadratic factors are solved in closed form; higher degrees
+    use the rational root theorem and deflate after every root found.
+
+    Args:
+        coeffs: Coefficients, lowest degree first (not all zero)
+
+    Returns:
+        Sorted distinct rational roots
+    """
+    coeffs = _trim([fractions.Fraction(c) for c in coeffs])
+    if not coeffs:
+        raise ValueError("The zero polynomial has every number as a root")
+    roots = set()
+    while coeffs and coeffs[0] == 0:
+        roots.add(fractions.Fraction(0))
+        coeffs.pop(0)
+
+    # Integer coefficients with no common factor
+    scale = 1
+    for c in coeffs:
+        scale = scale * c.denominator // math.gcd(scale, c.denominator)
+    ints = [int(c * scale) for c in coeffs]
+    content = 0
+    for c in ints:
+        content = math.gcd(content, c)
+    ints = [c // content for c in ints]
+
+    while len(ints) > 3:
+        for root in _theorem_root(ints):
+            roots.add(root)
+            ints = _deflate(ints, root)
+            break
+        else:
+            return sorted(roots)
+    if len(ints) == 2:
+        roots.add(fractions.Fraction(-ints[0], ints[1]))
+    elif len(ints) == 3:
+        c, b, a = ints
+        disc = b * b - 4 * a * c
+        if disc >= 0 and math.isqrt(disc) ** 2 == disc:
+            s = math.isqrt(disc)
+            roots.update({fractions.Fraction(-b + s, 2 * a), fractions.Fraction(-b - s, 2 * a)})
+    return sorted(roots)
+
+
+def _theorem_root(ints: List[int]):
+    """Candidate p/q from the rational root theorem that is a root"""
+    n = len(ints) - 1
+    for q in _divisors(ints[-1]):
+        for p in _divisors(ints[0]):
+            for sign in (1, -1):
+                # q^n f(p/q) in integers
+                if sum(c * (sign * p) ** i * q ** (n - i) for i, c in enumerate(ints)) == 0:
+                    yield fractions.Fraction(sign * p, q)
+
+
+def _deflate(ints: List[int], root: fractions.Fraction) -> List[int]:
+    """Integer coefficients of f(x) / (q x - p) for a root p/q of f"""
+    p, q = root.numerator, root.denominator
+    # Synthetic division by (q x - p), highest degree first
+    high = ints[::-1]
+    quotient = []
+    remainder = 0
+    for c in high[:-1]:
+        value = c + remainder
+        quotient.append(value // q)
+        remainder = (value // q) * p
+    return quotient[::-1]
+
+
+def common_roots(polys: Iterable[Polynomial], name: str) -> Optional[List[fractions.Fraction]]:
+    """
+    Rational values of one symbol at which every polynomial vanishes.
+
+    Args:
+        polys: Polynomials in name only
+        name: The symbol
+
+    Returns:
+        Sorted roots, or None if every polynomial is identically zero
+    """
+    g: List[fractions.Fraction] = []
+    for p in polys:
+        g = _poly_gcd(g, _univariate(p, name)) if g else _poly_gcd(_univariate(p, name), [])
+        if len(g) == 1:
+            return []
+    if not g:
+        return None
+    return rational_roots(g)
+
+
+def _determinant(matrix: List[List[Polynomial]]) -> Polynomial:
+    """Determinant by cofactor expansion, memoized over column subsets"""
+    n = len(matrix)
+    memo: Dict[int, Polynomial] = {}
+
+    def minor(row: int, columns: int) -> Polynomial:
+        if row == n:
+            return Polynomial.constant(1)
+        if columns in memo:
+            return memo[columns]
+        total = Polynomial()
+        sign = 1
+        for col in range(n):
+            if columns >> col & 1:
+                continue
+            entry = matrix[row][col]
+            if not entry.is_zero():
+                term = entry * minor(row + 1, columns | 1 << col)
+                total = total + term if sign > 0 else total - term
+            sign = -sign
+        memo[columns] = total
+        return total
+
+    return minor(0, 0)
+
+
+def resultant(p: Polynomial, q: Polynomial, name: str) -> Polynomial:
+    """
+    Resultant of two polynomials with respect to one symbol.
+
+    It vanishes exactly at the values of the other symbols for which p and
+    q have a common root in name (or both leading coefficients vanish).
+
+    Args:
+        p: First polynomial
+        q: Second polynomial
+        name: Symbol to eliminate
+
+    Returns:
+        Polynomial in the remaining symbols
+    """
+    a, b = p.coefficients(name), q.coefficients(name)
+    m, n = len(a) - 1, len(b) - 1
+    if m == 0:
+        return p ** n
+    if n == 0:
+        return q ** m
+    size = m + n
+    zero = Polynomial()
+    rows = []
+    for shift in range(n):
+        rows.append([zero] * shift + a[::-1] + [zero] * (size - m - 1 - shift))
+    for shift in range(m):
+        rows.append([zero] * shift + b[::-1] + [zero] * (size - n - 1 - shift))
+    return _determinant(rows)
+
+
+def _in_bounds(value: fractions.Fraction, name: str, bounds: Bounds) -> bool:
+    if bounds is None:
+        return True
+    limits = bounds.get(name) if isinstance(bounds, Mapping) else bounds
+    if limits is None:
+        return True
+    return limits[0] <= value <= limits[1]
+
+
+def _solve(equations: List[Polynomial], bounds: Bounds) -> List[Dict[str, fractions.Fraction]]:
+    equations = [e for e in equations if not e.is_zero()]
+    if any(e.constant_value() is not None for e in equations):
+        return []
+    if not equations:
+        return [{}]
+
+    names = sorted({v for e in equations for v in e.variables()})
+    if len(names) == 1:
+        roots = common_roots(equations, names[0])
+        return [{names[0]: r} for r in roots if _in_bounds(r, names[0], bounds)]
+
+    # Eliminate the symbol with the lowest degree through resultants
+    # against the equation in which it has the lowest degree
+    name = min(names, key=lambda v: (min(e.degree(v) or math.inf for e in equations), v))
+    with_name = [e for e in equations if e.degree(name)]
+    pivot = min(with_name, key=lambda e: e.degree(name))
+    reduced = [e for e in equations if not e.degree(name)]
+    reduced += [resultant(pivot, e, name) for e in with_name if e is not pivot]
+
+    solutions = []
+    for partial in _solve(reduced, bounds):
+        remaining = [e.substitute(partial) for e in with_name]
+        free = {v for e in remaining for v in e.variables()} - {name}
+        if free:
+            raise ValueError(
+                f"Solutions form a continuous family in {', '.join(sorted(free | {name}))}"
+            )
+        roots = common_roots(remaining, name)
+        if roots is None:
+            solutions.append(partial)
+            continue
+        for r in roots:
+            if _in_bounds(r, name, bounds):
+                solutions.append({**partial, name: r})
+    return solutions
+
+
+def solve(equations: Iterable[Polynomial], bounds: Bounds = None) -> List[Dict[str, fractions.Fraction]]:
+    """
+    Every rational common zero of a polynomial system.
+
+    Args:
+        equations: Polynomials that must all vanish
+        bounds: (low, high) for every symbol, or a mapping of symbol to
+            (low, high); bounds are inclusive
+
+    Returns:
+        Solutions as symbol -> value dictionaries, sorted. A symbol missing
+        from a solution appears in no equation once the others are fixed,
+        so any value works.
+
+    Raises:
+        ValueError: If the solutions form a continuous family in which
+            symbols depend on each other
+    """
+    equations = [parse_charge(e) for e in equations]
+    solutions = _solve(equations, bounds)
+    # Back-substitution guarantees every equation vanishes; drop duplicates
+    unique = {tuple(sorted(s.items())): s for s in solutions}
+    return [dict(k) for k in sorted(unique)]
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+u1_charge_generator.py
+======================
+Constructive enumeration of anomaly-free integer charges of N chiral
+fields under a single U(1) (e.g. a dark U(1) acting on SM singlets). The
+only conditions are
+
+    Σ z_i = 0      ([Gravity]²[U(1)])
+    Σ z_i³ = 0     ([U(1)]³)
+
+Solutions are generated in canonical form: sorted ascending, and no larger
+than the sorted negation, so each assignment appears exactly once up to
+permutation and overall sign. The first N - 2 charges are chosen freely
+(depth-first, in ascending order, pruned by the range the remaining sums
+can still reach). The linear and cubic conditions then fix the last pair
+(a, b) through a + b = S and ab = (S³ - C) / 3S, a quadratic with integer
+roots or none, so the search visits the sorted (N - 2)-prefixes only
+instead of all (2q + 1)^N assignments. Solutions are streamed in
+lexicographic order.
+
+Author: Bryan Roy & Claude
+Version: 1.0
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.gauge_model import GaugeModel, ModelField
+
+Charges = Tuple[int, ...]
+
+
+def canonical(charges: Charges) -> Charges:
+    """Representative of an assignment up to permutation and overall sign"""
+    ascending = tuple(sorted(charges))
+    negated = tuple(sorted(-z for z in charges))
+    return min(ascending, negated)
+
+
+def solve_pair(s: int, c: int) -> List[Tuple[int, int]]:
+    """
+    Integer pairs a <= b with a + b = s and a³ + b³ = c.
+
+    For s = 0 every pair (-a, a) works when c = 0 and none otherwise; only
+    the pair with a = 0 is returned then, callers enumerate the family.
+
+    Args:
+        s: Required sum
+        c: Required sum of cubes
+
+    Returns:
+        At most one pair
+    """
+    if s == 0:
+        return [(0, 0)] if c == 0 else []
+    # a³ + b³ = s³ - 3abs
+    p, r = divmod(s**3 - c, 3 * s)
+    if r:
+        return []
+    disc = s * s - 4 * p
+    if disc < 0:
+        return []
+    d = math.isqrt(disc)
+    if d * d != disc or (s - d) % 2:
+        return []
+    return [((s - d) // 2, (s + d) // 2)]
+
+
+class U1ChargeGenerator:
+    """
+    Exhaustive, duplicate-free generator of anomaly-free U(1) charges.
+    """
+
+    def __init__(self, n_fields: int, q_max: int, nonzero: bool = False,
+                 primitive: bool = False, chiral: bool = False):
+        """
+        Configure the search.
+
+        Args:
+            n_fields: Number of chiral fields N (at least 2)
+            q_max: Largest absolute charge
+            nonzero: Skip assignments with a neutral field
+            primitive: Skip assignments whose charges share a common factor
+            chiral: Skip vector-like assignments, i.e. those that are their
+                own negation up to permutation
+        """
+        if n_fields < 2:
+            raise ValueError(f"At least two fields are required, got {n_fields}")
+        if q_max < 1:
+            raise ValueError(f"q_max must be positive, got {q_max}")
+        self.n_fields = n_fields
+        self.q_max = q_max
+        self.nonzero = nonzero
+        self.primitive = primitive
+        self.chiral = chiral
+        self.nodes = 0
+        self.solutions = 0
+
+    def __iter__(self) -> Iterator[Charges]:
+        self.nodes = self.solutions = 0
+        for charges in self._search():
+            if self._accept(charges):
+                self.solutions += 1
+                yield charges
+
+    def _accept(self, charges: Charges) -> bool:
+        """Apply the canonical-sign rule and the optional filters"""
+        negated = tuple(sorted(-z for z in charges))
+        if negated < charges:
+            return False
+        if self.chiral and negated == charges:
+            return False
+        if self.nonzero and 0 in charges:
+            return False
+        if self.primitive and math.gcd(*charges) != 1:
+            return False
+        return True
+
+    def _search(self) -> Iterator[Charges]:
+        """Canonical-order candidates satisfying both conditions"""
+        n = self.n_fields
+        low = 1 if self.nonzero else 0
+        # The smallest charge z_1 <= 0 bounds every other charge by -z_1
+        for first in range(-self.q_max, 0):
+            high = -first
+            prefix = [first]
+            yield from self._extend(prefix, first, first**3, first, high, n - 1, low)
+
+    def _extend(self, prefix: List[int], s: int, c: int, lo: int, hi: int,
+                remaining: int, low: int) -> Iterator[Charges]:
+        """Depth-first extension of a sorted prefix with partial sums s and c"""
+        self.nodes += 1
+        if remaining == 2:
+            s_needed, c_needed = -s, -c
+            if s_needed == 0:
+                if c_needed:
+                    return
+                # Vector-like tail (a, -a); a = 0 only if zeros are allowed
+                for a in range(max(lo, -hi), 1 - low):
+                    if -a <= hi:
+                        yield tuple(prefix) + (a, -a)
+                return
+            for a, b in solve_pair(s_needed, c_needed):
+                if lo <= a and b <= hi and (not low or (a and b)):
+                    yield tuple(prefix) + (a, b)
+            return
+        if remaining == 1:
+            z = -s
+            if lo <= z <= hi and z**3 == -c and (not low or z):
+                yield tuple(prefix) + (z,)
+            return
+
+        for z in range(lo, hi + 1):
+            if low and z == 0:
+                continue
+            m = remaining - 1
+            s2, c2 = s + z, c + z**3
+            # The m charges still to come lie in [z, hi]; the lower bounds
+            # only grow with z, the upper ones only rule out this z
+            if m * z > -s2 or m * z**3 > -c2:
+                break
+            if -s2 > m * hi or -c2 > m * hi**3:
+                continue
+            prefix.append(z)
+            yield from self._extend(prefix, s2, c2, z, hi, m, low)
+            prefix.pop()
+
+    def statistics(self) -> Dict[str, int]:
+        """Search-tree nodes visited and solutions accepted so far"""
+        return {'nodes': self.nodes, 'solutions': self.solutions}
+
+
+def to_fields(charges: Charges, model: GaugeModel = None) -> List[ModelField]:
+    """
+    Left-handed fields χ_1 ... χ_N carrying the given charges.
+
+    Args:
+        charges: One charge per field
+        model: Single-U(1) gauge model (default: U(1)_D)
+
+    Returns:
+        Fields of the model, e.g. for GaugeModel.verify_cancellation()
+    """
+    model = model or GaugeModel(["U(1)_D"])
+    return [model.field(f"χ_{i + 1}", [z]) for i, z in enumerate(charges)]
+
+
+def main():
+    """Stream anomaly-free U(1) charge assignments."""
+    parser = argparse.ArgumentParser(
+        description="Generate anomaly-free integer U(1) charges of N chiral fields"
+    )
+    parser.add_argument("n_fields", type=int, help="Number of chiral fields N")
+    parser.add_argument("q_max", type=int, help="Largest absolute charge")
+    parser.add_argument("--nonzero", action="store_true",
+                        help="Skip assignments with a neutral field")
+    parser.add_argument("--primitive", action="store_true",
+                        help="Skip assignments with a common factor")
+    parser.add_argument("--chiral", action="store_true",
+                        help="Skip vector-like assignments")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Stop after this many assignments")
+    parser.add_argument("--output", default=None,
+                        help="JSON file for the assignments (default: print them)")
+    args = parser.parse_args()
+
+    generator = U1ChargeGenerator(args.n_fields, args.q_max, nonzero=args.nonzero,
+                                  primitive=args.primitive, chiral=args.chiral)
+    start_time = time.time()
+    found: List[Charges] = []
+    for charges in generator:
+        if args.output is None:
+            print(" ".join(f"{z:+d}" if z else "0" for z in charges))
+        found.append(charges)
+        if args.limit and len(found) >= args.limit:
+            break
+    elapsed_time = time.time() - start_time
+    stats = generator.statistics()
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'n_fields': args.n_fields,
+                'q_max': args.q_max,
+                'filters': {'nonzero': args.nonzero, 'primitive': args.primitive,
+                            'chiral': args.chiral},
+                'statistics': dict(stats, seconds=elapsed_time),
+                'charges': [list(c) for c in found]
+            }, f, indent=2)
+    print(f"{len(found)} assignments, {stats['nodes']} search nodes, "
+          f"{elapsed_time:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
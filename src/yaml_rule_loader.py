@@ -12,6 +12,7 @@ Version: 1.0
 import yaml
 import json
 import fractions
+import math
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
 from dataclasses import dataclass, field
@@ -24,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from src.anomaly_checker import Fermion
+    from src.gauge_model import GaugeModel, ModelField
 except ImportError:
     print("Warning: anomaly_checker.py not found. Some functionality may be limited.")
 
@@ -136,6 +138,24 @@ class SymmetryRequirement:
     constraints: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class U1PrimeConstraint:
+    """Family-dependent U(1)' charge scan specification"""
+    name: str = "U(1)'"
+    charge_range: Tuple[fractions.Fraction, fractions.Fraction] = (
+        fractions.Fraction(-1), fractions.Fraction(1))
+    denominator: int = 1
+    generations: Optional[int] = None
+    fixed: Dict[str, Any] = field(default_factory=dict)
+    universal: List[str] = field(default_factory=list)
+    max_candidates: int = 1000000
+    
+    def numerators(self) -> List[int]:
+        """Allowed charge numerators over the common denominator"""
+        low, high = (v * self.denominator for v in self.charge_range)
+        return list(range(math.ceil(low), math.floor(high) + 1))
+
+
 @dataclass
 class ScanRule:
     """Complete scanning rule specification"""
@@ -148,6 +168,9 @@ class ScanRule:
     su2_constraints: Optional[RepresentationConstraint] = None
     symmetry_requirements: List[SymmetryRequirement] = field(default_factory=list)
     physics_motivated_sets: List[Dict[str, Any]] = field(default_factory=list)
+    gauge_group: Optional[str] = None
+    fields: List[Dict[str, Any]] = field(default_factory=list)
+    u1_prime: Optional[U1PrimeConstraint] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
@@ -235,6 +258,24 @@ class YAMLRuleLoader:
         
         return rc
     
+    def _parse_u1_prime_constraint(self, constraint_dict: Dict[str, Any]) -> U1PrimeConstraint:
+        """Parse a family-dependent U(1)' constraint from YAML data"""
+        charges = constraint_dict.get('charges', {})
+        low, high = charges.get('range', [-1, 1])
+        constraint = U1PrimeConstraint(
+            name=constraint_dict.get('name', "U(1)'"),
+            charge_range=(self._parse_fraction(low), self._parse_fraction(high)),
+            denominator=int(charges.get('denominator', 1)),
+            generations=constraint_dict.get('generations'),
+            fixed=dict(constraint_dict.get('fixed', {})),
+            universal=list(constraint_dict.get('universal', [])),
+            max_candidates=int(constraint_dict.get('max_candidates', 1000000))
+        )
+        if constraint.denominator <= 0:
+            raise ValueError(f"U(1)' charge denominator must be positive, "
+                             f"got {constraint.denominator}")
+        return constraint
+    
     def _parse_symmetry_requirement(self, sym_dict: Dict[str, Any]) -> SymmetryRequirement:
         """Parse symmetry requirement from YAML data"""
         sym_type = SymmetryType(sym_dict['type'])
@@ -304,6 +345,9 @@ class YAMLRuleLoader:
                 rule.su2_constraints = self._parse_representation_constraint(
                     constraints['su2_rep']
                 )
+            
+            if 'u1_prime' in constraints:
+                rule.u1_prime = self._parse_u1_prime_constraint(constraints['u1_prime'])
         
         # Parse symmetry requirements
         if 'symmetry_requirements' in rule_data:
@@ -316,11 +360,16 @@ class YAMLRuleLoader:
         if 'physics_motivated_sets' in rule_data:
             rule.physics_motivated_sets = rule_data['physics_motivated_sets']
         
+        # Models beyond SU(3) × SU(2) × U(1)_Y: gauge group and field content
+        if 'gauge_group' in rule_data:
+            rule.gauge_group = rule_data['gauge_group']
+            rule.fields = rule_data.get('fields', [])
+        
         # Store any additional metadata
         rule.metadata = {k: v for k, v in rule_data.items() 
                         if k not in ['name', 'description', 'base_spectrum', 
                                     'blocks', 'constraints', 'symmetry_requirements',
-                                    'physics_motivated_sets']}
+                                    'physics_motivated_sets', 'gauge_group', 'fields']}
         
         return rule
     
@@ -416,6 +465,53 @@ class YAMLRuleLoader:
         
         return fermion_sets
     
+    def get_gauge_model(self, rule_name: str) -> Optional[GaugeModel]:
+        """
+        Gauge model declared by a rule's gauge_group section.
+        
+        Args:
+            rule_name: Name of the rule
+            
+        Returns:
+            Compiled GaugeModel, or None for Standard Model rules
+        """
+        if rule_name not in self.rules:
+            raise ValueError(f"Unknown rule: {rule_name}")
+        
+        rule = self.rules[rule_name]
+        if rule.gauge_group is None:
+            return None
+        return GaugeModel(rule.gauge_group)
+    
+    def get_gauge_fields(self, rule_name: str) -> List[ModelField]:
+        """
+        Field content of a gauge_group rule.
+        
+        Args:
+            rule_name: Name of the rule
+            
+        Returns:
+            Fields with one representation or charge per gauge factor
+        """
+        model = self.get_gauge_model(rule_name)
+        if model is None:
+            raise ValueError(f"Rule {rule_name} has no gauge_group section")
+        return model.fields_from_dicts(self.rules[rule_name].fields)
+    
+    def get_u1_prime_constraint(self, rule_name: str) -> Optional[U1PrimeConstraint]:
+        """
+        Family-dependent U(1)' scan declared by a rule's u1_prime constraint.
+        
+        Args:
+            rule_name: Name of the rule
+            
+        Returns:
+            U1PrimeConstraint, or None if the rule declares none
+        """
+        if rule_name not in self.rules:
+            raise ValueError(f"Unknown rule: {rule_name}")
+        return self.rules[rule_name].u1_prime
+    
     def validate_fermion_set(self, fermions: List[Fermion], rule_name: str) -> Tuple[bool, List[str]]:
         """
         Validate that a fermion set satisfies rule constraints.